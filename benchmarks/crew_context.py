@@ -0,0 +1,105 @@
+"""
+Stress test of the Crew context: builds hundreds of crews at the same time, from threads and
+from asyncio tasks, and checks that every agent was registered in the crew it was defined in.
+
+    python benchmarks/crew_context.py --crews 500 --agents 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agentic_patterns.multiagent_pattern.agent import Agent
+from agentic_patterns.multiagent_pattern.crew import Crew
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+
+def make_agent(crew_id: int, i: int, client) -> Agent:
+    return Agent(
+        name=f"crew_{crew_id}_agent_{i}",
+        backstory="You are a helpful agent.",
+        task_description="Do your part.",
+        client=client,
+    )
+
+
+def is_consistent(crew_id: int, crew: Crew, n_agents: int) -> bool:
+    expected = [f"crew_{crew_id}_agent_{i}" for i in range(n_agents)]
+    return [agent.name for agent in crew.agents] == expected
+
+
+def build_in_thread(crew_id: int, n_agents: int, client) -> bool:
+    with Crew() as crew:
+        for i in range(n_agents):
+            make_agent(crew_id, i, client)
+            # Give the other threads a chance to register their agents in between
+            time.sleep(0)
+
+        # A nested crew must not steal agents from the outer one, and must restore it on exit
+        with Crew() as inner:
+            make_agent(crew_id, -1, client)
+        make_agent(crew_id, n_agents, client)
+
+    return (
+        is_consistent(crew_id, crew, n_agents + 1)
+        and len(inner.agents) == 1
+        and Crew.current() is None
+    )
+
+
+async def build_in_task(crew_id: int, n_agents: int, client) -> bool:
+    with Crew() as crew:
+        for i in range(n_agents):
+            make_agent(crew_id, i, client)
+            await asyncio.sleep(0)
+    return is_consistent(crew_id, crew, n_agents)
+
+
+async def build_in_tasks(n_crews: int, n_agents: int, client) -> list[bool]:
+    return await asyncio.gather(
+        *(build_in_task(crew_id, n_agents, client) for crew_id in range(n_crews))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--crews", type=int, default=500)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    client = FakeLLMClient()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        thread_results = list(
+            executor.map(
+                lambda crew_id: build_in_thread(crew_id, args.agents, client),
+                range(args.crews),
+            )
+        )
+    threads_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    task_results = asyncio.run(build_in_tasks(args.crews, args.agents, client))
+    tasks_s = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "crews": args.crews,
+                "agents_per_crew": args.agents,
+                "threads_consistent": sum(thread_results),
+                "threads_s": round(threads_s, 3),
+                "tasks_consistent": sum(task_results),
+                "tasks_s": round(tasks_s, 3),
+            }
+        )
+    )
+    return 0 if all(thread_results) and all(task_results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
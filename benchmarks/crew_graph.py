@@ -0,0 +1,96 @@
+"""
+Measures how long it takes to build and validate very large crews, both with the bulk
+`Crew.add_dependencies` builder and with the incremental `>>` operator.
+
+    python benchmarks/crew_graph.py --agents 10000 --edges 100000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from agentic_patterns.multiagent_pattern.agent import Agent
+from agentic_patterns.multiagent_pattern.crew import Crew
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+
+def make_crew(n_agents: int, client) -> tuple[Crew, list[Agent]]:
+    with Crew() as crew:
+        agents = [
+            Agent(
+                name=f"agent_{i}",
+                backstory="You are a helpful agent.",
+                task_description="Do your part.",
+                client=client,
+            )
+            for i in range(n_agents)
+        ]
+    return crew, agents
+
+
+def random_dag_edges(n_agents: int, n_edges: int, seed: int) -> list[tuple[int, int]]:
+    """
+    Samples random edges going from a lower to a higher agent index, so the graph is acyclic.
+    """
+    rng = random.Random(seed)
+    edges = set()
+    while len(edges) < n_edges:
+        a, b = rng.sample(range(n_agents), 2)
+        edges.add((min(a, b), max(a, b)))
+    return sorted(edges, key=lambda _: rng.random())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--edges", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    client = FakeLLMClient()
+    edges = random_dag_edges(args.agents, args.edges, args.seed)
+
+    crew, agents = make_crew(args.agents, client)
+    start = time.perf_counter()
+    crew.add_dependencies((agents[a], agents[b]) for a, b in edges)
+    order = crew.topological_sort()
+    bulk_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    crew.topological_sort()
+    cached_sort_ms = (time.perf_counter() - start) * 1000
+
+    # A dependency going backwards in the order must be rejected
+    start = time.perf_counter()
+    try:
+        order[-1] >> order[0]
+        cycle_detected = False
+    except ValueError:
+        cycle_detected = True
+    cycle_check_ms = (time.perf_counter() - start) * 1000
+
+    crew, agents = make_crew(args.agents, client)
+    start = time.perf_counter()
+    for a, b in sorted(edges):
+        agents[a] >> agents[b]
+    crew.topological_sort()
+    incremental_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        json.dumps(
+            {
+                "agents": args.agents,
+                "edges": len(edges),
+                "bulk_build_and_sort_ms": round(bulk_ms, 2),
+                "cached_sort_ms": round(cached_sort_ms, 2),
+                "cycle_detected": cycle_detected,
+                "cycle_check_ms": round(cycle_check_ms, 2),
+                "incremental_build_and_sort_ms": round(incremental_ms, 2),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measures the tail latency of LLM calls against a local stand-in server with a heavy latency
+tail, with and without hedging, and checks the provider fallback when the primary fails.
+
+    python benchmarks/hedging.py --calls 300 --slow-fraction 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+
+from agentic_patterns.utils.completions import completions_create
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+from agentic_patterns.utils.resilience import FallbackClient
+from agentic_patterns.utils.resilience import HedgedClient
+
+MESSAGES = [{"role": "user", "content": "Tell me a joke"}]
+
+
+def heavy_tail_latency(slow_fraction: float, seed: int):
+    """
+    Returns a latency function: most calls take 10-30 ms, a few take 500 ms.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency() -> float:
+        with lock:
+            if rng.random() < slow_fraction:
+                return 0.5
+            return rng.uniform(0.01, 0.03)
+
+    return latency
+
+
+def measure(client, n_calls: int) -> dict:
+    latencies = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        completions_create(client, MESSAGES, "llama-3.1-8b-instant")
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return {
+        f"p{q}_ms": round(
+            latencies[min(len(latencies) - 1, int(q / 100 * n_calls))] * 1000, 1
+        )
+        for q in (50, 95, 99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--percentile", type=float, default=90.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    plain = FakeLLMClient(latency=heavy_tail_latency(args.slow_fraction, args.seed))
+    baseline = measure(plain, args.calls)
+
+    server = FakeLLMClient(latency=heavy_tail_latency(args.slow_fraction, args.seed))
+    hedged = HedgedClient(server, percentile=args.percentile)
+    with_hedging = measure(hedged, args.calls)
+
+    def failing(messages, model, **kwargs):
+        raise ConnectionError("Primary provider is down")
+
+    backup = FakeLLMClient()
+    fallback = FallbackClient(
+        [FakeLLMClient(responder=failing), (backup, "backup-model")]
+    )
+    answer = completions_create(fallback, MESSAGES, "llama-3.1-8b-instant")
+
+    print(
+        json.dumps(
+            {
+                "calls": args.calls,
+                "baseline": baseline,
+                "hedged": with_hedging,
+                "hedge_stats": hedged.stats,
+                "extra_requests": len(server.requests) - args.calls,
+                "fallback_answer": answer,
+                "fallback_model": backup.requests[-1]["model"],
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
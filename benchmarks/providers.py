@@ -0,0 +1,123 @@
+"""
+Runs the same crew against two backends with no code changes besides the provider: the in-process
+FakeLLMClient behind a GroqProvider, and a local OpenAI-compatible HTTP server (a stand-in for a
+vLLM or llama.cpp server) behind an OpenAICompatibleProvider, with and without streaming.
+
+    python benchmarks/providers.py --crews 20 --latency 0.01
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from agentic_patterns.jobs import build_crew
+from agentic_patterns.jobs import run_crew
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+from agentic_patterns.utils.providers import GroqProvider
+from agentic_patterns.utils.providers import OpenAICompatibleProvider
+
+CREW = {
+    "agents": [
+        {
+            "name": name,
+            "backstory": f"You are the {name.lower()}.",
+            "task_description": f"Do the {name.lower()} work.",
+            "llm": "llama-3.1-8b-instant",
+        }
+        for name in ("Researcher", "Writer", "Editor")
+    ],
+    "dependencies": [["Researcher", "Writer"], ["Writer", "Editor"]],
+}
+
+ANSWER = "Here is a short and useful answer to the task."
+
+
+class OpenAICompatibleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.latency)
+        usage = {"prompt_tokens": 50, "completion_tokens": 10, "total_tokens": 60}
+
+        if not body.get("stream"):
+            self._send(
+                "application/json",
+                json.dumps(
+                    {
+                        "model": body["model"],
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": ANSWER},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": usage,
+                    }
+                ),
+            )
+            return
+
+        chunks = [
+            {"choices": [{"index": 0, "delta": {"content": word + " "}}]}
+            for word in ANSWER.split()
+        ] + [{"choices": [], "usage": usage}]
+        self._send(
+            "text/event-stream",
+            "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+            + "data: [DONE]\n\n",
+        )
+
+    def _send(self, content_type: str, payload: str):
+        data = payload.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def measure(provider, n_crews: int, stream: bool) -> dict:
+    start = time.perf_counter()
+    for _ in range(n_crews):
+        crew = build_crew(CREW, client=provider)
+        run_crew(crew, on_token=(lambda delta: None) if stream else None)
+    elapsed = time.perf_counter() - start
+    return {"ms_per_crew": round(elapsed / n_crews * 1000, 2), **provider.usage}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--crews", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    OpenAICompatibleHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenAICompatibleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    results = {}
+    for stream in (False, True):
+        mode = "stream" if stream else "plain"
+        fake = FakeLLMClient(responder=lambda *a, **k: ANSWER, latency=args.latency)
+        results[f"groq_fake_{mode}"] = measure(GroqProvider(fake), args.crews, stream)
+        local = OpenAICompatibleProvider(base_url=base_url, model="local-model")
+        results[f"openai_local_{mode}"] = measure(local, args.crews, stream)
+        local.close()
+
+    server.shutdown()
+    print(json.dumps({"crews": args.crews, "agents_per_crew": 3, **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Measures the wall-clock time of a ReactAgent on tasks where the first tool choice is often wrong,
+following one chain of steps against exploring several branches at once (tree search mode).
+
+Each task asks for a fact that only one of three search tools knows. The stand-in model picks a
+tool at random at every step (it may even try the same wrong tool again), so the linear agent
+spends serial rounds recovering from its wrong choices, while the search samples several steps
+concurrently and its scorer prunes the branches that repeat an action.
+
+    python benchmarks/react_search.py --tasks 30 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+
+from agentic_patterns.planning_pattern.branch_search import BranchSearch
+from agentic_patterns.planning_pattern.react_agent import ReactAgent
+from agentic_patterns.tool_pattern.tool import tool
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+SOURCES = ("archive", "news", "wiki")
+
+
+def lookup(source: str, query: str) -> str:
+    fact_id = int(re.search(r"\d+", query).group())
+    if SOURCES[fact_id % len(SOURCES)] == source:
+        return f"FOUND: the answer is secret-{fact_id}"
+    return "No results"
+
+
+@tool
+def search_archive(query: str) -> str:
+    """
+    Searches the archive.
+
+    Args:
+        query (str): The search query.
+    """
+    return lookup("archive", query)
+
+
+@tool
+def search_news(query: str) -> str:
+    """
+    Searches the news.
+
+    Args:
+        query (str): The search query.
+    """
+    return lookup("news", query)
+
+
+@tool
+def search_wiki(query: str) -> str:
+    """
+    Searches the wiki.
+
+    Args:
+        query (str): The search query.
+    """
+    return lookup("wiki", query)
+
+
+def random_tool_model(seed: int):
+    """
+    Returns a responder that answers once an observation has the fact, and otherwise calls a
+    random search tool.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def responder(messages, model, **kwargs):
+        question = messages[1]["content"]
+        for message in messages[2:]:
+            found = re.search(r"secret-\d+", str(message["content"]))
+            if message["role"] == "user" and found:
+                return f"<response>The answer is {found.group()}</response>"
+
+        with lock:
+            source = rng.choice(SOURCES)
+        query = re.search(r"fact \d+", question).group()
+        tool_call = {"name": f"search_{source}", "arguments": {"query": query}, "id": 0}
+        return (
+            f"<thought>Let me look in the {source}</thought>"
+            f"<tool_call>{json.dumps(tool_call)}</tool_call>"
+        )
+
+    return responder
+
+
+def measure(n_tasks: int, latency: float, seed: int, search: BranchSearch | None):
+    client = FakeLLMClient(responder=random_tool_model(seed), latency=latency)
+    agent = ReactAgent(tools=[search_archive, search_news, search_wiki], client=client)
+
+    durations, solved = [], 0
+    for fact_id in range(n_tasks):
+        start = time.perf_counter()
+        answer = agent.run(f"What is fact {fact_id}?", max_rounds=8, search=search)
+        durations.append(time.perf_counter() - start)
+        solved += f"secret-{fact_id}" in answer
+
+    durations.sort()
+    return {
+        "mean_ms": round(sum(durations) / n_tasks * 1000, 1),
+        "p95_ms": round(durations[min(n_tasks - 1, int(0.95 * n_tasks))] * 1000, 1),
+        "llm_calls_per_task": round(len(client.requests) / n_tasks, 2),
+        "solved": f"{solved}/{n_tasks}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--n-samples", type=int, default=3)
+    parser.add_argument("--width", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    search = BranchSearch(n_samples=args.n_samples, width=args.width)
+    results = {
+        "linear": measure(args.tasks, args.latency, args.seed, None),
+        "search": measure(args.tasks, args.latency, args.seed, search),
+    }
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
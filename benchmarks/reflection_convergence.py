@@ -0,0 +1,90 @@
+"""
+Counts the LLM calls and rounds of reflection runs against a local stand-in model whose drafts
+stop improving after a few rounds, with and without convergence-based early stopping.
+
+    python benchmarks/reflection_convergence.py --runs 20 --steps 10
+"""
+
+import argparse
+import json
+import random
+
+from agentic_patterns.reflection_pattern import ReflectionAgent
+from agentic_patterns.utils.convergence import ConvergenceMonitor
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+
+def converging_responder(improving_rounds: int, seed: int):
+    """
+    Returns a responder for a single run. Its drafts change a lot during the first rounds, then
+    only slightly, and its critiques never say <OK> but get less severe until they plateau.
+    """
+    rng = random.Random(seed)
+    rounds = {"drafts": 0, "critiques": 0}
+
+    def responder(messages, model, **kwargs):
+        if "recommendations" in messages[0]["content"]:
+            severity = max(3, 8 - 2 * rounds["critiques"])
+            rounds["critiques"] += 1
+            return (
+                f"Add more detail to section {rng.randint(1, 5)}."
+                f"\n<severity>{severity}</severity>"
+            )
+
+        rounds["drafts"] += 1
+        if rounds["drafts"] <= improving_rounds:
+            return " ".join(f"idea{rng.randint(0, 1000)}" for _ in range(60))
+        return " ".join(f"idea{i}" for i in range(60)) + f" v{rng.randint(0, 9)}"
+
+    return responder
+
+
+def measure(n_runs: int, n_steps: int, early_stopping: bool, seed: int) -> dict:
+    llm_calls = tokens = steps = 0
+    for i in range(n_runs):
+        client = FakeLLMClient(responder=converging_responder(3, seed + i))
+        agent = ReflectionAgent(client=client)
+        agent.run(
+            user_msg=f"Write essay number {i}",
+            n_steps=n_steps,
+            early_stopping=early_stopping,
+            convergence=ConvergenceMonitor() if early_stopping else None,
+        )
+        llm_calls += len(client.requests)
+        tokens += client.prompt_tokens + client.completion_tokens
+        steps += agent.last_run["steps"]
+    return {
+        "llm_calls": llm_calls,
+        "steps": steps,
+        "rounds_saved": n_runs * n_steps - steps,
+        "tokens": tokens,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    baseline = measure(args.runs, args.steps, False, args.seed)
+    early = measure(args.runs, args.steps, True, args.seed)
+
+    print(
+        json.dumps(
+            {
+                "runs": args.runs,
+                "n_steps": args.steps,
+                "fixed_rounds": baseline,
+                "early_stopping": early,
+                "call_reduction": round(
+                    1 - early["llm_calls"] / baseline["llm_calls"], 3
+                ),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
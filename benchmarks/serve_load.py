@@ -0,0 +1,99 @@
+"""
+Local load test of the ASGI server against the fake LLM backend. Many clients send requests
+drawn from a small set of distinct prompts, so identical concurrent requests get coalesced,
+and a burst larger than the admission limits shows the overload rejections.
+
+    python benchmarks/serve_load.py --requests 500 --distinct 20 --clients 100
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import httpx
+
+from agentic_patterns.server import AgentServer
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+
+def make_job(i: int) -> dict:
+    return {
+        "pattern": "react",
+        "input": {"user_msg": f"Tell me something interesting about topic {i}"},
+    }
+
+
+async def run_clients(
+    server: AgentServer, jobs: list[dict], n_clients: int, stream: bool
+) -> tuple[list[float], dict]:
+    latencies: list[float] = []
+    statuses: dict = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    transport = httpx.ASGITransport(app=server)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+
+        async def client():
+            while not queue.empty():
+                job = queue.get_nowait()
+                start = time.perf_counter()
+                response = await http.post("/stream" if stream else "/run", json=job)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = (
+                    statuses.get(response.status_code, 0) + 1
+                )
+
+        await asyncio.gather(*(client() for _ in range(n_clients)))
+
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [make_job(rng.randrange(args.distinct)) for _ in range(args.requests)]
+
+    client = FakeLLMClient(latency=args.latency)
+    server = AgentServer(
+        client=client, max_concurrency=args.concurrency, max_queue=args.max_queue
+    )
+
+    start = time.perf_counter()
+    latencies, statuses = asyncio.run(
+        run_clients(server, jobs, args.clients, args.stream)
+    )
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        json.dumps(
+            {
+                **server.stats,
+                "llm_calls": len(client.requests),
+                "statuses": statuses,
+                "elapsed_s": round(elapsed, 3),
+                "throughput_rps": round(len(latencies) / elapsed, 1),
+                "latency_p50_ms": round(quantiles[49] * 1000, 1),
+                "latency_p95_ms": round(quantiles[94] * 1000, 1),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measures the memory held by many live reflection sessions, comparing plain dict messages
+(with a system prompt string built per session) against the compact, shared Message objects.
+
+    python benchmarks/session_memory.py --sessions 10000 --steps 3
+"""
+
+import argparse
+import json
+import tracemalloc
+
+from agentic_patterns.reflection_pattern.reflection_agent import (
+    BASE_GENERATION_SYSTEM_PROMPT,
+)
+from agentic_patterns.reflection_pattern.reflection_agent import (
+    BASE_REFLECTION_SYSTEM_PROMPT,
+)
+from agentic_patterns.utils.completions import build_prompt_structure
+from agentic_patterns.utils.completions import FixedFirstChatHistory
+
+GENERATION_PROMPT = (
+    "You are a Python programmer tasked with generating high quality code."
+)
+REFLECTION_PROMPT = "You are an experienced computer scientist reviewing Python code."
+
+
+def dict_message(prompt: str, role: str) -> dict:
+    return {"role": role, "content": prompt}
+
+
+def make_session(i: int, steps: int, build_message) -> tuple[list, list]:
+    """
+    Builds the two histories of a ReflectionAgent run, the same way `ReflectionAgent.run` does.
+    """
+    # Like `ReflectionAgent.run`, the system prompts are concatenated again for every run
+    generation_system_prompt = GENERATION_PROMPT + BASE_GENERATION_SYSTEM_PROMPT
+    reflection_system_prompt = REFLECTION_PROMPT + BASE_REFLECTION_SYSTEM_PROMPT
+
+    generation_history = FixedFirstChatHistory(
+        [
+            build_message(generation_system_prompt, "system"),
+            build_message(f"Implement the algorithm number {i} in Python", "user"),
+        ],
+        total_length=3,
+    )
+    reflection_history = FixedFirstChatHistory(
+        [build_message(reflection_system_prompt, "system")], total_length=3
+    )
+
+    for step in range(steps):
+        generation = f"def algorithm_{i}():\n    return {step}\n" * 4
+        generation_history.append(build_message(generation, "assistant"))
+        reflection_history.append(build_message(generation, "user"))
+
+        critique = f"Step {step}: add a docstring and type hints to algorithm {i}."
+        generation_history.append(build_message(critique, "user"))
+        reflection_history.append(build_message(critique, "assistant"))
+
+    return generation_history, reflection_history
+
+
+def measure(n_sessions: int, steps: int, build_message) -> int:
+    tracemalloc.start()
+    sessions = [make_session(i, steps, build_message) for i in range(n_sessions)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=3)
+    args = parser.parse_args()
+
+    dict_bytes = measure(args.sessions, args.steps, dict_message)
+    message_bytes = measure(
+        args.sessions,
+        args.steps,
+        lambda prompt, role: build_prompt_structure(prompt=prompt, role=role),
+    )
+
+    print(
+        json.dumps(
+            {
+                "sessions": args.sessions,
+                "dict_messages_mb": round(dict_bytes / 2**20, 2),
+                "compact_messages_mb": round(message_bytes / 2**20, 2),
+                "bytes_per_session_dict": dict_bytes // args.sessions,
+                "bytes_per_session_compact": message_bytes // args.sessions,
+                "reduction": round(1 - message_bytes / dict_bytes, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures the tool call parsing throughput of the standard library parser against `lenient_loads`
+(orjson when installed), how many of the usual LLM JSON mistakes each one survives, and checks
+that tool calls cut off by the token limit are rejected instead of being completed.
+
+    python benchmarks/tool_call_parsing.py --calls 100000
+"""
+
+import argparse
+import json
+import time
+
+from agentic_patterns.utils.json_parsing import lenient_loads
+from agentic_patterns.utils.json_parsing import orjson
+from agentic_patterns.utils.json_parsing import TruncatedJSONError
+
+VALID = '{"name": "get_current_weather", "arguments": {"location": "Madrid", "unit": "celsius", "days": 3}, "id": 0}'
+
+MALFORMED = {
+    "trailing_comma": '{"name": "sum", "arguments": {"a": 1, "b": 2,}, "id": 0,}',
+    "single_quotes": "{'name': 'sum', 'arguments': {'a': 1, 'b': 2}, 'id': 0}",
+    "unquoted_keys": '{name: "sum", arguments: {a: 1, b: 2}, id: 0}',
+    "python_literals": '{"name": "search", "arguments": {"exact": True, "limit": None}, "id": 0}',
+    "code_fence": '```json\n{"name": "sum", "arguments": {"a": 1, "b": 2}, "id": 0}\n```',
+    "surrounding_text": 'Here is the call: {"name": "sum", "arguments": {"a": 1}, "id": 0} Done.',
+    "raw_newline": '{"name": "write", "arguments": {"text": "two\nlines"}, "id": 0}',
+}
+
+TRUNCATED = {
+    "open_object": '{"name": "transfer", "arguments": {"amount": 10',
+    "open_string": '{"name": "write", "arguments": {"text": "hello wor',
+}
+
+
+def throughput(loads, text: str, n_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        loads(text)
+    return n_calls / (time.perf_counter() - start)
+
+
+def survives(loads, text: str) -> bool:
+    try:
+        return isinstance(loads(text), dict)
+    except ValueError:
+        return False
+
+
+def rejected(text: str) -> bool:
+    try:
+        lenient_loads(text)
+    except TruncatedJSONError:
+        return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            {
+                "orjson": orjson is not None,
+                "valid_calls_per_s": {
+                    "json.loads": round(throughput(json.loads, VALID, args.calls)),
+                    "lenient_loads": round(
+                        throughput(lenient_loads, VALID, args.calls)
+                    ),
+                },
+                "malformed_calls_per_s": round(
+                    throughput(
+                        lenient_loads, MALFORMED["single_quotes"], args.calls // 10
+                    )
+                ),
+                "parsed": {
+                    name: {
+                        "json.loads": survives(json.loads, text),
+                        "lenient_loads": survives(lenient_loads, text),
+                    }
+                    for name, text in MALFORMED.items()
+                },
+                "truncated_rejected": {
+                    name: rejected(text) for name, text in TRUNCATED.items()
+                },
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compares the XML prompt-based tool calling mode against the native `tools` parameter mode.
+
+Both modes run the same ReactAgent task against the local FakeLLMClient, which reports
+approximate prompt token usage. The time spent inside the fake server is subtracted,
+so the latency column only measures the agent side (prompt building and parsing). Run it with:
+
+    python benchmarks/tool_calling.py --n-tools 50 --runs 200
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from agentic_patterns.planning_pattern.react_agent import ReactAgent
+from agentic_patterns.tool_pattern.tool import get_fn_signature
+from agentic_patterns.tool_pattern.tool import Tool
+from agentic_patterns.tool_pattern.tool_calling import NATIVE
+from agentic_patterns.tool_pattern.tool_calling import XML
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+
+def make_tools(n_tools: int) -> list[Tool]:
+    tools = []
+    for i in range(n_tools):
+
+        def fn(a: int, b: int) -> int:
+            return a + b
+
+        fn.__name__ = f"sum_two_elements_{i}"
+        fn.__doc__ = f"""
+        Computes the sum of two integers (variant {i}).
+
+        Args:
+            a (int): The first integer to be summed.
+            b (int): The second integer to be summed.
+        """
+        signature = get_fn_signature(fn)
+        tools.append(Tool(name=fn.__name__, fn=fn, fn_signature=json.dumps(signature)))
+    return tools
+
+
+def scripted_responder(mode: str):
+    def responder(messages, model, **kwargs):
+        if not str(messages[-1]["content"]).startswith("<question>"):
+            return "<response>3</response>"
+        if mode == NATIVE:
+            return {
+                "content": "<thought>I need to sum 1 and 2</thought>",
+                "tool_calls": [
+                    {"name": "sum_two_elements_0", "arguments": {"a": 1, "b": 2}}
+                ],
+            }
+        return (
+            "<thought>I need to sum 1 and 2</thought>"
+            '<tool_call>{"name": "sum_two_elements_0", "arguments": {"a": 1, "b": 2}, "id": 0}</tool_call>'
+        )
+
+    return responder
+
+
+def bench(mode: str, tools: list[Tool], runs: int) -> dict:
+    client = FakeLLMClient(responder=scripted_responder(mode))
+    agent = ReactAgent(tools=tools, tool_calling=mode, client=client)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(runs):
+            assert agent.run(user_msg="Sum 1 and 2") == "3"
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "requests": len(client.requests),
+        "prompt_tokens_per_run": client.prompt_tokens / runs,
+        "client_ms_per_run": (elapsed - client.server_time) / runs * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-tools", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    tools = make_tools(args.n_tools)
+    for mode in (XML, NATIVE):
+        print(json.dumps(bench(mode, tools, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Measures the startup time and memory of a ReactAgent over a large generated tool library, importing
+every tool module up front against looking the tools up in a ToolRegistry (cold signature cache,
+warm cache and precomputed manifest). Each variant runs in a fresh interpreter, and only the tool
+loading and agent construction are measured.
+
+    python benchmarks/tool_registry.py --modules 40 --tools-per-module 10
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+MODULE_TEMPLATE = """
+from agentic_patterns.tool_pattern.tool import tool
+
+# Stands in for the heavy dependencies tool modules usually import
+LOOKUP_TABLE = {{i: str(i) * 4 for i in range({import_cost})}}
+{tools}
+"""
+
+TOOL_TEMPLATE = '''
+
+@tool
+def {name}(query: str, limit: int) -> str:
+    """
+    Runs the {name} tool.
+
+    Args:
+        query (str): The query.
+        limit (int): The maximum number of results.
+    """
+    return query[:limit]
+'''
+
+STARTUP_SCRIPT = """
+import json, sys, time, tracemalloc
+
+from agentic_patterns.planning_pattern.react_agent import ReactAgent
+from agentic_patterns.tool_pattern.tool_registry import load_target, ToolRegistry
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+
+tracemalloc.start()
+start = time.perf_counter()
+
+mode, targets, root = sys.argv[1], json.loads(sys.argv[2]), sys.argv[3]
+if mode == "eager":
+    tools = [load_target(target) for target in targets]
+else:
+    registry = ToolRegistry(cache_path=root + "/signatures.json")
+    if mode == "manifest":
+        registry.load_manifest(root + "/manifest.json")
+    else:
+        for target in targets:
+            registry.register(target)
+    tools = registry.resolve([target.partition(":")[2] for target in targets])
+    if mode == "cold":
+        registry.write_manifest(root + "/manifest.json")
+
+agent = ReactAgent(tools=tools, top_k_tools=5, client=FakeLLMClient())
+elapsed = time.perf_counter() - start
+_, peak = tracemalloc.get_traced_memory()
+print(json.dumps({
+    "startup_ms": round(elapsed * 1000, 1),
+    "peak_mb": round(peak / 2**20, 2),
+    "tool_modules_imported": sum(name.startswith("bench_tools.") for name in sys.modules),
+}))
+"""
+
+
+def generate_library(
+    root: Path, n_modules: int, tools_per_module: int, import_cost: int
+):
+    package = root / "bench_tools"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    targets = []
+    for m in range(n_modules):
+        names = [f"tool_{m}_{t}" for t in range(tools_per_module)]
+        tools = "".join(TOOL_TEMPLATE.format(name=name) for name in names)
+        (package / f"module_{m}.py").write_text(
+            MODULE_TEMPLATE.format(import_cost=import_cost, tools=tools)
+        )
+        targets += [f"bench_tools.module_{m}:{name}" for name in names]
+    return targets
+
+
+def run(mode: str, targets: list[str], root: Path) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, mode, json.dumps(targets), str(root)],
+        cwd=root,
+        env={"GROQ_API_KEY": "x", "PYTHONPATH": f"{root}:{Path('src').resolve()}"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=40)
+    parser.add_argument("--tools-per-module", type=int, default=10)
+    parser.add_argument("--import-cost", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        targets = generate_library(
+            root, args.modules, args.tools_per_module, args.import_cost
+        )
+        results = {
+            "tools": len(targets),
+            # The cold run also writes the manifest used by the last one
+            **{mode: run(mode, targets, root) for mode in ("eager", "cold", "warm")},
+            "manifest": run("manifest", targets, root),
+        }
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Measures how the ReAct system prompt grows with the size of the tool registry, with and
+without BM25 tool subset selection, and checks that the relevant tool is still recalled.
+
+    python benchmarks/tool_selection.py --top-k 5
+"""
+
+import argparse
+import itertools
+import json
+import time
+
+from agentic_patterns.planning_pattern.react_agent import ReactAgent
+from agentic_patterns.tool_pattern.tool import get_fn_signature
+from agentic_patterns.tool_pattern.tool import Tool
+from agentic_patterns.utils.fake_llm import FakeLLMClient
+from agentic_patterns.utils.tokens import estimate_tokens
+
+VERBS = ["fetch", "compute", "translate", "convert", "summarize", "search", "plot"]
+OBJECTS = [
+    "weather",
+    "stock_price",
+    "hacker_news_story",
+    "exchange_rate",
+    "wikipedia_article",
+    "temperature",
+    "flight_status",
+    "calendar_event",
+    "github_issue",
+    "recipe",
+    "movie_rating",
+    "train_schedule",
+    "crypto_price",
+    "news_headline",
+    "email",
+    "tweet",
+    "invoice",
+    "podcast_episode",
+    "book_review",
+    "sport_score",
+    "air_quality",
+    "earthquake",
+    "patent",
+    "lyric",
+    "dictionary_definition",
+    "zip_code",
+    "timezone",
+    "holiday",
+    "map_route",
+]
+
+
+def make_tools(n_tools: int) -> list[Tool]:
+    tools = []
+    for verb, obj in itertools.islice(itertools.product(VERBS, OBJECTS), n_tools):
+        name = f"{verb}_{obj}"
+
+        def fn(query: str) -> str:
+            return query
+
+        fn.__name__ = name
+        fn.__doc__ = f"""
+        {verb.capitalize()} the {obj.replace('_', ' ')} matching the query.
+
+        Args:
+            query (str): What to {verb}.
+        """
+        tools.append(
+            Tool(name=name, fn=fn, fn_signature=json.dumps(get_fn_signature(fn)))
+        )
+    return tools
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    client = FakeLLMClient()
+    for n_tools in (10, 50, 100, 200):
+        tools = make_tools(n_tools)
+        full = ReactAgent(tools=tools, client=client)
+        subset = ReactAgent(tools=tools, top_k_tools=args.top_k, client=client)
+
+        hits = 0
+        start = time.perf_counter()
+        for tool in tools:
+            verb, obj = tool.name.split("_", 1)
+            query = f"Please {verb} the {obj.replace('_', ' ')} for me"
+            hits += tool in subset.select_tools(query)
+        selection_ms = (time.perf_counter() - start) / len(tools) * 1000
+
+        query = "Please fetch the weather in Madrid"
+        full_tokens = estimate_tokens(
+            full.build_system_prompt(full.select_tools(query))
+        )
+        subset_tokens = estimate_tokens(
+            subset.build_system_prompt(subset.select_tools(query))
+        )
+        print(
+            json.dumps(
+                {
+                    "n_tools": n_tools,
+                    "system_prompt_tokens_full": full_tokens,
+                    "system_prompt_tokens_top_k": subset_tokens,
+                    "recall_at_k": hits / len(tools),
+                    "selection_ms": round(selection_ms, 4),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
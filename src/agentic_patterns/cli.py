@@ -0,0 +1,322 @@
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from pathlib import Path
+
+from agentic_patterns.jobs import run_job
+from agentic_patterns.utils.providers import get_provider
+from agentic_patterns.utils.providers import GROQ
+from agentic_patterns.utils.providers import Provider
+from agentic_patterns.utils.providers import PROVIDERS
+
+
+PROGRESS_SUFFIX = ".progress"
+
+
+def read_progress(progress_path: Path) -> set[int]:
+    """
+    Reads the line numbers of the jobs already completed successfully by a previous run.
+
+    Args:
+        progress_path (Path): The sidecar progress file.
+
+    Returns:
+        set[int]: The completed line numbers.
+    """
+    if not progress_path.exists():
+        return set()
+    with progress_path.open() as f:
+        return {int(line) for line in f if line.strip()}
+
+
+def iter_jobs(input_path: Path, done: set[int]):
+    """
+    Yields the pending jobs of a JSONL file, one per non empty line.
+
+    Args:
+        input_path (Path): The JSONL file of jobs.
+        done (set[int]): The line numbers to skip.
+
+    Yields:
+        tuple[int, str]: The line number and the raw line.
+    """
+    with input_path.open() as f:
+        for line_number, line in enumerate(f, start=1):
+            if line.strip() and line_number not in done:
+                yield line_number, line
+
+
+def execute(line_number: int, line: str, client=None) -> dict:
+    """
+    Runs one JSONL line and builds its result record. Errors are reported in the record
+    instead of being raised, so a bad job never stops the bulk run.
+
+    Args:
+        line_number (int): The line number in the input file.
+        line (str): The raw JSON line.
+        client (optional): The client used by the agents.
+
+    Returns:
+        dict: The result record.
+    """
+    start = time.perf_counter()
+    record: dict = {"line": line_number}
+    try:
+        job = json.loads(line)
+        record["id"] = job.get("id", line_number)
+        record["output"] = run_job(job, client=client)
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["latency_s"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Returns the q-th percentile (0-100) of a list of values.
+    """
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def run_bulk(
+    input_path: Path,
+    output_path: Path,
+    concurrency: int = 4,
+    resume: bool = True,
+    client=None,
+) -> dict:
+    """
+    Runs every job of a JSONL file with bounded concurrency, streaming the results to a JSONL
+    output file as soon as they complete.
+
+    The line numbers of the successful jobs are appended to a `<output>.progress` sidecar file,
+    so an interrupted run can be resumed without redoing finished lines. Failed jobs (e.g. rate
+    limits or timeouts) are retried by the resumed run, which appends their new result.
+
+    Args:
+        input_path (Path): The JSONL file of jobs.
+        output_path (Path): The JSONL file where results are appended.
+        concurrency (int, optional): The maximum number of jobs running at once. Defaults to 4.
+        resume (bool, optional): Whether to skip the jobs completed by a previous run. Defaults to True.
+        client (optional): The client used by the agents. Defaults to the process-wide provider.
+
+    Returns:
+        dict: A summary with counts, throughput and latency percentiles.
+    """
+    progress_path = output_path.with_name(output_path.name + PROGRESS_SUFFIX)
+    if not resume:
+        output_path.unlink(missing_ok=True)
+        progress_path.unlink(missing_ok=True)
+    done = read_progress(progress_path)
+
+    latencies: list[float] = []
+    counts = {"ok": 0, "error": 0, "skipped": len(done)}
+    write_lock = threading.Lock()
+    start = time.perf_counter()
+
+    with output_path.open("a") as output, progress_path.open(
+        "a"
+    ) as progress, ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def save(record: dict) -> None:
+            with write_lock:
+                output.write(json.dumps(record, default=str) + "\n")
+                output.flush()
+                # The progress is written after the result, so a crash can at worst
+                # duplicate a result line, never lose one
+                if record["status"] == "ok":
+                    progress.write(f"{record['line']}\n")
+                    progress.flush()
+                counts[record["status"]] += 1
+                latencies.append(record["latency_s"])
+
+        # Never read more lines than we can run, so huge files don't fill the memory
+        in_flight: set = set()
+        for line_number, line in iter_jobs(input_path, done):
+            if len(in_flight) >= concurrency:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    save(future.result())
+            in_flight.add(executor.submit(execute, line_number, line, client))
+
+        for future in wait(in_flight).done:
+            save(future.result())
+
+    elapsed = time.perf_counter() - start
+    completed = counts["ok"] + counts["error"]
+    return {
+        **counts,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_jobs_per_s": round(completed / elapsed, 3) if elapsed else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 4) if latencies else None,
+        "latency_p95_s": round(percentile(latencies, 95), 4) if latencies else None,
+        "latency_max_s": round(max(latencies), 4) if latencies else None,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="agentic-patterns",
+        description="Run the agentic patterns from the command line.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run a JSONL file of jobs and stream the results to a JSONL file."
+    )
+    run_parser.add_argument("input", type=Path, help="The JSONL file of jobs.")
+    run_parser.add_argument(
+        "-o", "--output", type=Path, required=True, help="The JSONL results file."
+    )
+    run_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of jobs running at once (default: 4).",
+    )
+    run_parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Start from scratch, discarding previous results and progress.",
+    )
+    run_parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Hide the agents' intermediate output.",
+    )
+    add_provider_arguments(run_parser)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve the agents over HTTP (requires uvicorn)."
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of runs executing at once (default: 8).",
+    )
+    serve_parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=64,
+        help="Maximum number of runs waiting for a worker before rejecting requests (default: 64).",
+    )
+    serve_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=120.0,
+        help="Deadline of every run, in seconds (default: 120).",
+    )
+    add_provider_arguments(serve_parser)
+    return parser
+
+
+def add_provider_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        help="The LLM backend (default: $AGENTIC_PATTERNS_PROVIDER or groq).",
+    )
+    parser.add_argument(
+        "--base-url",
+        help="The API base URL, e.g. http://localhost:8000/v1 for a local OpenAI-compatible server.",
+    )
+    parser.add_argument("--model", help="Replaces the models requested by the agents.")
+
+
+def build_provider(args: argparse.Namespace) -> Provider | None:
+    """
+    Builds the provider selected by the command line options, or None to use the default one.
+    """
+    if args.provider is None and args.base_url is None and args.model is None:
+        return None
+
+    kwargs = {"model": args.model}
+    if args.base_url is not None:
+        kwargs["base_url"] = args.base_url
+    return get_provider(args.provider or GROQ, **kwargs)
+
+
+def serve(
+    host: str,
+    port: int,
+    concurrency: int,
+    max_queue: int,
+    timeout: float | None = None,
+    client=None,
+) -> int:
+    """
+    Serves the agents over HTTP with uvicorn.
+    """
+    try:
+        import uvicorn
+    except ImportError:
+        print(
+            "The `serve` command requires uvicorn: pip install uvicorn", file=sys.stderr
+        )
+        return 2
+
+    from agentic_patterns.server import AgentServer
+
+    app = AgentServer(
+        client=client,
+        max_concurrency=concurrency,
+        max_queue=max_queue,
+        timeout=timeout,
+    )
+    uvicorn.run(app, host=host, port=port)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the `agentic-patterns` console script.
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        with open(os.devnull, "w") as devnull:
+            quiet = contextlib.redirect_stdout(devnull)
+            with quiet if args.quiet else contextlib.nullcontext():
+                summary = run_bulk(
+                    args.input,
+                    args.output,
+                    concurrency=args.concurrency,
+                    resume=not args.no_resume,
+                    client=build_provider(args),
+                )
+        print(json.dumps(summary, indent=2))
+        return 1 if summary["error"] else 0
+
+    if args.command == "serve":
+        return serve(
+            args.host,
+            args.port,
+            args.concurrency,
+            args.max_queue,
+            args.timeout,
+            client=build_provider(args),
+        )
+
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+from typing import Callable
+
+from agentic_patterns.multiagent_pattern.agent import Agent
+from agentic_patterns.multiagent_pattern.crew import Crew
+from agentic_patterns.multiagent_pattern.crew import TokenEvent
+from agentic_patterns.planning_pattern.react_agent import ReactAgent
+from agentic_patterns.reflection_pattern.reflection_agent import ReflectionAgent
+from agentic_patterns.tool_pattern.tool import Tool
+from agentic_patterns.tool_pattern.tool_agent import ToolAgent
+from agentic_patterns.tool_pattern.tool_registry import get_registry
+from agentic_patterns.utils.budget import Budget
+
+
+REFLECTION = "reflection"
+TOOL = "tool"
+REACT = "react"
+CREW = "crew"
+
+PATTERNS = (REFLECTION, TOOL, REACT, CREW)
+
+# The agent constructor arguments that untrusted jobs may set, per pattern. For crews, the
+# arguments of each agent of the crew
+UNTRUSTED_AGENT_KWARGS = {
+    REFLECTION: {"model"},
+    TOOL: {"tools", "model", "tool_calling", "top_k_tools", "max_repairs"},
+    REACT: {
+        "tools",
+        "model",
+        "system_prompt",
+        "tool_calling",
+        "top_k_tools",
+        "max_repairs",
+    },
+    CREW: {
+        "name",
+        "backstory",
+        "task_description",
+        "task_expected_output",
+        "tools",
+        "llm",
+    },
+}
+
+# The `run` arguments that untrusted jobs may set, per pattern
+UNTRUSTED_RUN_KWARGS = {
+    REFLECTION: {
+        "user_msg",
+        "generation_system_prompt",
+        "reflection_system_prompt",
+        "n_steps",
+    },
+    TOOL: {"user_msg"},
+    REACT: {"user_msg", "max_rounds"},
+    CREW: set(),
+}
+
+# The upper bound of the number of rounds that untrusted jobs may request
+UNTRUSTED_RUN_LIMITS = {"n_steps": 10, "max_rounds": 10}
+
+
+def load_tools(paths: list[str], trusted: bool = True) -> list[Tool]:
+    """
+    Looks up the tools referenced by a job in the tool registry. Their modules are only imported
+    when the tools are first called.
+
+    Args:
+        paths (list[str]): The registry names or 'module:attribute' paths of the tools.
+        trusted (bool, optional): Whether the job comes from a trusted source. Untrusted jobs can
+            only use tools already registered by name, never import paths, which would import any
+            module they name. Defaults to True.
+
+    Returns:
+        list[Tool]: The tools.
+
+    Raises:
+        ValueError: If an untrusted job uses an import path or a tool that isn't registered.
+    """
+    registry = get_registry()
+    if not trusted:
+        for name in paths:
+            if not isinstance(name, str) or ":" in name:
+                raise ValueError(
+                    f"Invalid tool {name!r}. Use the name of a registered tool"
+                )
+            if name not in registry:
+                raise ValueError(f"Unknown tool '{name}'")
+    return registry.resolve(paths)
+
+
+def check_agent_kwargs(pattern: str, kwargs: dict) -> None:
+    """
+    Checks that an untrusted job only sets the agent arguments allowed for its pattern (see
+    `UNTRUSTED_AGENT_KWARGS`).
+
+    Args:
+        pattern (str): The job pattern.
+        kwargs (dict): The agent constructor arguments.
+
+    Raises:
+        ValueError: If an argument is not allowed.
+    """
+    if not isinstance(kwargs, dict):
+        raise ValueError("The agent arguments must be a JSON object")
+    forbidden = set(kwargs) - UNTRUSTED_AGENT_KWARGS[pattern]
+    if forbidden:
+        raise ValueError(f"Agent arguments not allowed: {', '.join(sorted(forbidden))}")
+
+
+def check_run_kwargs(pattern: str, kwargs: dict) -> None:
+    """
+    Checks that an untrusted job only sets the `run` arguments allowed for its pattern (see
+    `UNTRUSTED_RUN_KWARGS`), and that its number of rounds is within `UNTRUSTED_RUN_LIMITS`.
+
+    Args:
+        pattern (str): The job pattern.
+        kwargs (dict): The `run` arguments.
+
+    Raises:
+        ValueError: If an argument is not allowed or is out of bounds.
+    """
+    if not isinstance(kwargs, dict):
+        raise ValueError("The input must be a JSON object")
+    forbidden = set(kwargs) - UNTRUSTED_RUN_KWARGS[pattern]
+    if forbidden:
+        raise ValueError(f"Input arguments not allowed: {', '.join(sorted(forbidden))}")
+    for name, limit in UNTRUSTED_RUN_LIMITS.items():
+        value = kwargs.get(name, 1)
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, int)
+            or not 1 <= value <= limit
+        ):
+            raise ValueError(f"'{name}' must be an integer between 1 and {limit}")
+
+
+def build_crew(spec: dict, client=None, trusted: bool = True) -> Crew:
+    """
+    Builds a Crew from its JSON description.
+
+    The spec contains an `agents` list, where each agent is described by the `Agent` constructor
+    arguments (with `tools` given as registry names or import paths), and an optional
+    `dependencies` list of `[agent_name, dependent_name]` pairs.
+
+    Args:
+        spec (dict): The crew description.
+        client (optional): The client shared by all the agents.
+        trusted (bool, optional): Whether the spec comes from a trusted source (see `run_job`).
+            Defaults to True.
+
+    Returns:
+        Crew: The crew, ready to run.
+
+    Raises:
+        ValueError: If an untrusted spec sets arguments or tools that aren't allowed.
+    """
+    with Crew() as crew:
+        agents = {}
+        for agent_spec in spec["agents"]:
+            if not trusted:
+                check_agent_kwargs(CREW, agent_spec)
+            agent_spec = dict(agent_spec)
+            agent_spec["tools"] = load_tools(agent_spec.get("tools", []), trusted)
+            agent = Agent(**agent_spec, client=client)
+            agents[agent.name] = agent
+
+        crew.add_dependencies(
+            (agents[name], agents[dependent_name])
+            for name, dependent_name in spec.get("dependencies", [])
+        )
+
+    return crew
+
+
+def run_crew(
+    crew: Crew,
+    on_token: Callable[[str], None] | None = None,
+    budget: Budget | None = None,
+) -> dict:
+    """
+    Runs all the agents of a crew in topological order, without printing their outputs.
+
+    Args:
+        crew (Crew): The crew to run.
+        on_token (Callable[[str], None] | None, optional): If given, the token deltas of the
+            agents' LLM calls are passed to this callback as they arrive.
+        budget (Budget | None, optional): The deadline and token / cost budget of the crew.
+
+    Returns:
+        dict: A dictionary mapping agent names to their outputs. When the budget runs out, only
+            the agents that finished are included.
+    """
+    outputs = {}
+    for event in crew.stream(tokens=on_token is not None, budget=budget):
+        if isinstance(event, TokenEvent):
+            on_token(event.delta)
+        else:
+            outputs[event.agent.name] = event.output
+    return outputs
+
+
+def run_job(
+    job: dict,
+    client=None,
+    on_token: Callable[[str], None] | None = None,
+    trusted: bool = True,
+    max_timeout: float | None = None,
+):
+    """
+    Runs a single job.
+
+    A job is a dict with the following keys:
+        - pattern: one of 'reflection', 'tool', 'react' or 'crew'.
+        - agent (optional): the agent constructor arguments, with `tools` given as registry names
+          or import paths.
+        - input: the arguments of the agent's `run` method (e.g. `user_msg`).
+        - crew: the crew description when the pattern is 'crew' (see `build_crew`).
+        - budget (optional): the `Budget` arguments (`timeout`, `max_tokens`, `max_cost`, `prices`).
+
+    Args:
+        job (dict): The job description.
+        client (optional): The client used by the agents. Defaults to the process-wide provider.
+        on_token (Callable[[str], None] | None, optional): If given, the LLM calls are streamed and
+            their token deltas are passed to this callback as they arrive.
+        trusted (bool, optional): Whether the job comes from a trusted source, like a local JSONL
+            file. Untrusted jobs (e.g. HTTP requests) can only set the agent and run arguments
+            listed in `UNTRUSTED_AGENT_KWARGS` and `UNTRUSTED_RUN_KWARGS`, and use registered
+            tools by name. Defaults to True.
+        max_timeout (float | None, optional): The longest duration of the run, in seconds. The
+            budget timeout of the job is capped to it, and jobs without one get it. Defaults to
+            None (no deadline).
+
+    Returns:
+        The output of the agent (a dict of agent outputs for crews).
+
+    Raises:
+        ValueError: If the pattern is unknown, or an untrusted job sets arguments or tools that
+            aren't allowed.
+    """
+    pattern = job.get("pattern")
+    agent_kwargs = job.get("agent", {})
+    run_kwargs = job.get("input", {})
+    budget_kwargs = dict(job.get("budget") or {})
+    if max_timeout is not None:
+        timeout = budget_kwargs.get("timeout")
+        budget_kwargs["timeout"] = (
+            max_timeout if timeout is None else min(timeout, max_timeout)
+        )
+
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown pattern '{pattern}'. Expected one of {PATTERNS}")
+    if not trusted:
+        check_run_kwargs(pattern, run_kwargs)
+        if pattern != CREW:
+            check_agent_kwargs(pattern, agent_kwargs)
+    agent_kwargs = dict(agent_kwargs)
+    budget = Budget(**budget_kwargs) if budget_kwargs else None
+
+    if pattern == CREW:
+        crew = build_crew(job["crew"], client=client, trusted=trusted)
+        return run_crew(crew, on_token=on_token, budget=budget)
+
+    if pattern == REFLECTION:
+        agent = ReflectionAgent(**agent_kwargs, client=client)
+        return agent.run(**run_kwargs, on_token=on_token, budget=budget)
+
+    agent_kwargs["tools"] = load_tools(agent_kwargs.get("tools", []), trusted)
+    agent_cls = ToolAgent if pattern == TOOL else ReactAgent
+    agent = agent_cls(**agent_kwargs, client=client)
+    return agent.run(**run_kwargs, on_token=on_token, budget=budget)
@@ -1,8 +1,66 @@
+from collections.abc import Sequence
 from textwrap import dedent
+from typing import Callable
 
 from agentic_patterns.multiagent_pattern.crew import Crew
 from agentic_patterns.planning_pattern.react_agent import ReactAgent
 from agentic_patterns.tool_pattern.tool import Tool
+from agentic_patterns.utils.budget import Budget
+from agentic_patterns.utils.profiling import profile_agent
+from agentic_patterns.utils.routing import ModelRouter
+
+
+class AgentSet(Sequence):
+    """
+    An insertion-ordered set of agents, used for the dependencies and dependents of an agent.
+
+    Membership checks are O(1) and duplicated agents are ignored, while it still behaves like the
+    list it replaces: it can be iterated, indexed, sliced and compared to a list.
+    """
+
+    def __init__(self, agents=()):
+        self._agents = dict.fromkeys(agents)
+        self._list: list | None = None
+
+    def __len__(self):
+        return len(self._agents)
+
+    def __iter__(self):
+        return iter(self._agents)
+
+    def __contains__(self, agent) -> bool:
+        return agent in self._agents
+
+    def __getitem__(self, index):
+        if self._list is None:
+            self._list = list(self._agents)
+        return self._list[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (AgentSet, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def add(self, agent) -> None:
+        """
+        Adds an agent, unless it's already in the set.
+        """
+        if agent not in self._agents:
+            self._agents[agent] = None
+            self._list = None
+
+    # Kept for the code that appended to the former lists
+    append = add
+
+    def discard(self, agent) -> None:
+        """
+        Removes an agent, if it's in the set.
+        """
+        if self._agents.pop(agent, self) is not self:
+            self._list = None
 
 
 class Agent:
@@ -18,17 +76,21 @@ class Agent:
         task_description (str): A description of the task assigned to the agent.
         task_expected_output (str): The expected format or content of the task output.
         react_agent (ReactAgent): An instance of ReactAgent used for generating responses.
-        dependencies (list[Agent]): A list of Agent instances that this agent depends on.
-        dependents (list[Agent]): A list of Agent instances that depend on this agent.
+        dependencies (AgentSet): The agents that this agent depends on, in insertion order.
+        dependents (AgentSet): The agents that depend on this agent, in insertion order.
         context (str): Accumulated context information from other agents.
+        crew (Crew | None): The crew this agent belongs to, if any.
 
     Args:
         name (str): The name of the agent.
         backstory (str): The backstory or background of the agent.
         task_description (str): A description of the task assigned to the agent.
         task_expected_output (str, optional): The expected format or content of the task output. Defaults to "".
-        tools (list[Tool] | None, optional): A list of Tool instances available to the agent. Defaults to None.
-        llm (str, optional): The name of the language model to use. Defaults to "llama-3.1-70b-versatile".
+        tools (list[Tool | str] | None, optional): A list of Tool instances (or tool registry names)
+            available to the agent. Defaults to None.
+        llm (str | ModelRouter, optional): The name of the language model to use, or a routing policy
+            picking one model per call type. Defaults to "llama-3.1-70b-versatile".
+        client (optional): The client used to interact with the language model. Defaults to the process-wide provider.
     """
 
     def __init__(
@@ -37,21 +99,23 @@ class Agent:
         backstory: str,
         task_description: str,
         task_expected_output: str = "",
-        tools: list[Tool] | None = None,
-        llm: str = "llama-3.1-70b-versatile",
+        tools: list[Tool | str] | None = None,
+        llm: str | ModelRouter = "llama-3.1-70b-versatile",
+        client=None,
     ):
         self.name = name
         self.backstory = backstory
         self.task_description = task_description
         self.task_expected_output = task_expected_output
         self.react_agent = ReactAgent(
-            model=llm, system_prompt=self.backstory, tools=tools or []
+            model=llm, system_prompt=self.backstory, tools=tools or [], client=client
         )
 
-        self.dependencies: list[Agent] = []  # Agents that this agent depends on
-        self.dependents: list[Agent] = []  # Agents that depend on this agent
+        self.dependencies = AgentSet()  # Agents that this agent depends on
+        self.dependents = AgentSet()  # Agents that depend on this agent
 
         self.context = ""
+        self.crew: Crew | None = None
 
         # Automatically register this agent to the active Crew context if one exists
         Crew.register_agent(self)
@@ -115,14 +179,13 @@ class Agent:
 
         Raises:
             TypeError: If the dependency is not an Agent or a list of Agents.
+            ValueError: If the dependency would create a cycle.
         """
         if isinstance(other, Agent):
-            self.dependencies.append(other)
-            other.dependents.append(self)
+            link(other, self)
         elif isinstance(other, list) and all(isinstance(item, Agent) for item in other):
             for item in other:
-                self.dependencies.append(item)
-                item.dependents.append(self)
+                link(item, self)
         else:
             raise TypeError("The dependency must be an instance or list of Agent.")
 
@@ -135,14 +198,13 @@ class Agent:
 
         Raises:
             TypeError: If the dependent is not an Agent or a list of Agents.
+            ValueError: If the dependent would create a cycle.
         """
         if isinstance(other, Agent):
-            other.dependencies.append(self)
-            self.dependents.append(other)
+            link(self, other)
         elif isinstance(other, list) and all(isinstance(item, Agent) for item in other):
             for item in other:
-                item.dependencies.append(self)
-                self.dependents.append(item)
+                link(self, item)
         else:
             raise TypeError("The dependent must be an instance or list of Agent.")
 
@@ -191,19 +253,101 @@ class Agent:
 
         return prompt
 
-    def run(self):
+    def run(
+        self,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
+    ):
         """
         Runs the agent's task and generates the output.
 
         This method creates a prompt, runs it through the ReactAgent, and passes the output to all dependent agents.
 
+        Args:
+            on_token (Callable[[str], None] | None, optional): If given, the LLM calls are streamed and
+                their token deltas are passed to this callback as they arrive.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run.
+
         Returns:
             str: The output generated by the agent.
         """
         msg = self.create_prompt()
-        output = self.react_agent.run(user_msg=msg)
+        with profile_agent(self.name):
+            output = self.react_agent.run(
+                user_msg=msg, on_token=on_token, budget=budget
+            )
 
         # Pass the output to all dependents
         for dependent in self.dependents:
             dependent.receive_context(output)
         return output
+
+
+def creates_cycle(agent: Agent, dependent: Agent) -> bool:
+    """
+    Checks whether making `dependent` depend on `agent` would create a cycle, i.e. whether
+    `agent` is already reachable from `dependent`.
+
+    When both agents belong to a crew with a cached topological order, the search is pruned
+    with it: if `agent` comes first there can't be a path back, and otherwise only the agents
+    placed before `agent` need to be visited.
+
+    Args:
+        agent (Agent): The agent that `dependent` would depend on.
+        dependent (Agent): The dependent agent.
+
+    Returns:
+        bool: True if the dependency would create a cycle.
+    """
+    if agent is dependent:
+        return True
+
+    crew = agent.crew
+    positions = (
+        crew.positions() if crew is not None and crew is dependent.crew else None
+    )
+    bound = None
+    if positions is not None and agent in positions and dependent in positions:
+        if positions[agent] < positions[dependent]:
+            return False
+        bound = positions[agent]
+
+    visited = {dependent}
+    stack = [dependent]
+    while stack:
+        for node in stack.pop().dependents:
+            if node is agent:
+                return True
+            if node in visited:
+                continue
+            # Agents placed after `agent` can't reach it, so they are not explored
+            if bound is not None and positions.get(node, bound) > bound:
+                continue
+            visited.add(node)
+            stack.append(node)
+    return False
+
+
+def link(agent: Agent, dependent: Agent):
+    """
+    Makes `dependent` depend on `agent`. Duplicated dependencies are ignored.
+
+    Args:
+        agent (Agent): The agent that `dependent` depends on.
+        dependent (Agent): The dependent agent.
+
+    Raises:
+        ValueError: If the dependency would create a cycle.
+    """
+    if dependent in agent.dependents:
+        return
+    if creates_cycle(agent, dependent):
+        raise ValueError(
+            f"Adding the dependency {agent} >> {dependent} would create a cycle"
+        )
+
+    agent.dependents.add(dependent)
+    dependent.dependencies.add(agent)
+
+    for crew in {agent.crew, dependent.crew} - {None}:
+        crew.dependency_added(agent, dependent)
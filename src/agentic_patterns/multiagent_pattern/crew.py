@@ -1,11 +1,85 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+import warnings
 from collections import deque
+from typing import AsyncIterator
+from typing import Iterator
+from typing import NamedTuple
 
 from colorama import Fore
 from graphviz import Digraph  # type: ignore
 
+from agentic_patterns.utils.budget import Budget
+from agentic_patterns.utils.budget import BudgetExceeded
 from agentic_patterns.utils.logging import fancy_print
 
 
+class CrewEvent(NamedTuple):
+    """
+    An event emitted by `Crew.stream` when an agent finishes.
+
+    Attributes:
+        agent: The agent that finished.
+        output (str): The agent's output.
+        timing (float): The agent's running time, in seconds.
+    """
+
+    agent: object
+    output: str
+    timing: float
+
+
+class TokenEvent(NamedTuple):
+    """
+    An event emitted by `Crew.stream(tokens=True)` for every token delta of an agent's LLM calls.
+
+    Attributes:
+        agent: The agent producing the tokens.
+        delta (str): The token delta.
+    """
+
+    agent: object
+    delta: str
+
+
+_DONE = object()
+
+
+def _run_agent(agent, budget: Budget | None, on_token=None) -> str:
+    if budget is not None:
+        budget.check()
+    return agent.run(on_token=on_token, budget=budget)
+
+
+def _report_budget(error: BudgetExceeded, agent) -> None:
+    print(Fore.YELLOW + f"\n{error}. Stopping the crew before {agent}")
+
+
+# The crew being defined in the current thread or asyncio task
+_current_crew: contextvars.ContextVar["Crew | None"] = contextvars.ContextVar(
+    "current_crew", default=None
+)
+# The tokens to restore the enclosing crews on exit, kept per context as well so the
+# same crew can be entered concurrently
+_crew_tokens: contextvars.ContextVar[tuple] = contextvars.ContextVar(
+    "crew_tokens", default=()
+)
+
+
+class _CurrentCrewAlias:
+    # The former `Crew.current_crew` class attribute, now backed by the context variable
+    def __get__(self, instance, owner) -> "Crew | None":
+        warnings.warn(
+            "Crew.current_crew is deprecated, use Crew.current() instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return _current_crew.get()
+
+
 class Crew:
     """
     A class representing a crew of agents working together.
@@ -13,15 +87,24 @@ class Crew:
     This class manages a group of agents, their dependencies, and provides methods
     for running the agents in a topologically sorted order.
 
+    The topological order is cached and only recomputed after a mutation that may break it,
+    so adding an agent, or a dependency that agrees with the current order, keeps the cache.
+
+    The active crew is stored in a context variable, so crews defined at the same time in
+    different threads or asyncio tasks never see each other's agents, and nested crews
+    restore the outer one on exit.
+
     Attributes:
-        current_crew (Crew): Class-level variable to track the active Crew context.
+        current_crew (Crew | None): Deprecated alias of `Crew.current()`.
         agents (list): A list of agents in the crew.
     """
 
-    current_crew = None
+    current_crew = _CurrentCrewAlias()
 
     def __init__(self):
         self.agents = []
+        self._order: list | None = []  # Cached topological order, None when invalid
+        self._positions: dict = {}  # Agent -> index in the cached order
 
     def __enter__(self):
         """
@@ -30,19 +113,21 @@ class Crew:
         Returns:
             Crew: The current Crew instance.
         """
-        Crew.current_crew = self
+        _crew_tokens.set((*_crew_tokens.get(), _current_crew.set(self)))
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Exits the context manager, clearing the active context.
+        Exits the context manager, restoring the previously active context.
 
         Args:
             exc_type: The exception type, if an exception was raised.
             exc_val: The exception value, if an exception was raised.
             exc_tb: The traceback, if an exception was raised.
         """
-        Crew.current_crew = None
+        *tokens, token = _crew_tokens.get()
+        _crew_tokens.set(tuple(tokens))
+        _current_crew.reset(token)
 
     def add_agent(self, agent):
         """
@@ -52,6 +137,107 @@ class Crew:
             agent: The agent to be added to the crew.
         """
         self.agents.append(agent)
+        agent.crew = self
+
+        if self._order is not None and not agent.dependencies and not agent.dependents:
+            # An isolated agent can go last without breaking the cached order
+            self._positions[agent] = len(self._order)
+            self._order.append(agent)
+        else:
+            self._invalidate_order()
+
+    def add_agents(self, agents):
+        """
+        Adds several agents to the crew.
+
+        Args:
+            agents: The agents to be added to the crew.
+        """
+        for agent in agents:
+            self.add_agent(agent)
+
+    def add_dependencies(self, edges):
+        """
+        Adds many dependencies at once. Duplicated edges are ignored and, instead of checking
+        for cycles after every edge, the whole graph is validated once at the end, which keeps
+        building very large crews linear in the number of edges.
+
+        Args:
+            edges: An iterable of `(agent, dependent)` pairs, where `dependent` depends on `agent`.
+
+        Raises:
+            ValueError: If an agent depends on itself or the new dependencies create a cycle. In
+                that case none of them is added.
+        """
+        # The self-edges are rejected before the graph is touched
+        edges = list(edges)
+        for agent, dependent in edges:
+            if agent is dependent:
+                raise ValueError(f"Agent {agent} can't depend on itself")
+
+        added = []
+        for agent, dependent in edges:
+            if dependent in agent.dependents:
+                continue
+            agent.dependents.add(dependent)
+            dependent.dependencies.add(agent)
+            added.append((agent, dependent))
+
+        self._invalidate_order()
+        try:
+            self.topological_sort()
+        except ValueError:
+            for agent, dependent in added:
+                agent.dependents.discard(dependent)
+                dependent.dependencies.discard(agent)
+            self._invalidate_order()
+            raise
+
+        for agent, dependent in added:
+            for crew in {agent.crew, dependent.crew} - {self, None}:
+                crew._invalidate_order()
+
+    def positions(self) -> dict | None:
+        """
+        Returns the position of every agent in the cached topological order, without
+        computing it.
+
+        Returns:
+            dict | None: A dictionary mapping agents to positions, or None if the cache is invalid.
+        """
+        return self._positions if self._order is not None else None
+
+    def dependency_added(self, agent, dependent):
+        """
+        Updates the cached topological order after a new dependency between two agents.
+        The cache is kept when the dependency agrees with it.
+
+        Args:
+            agent: The agent that `dependent` now depends on.
+            dependent: The dependent agent.
+        """
+        positions = self.positions()
+        if (
+            positions is None
+            or agent not in positions
+            or dependent not in positions
+            or positions[agent] > positions[dependent]
+        ):
+            self._invalidate_order()
+
+    def _invalidate_order(self):
+        self._order = None
+        self._positions = {}
+
+    @staticmethod
+    def current() -> "Crew | None":
+        """
+        Returns the active crew of the current thread or asyncio task.
+
+        Returns:
+            Crew | None: The active crew, or None outside a `with Crew()` block.
+        """
+        return _current_crew.get()
 
     @staticmethod
     def register_agent(agent):
@@ -61,12 +247,14 @@ class Crew:
         Args:
             agent: The agent to be registered.
         """
-        if Crew.current_crew is not None:
-            Crew.current_crew.add_agent(agent)
+        crew = _current_crew.get()
+        if crew is not None:
+            crew.add_agent(agent)
 
     def topological_sort(self):
         """
         Performs a topological sort of the agents based on their dependencies.
+        The result is cached until the crew is modified.
 
         Returns:
             list: A list of agents sorted in topological order.
@@ -74,6 +262,9 @@ class Crew:
         Raises:
             ValueError: If there's a circular dependency among the agents.
         """
+        if self._order is not None:
+            return list(self._order)
+
         in_degree = {agent: len(agent.dependencies) for agent in self.agents}
         queue = deque([agent for agent in self.agents if in_degree[agent] == 0])
 
@@ -93,7 +284,9 @@ class Crew:
                 "Circular dependencies detected among agents, preventing a valid topological sort"
             )
 
-        return sorted_agents
+        self._order = sorted_agents
+        self._positions = {agent: i for i, agent in enumerate(sorted_agents)}
+        return list(sorted_agents)
 
     def plot(self):
         """
@@ -111,13 +304,136 @@ class Crew:
                 dot.edge(dependency.name, agent.name)
         return dot
 
-    def run(self):
+    def stream(
+        self, tokens: bool = False, budget: Budget | None = None
+    ) -> Iterator[CrewEvent | TokenEvent]:
+        """
+        Runs all agents in the crew in topologically sorted order, yielding a CrewEvent as soon
+        as each agent finishes, so callers can consume early outputs before the crew is done.
+
+        Args:
+            tokens (bool, optional): If True, the agents' LLM calls are streamed and a TokenEvent is
+                also yielded for every token delta. Defaults to False.
+            budget (Budget | None, optional): The deadline and token / cost budget shared by all the
+                agents. When it runs out, the stream stops after the agents that already finished.
+
+        Yields:
+            CrewEvent | TokenEvent: The events, in the order they happen.
+        """
+        for agent in self.topological_sort():
+            start = time.perf_counter()
+
+            if not tokens:
+                try:
+                    output = _run_agent(agent, budget)
+                except BudgetExceeded as e:
+                    _report_budget(e, agent)
+                    return
+                yield CrewEvent(agent, output, time.perf_counter() - start)
+                continue
+
+            # The agent runs in a worker thread that pushes its token deltas to a queue,
+            # so they can be yielded while the agent is still running
+            events: queue.Queue = queue.Queue()
+            result: dict = {}
+
+            def target(agent=agent):
+                try:
+                    result["output"] = _run_agent(
+                        agent,
+                        budget,
+                        on_token=lambda delta: events.put(TokenEvent(agent, delta)),
+                    )
+                except BaseException as e:
+                    result["error"] = e
+                finally:
+                    events.put(_DONE)
+
+            # The worker runs in a copy of the current context, so it sees the active profiler
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(target,), daemon=True).start()
+
+            while (event := events.get()) is not _DONE:
+                yield event
+
+            if isinstance(result.get("error"), BudgetExceeded):
+                _report_budget(result["error"], agent)
+                return
+            if "error" in result:
+                raise result["error"]
+            yield CrewEvent(agent, result["output"], time.perf_counter() - start)
+
+    async def astream(
+        self, tokens: bool = False, budget: Budget | None = None
+    ) -> AsyncIterator[CrewEvent | TokenEvent]:
+        """
+        Asynchronous version of `stream`. The agents run in the default executor, so the event
+        loop stays free while they wait for the LLM.
+
+        Args:
+            tokens (bool, optional): If True, a TokenEvent is also yielded for every token delta
+                of the agents' LLM calls. Defaults to False.
+            budget (Budget | None, optional): The deadline and token / cost budget shared by all the
+                agents. When it runs out, the stream stops after the agents that already finished.
+
+        Yields:
+            CrewEvent | TokenEvent: The events, in the order they happen.
+        """
+        loop = asyncio.get_running_loop()
+
+        for agent in self.topological_sort():
+            start = time.perf_counter()
+
+            if not tokens:
+                context = contextvars.copy_context()
+                try:
+                    output = await loop.run_in_executor(
+                        None, context.run, _run_agent, agent, budget
+                    )
+                except BudgetExceeded as e:
+                    _report_budget(e, agent)
+                    return
+                yield CrewEvent(agent, output, time.perf_counter() - start)
+                continue
+
+            events: asyncio.Queue = asyncio.Queue()
+
+            def on_token(delta, agent=agent):
+                loop.call_soon_threadsafe(events.put_nowait, TokenEvent(agent, delta))
+
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(
+                None,
+                lambda: context.run(_run_agent, agent, budget, on_token=on_token),
+            )
+            future.add_done_callback(lambda _: events.put_nowait(_DONE))
+
+            while (event := await events.get()) is not _DONE:
+                yield event
+
+            try:
+                output = await future
+            except BudgetExceeded as e:
+                _report_budget(e, agent)
+                return
+            yield CrewEvent(agent, output, time.perf_counter() - start)
+
+    def run(self, budget: Budget | None = None) -> dict:
         """
         Runs all agents in the crew in topologically sorted order.
 
         This method executes each agent's run method and prints the results.
+
+        Args:
+            budget (Budget | None, optional): The deadline and token / cost budget shared by all the
+                agents. When it runs out, the outputs of the agents that finished are returned.
+
+        Returns:
+            dict: A dictionary mapping agent names to their outputs.
         """
-        sorted_agents = self.topological_sort()
-        for agent in sorted_agents:
-            fancy_print(f"RUNNING AGENT: {agent}")
-            print(Fore.RED + f"{agent.run()}")
+        outputs = {}
+        for agent, output, _ in self.stream(budget=budget):
+            fancy_print(f"AGENT FINISHED: {agent}")
+            print(Fore.RED + f"{output}")
+            outputs[agent.name] = output
+        return outputs
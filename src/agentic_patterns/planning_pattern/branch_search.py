@@ -0,0 +1,173 @@
+import json
+from typing import Callable
+
+
+class Branch:
+    """
+    A node of the ReAct search tree: one Thought -> Action -> Observation step on top of its parent.
+
+    A branch only stores the messages of its own step and points to its parent, so all the branches
+    of the tree share the history prefix they have in common instead of copying it.
+
+    Attributes:
+        parent (Branch | None): The previous step. None for the root, which holds the system prompt
+            and the question.
+        messages (list): The messages added by this step: the assistant message, then the
+            observations once the branch is expanded.
+        content (str): The text of the completion.
+        thought (str | None): The `<thought>` of the completion, if any.
+        tool_calls (list[dict]): The valid tool calls of the step.
+        repairs (dict): The repair messages of the tool calls that couldn't be run.
+        response (str | None): The final answer, if the step produced one.
+        observations (dict): The tool results and repair messages, by tool call ID. Empty until
+            the branch is expanded.
+        depth (int): The number of steps from the root.
+        score (float): The cumulative score of the steps of the branch.
+    """
+
+    def __init__(
+        self,
+        parent: "Branch | None" = None,
+        messages: list | None = None,
+        content: str = "",
+        thought: str | None = None,
+        tool_calls: list[dict] | None = None,
+        repairs: dict | None = None,
+        response: str | None = None,
+    ):
+        self.parent = parent
+        self.messages = messages or []
+        self.content = content
+        self.thought = thought
+        self.tool_calls = tool_calls or []
+        self.repairs = repairs or {}
+        self.response = response
+        self.observations: dict = {}
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.score = parent.score if parent is not None else 0.0
+
+    @property
+    def actions(self) -> frozenset:
+        """
+        The tool calls of the step, as hashable (name, arguments) pairs that ignore the call IDs.
+        """
+        return frozenset(
+            (
+                tool_call["name"],
+                json.dumps(tool_call["arguments"], sort_keys=True, default=str),
+            )
+            for tool_call in self.tool_calls
+        )
+
+    def path(self) -> list["Branch"]:
+        """
+        Returns the branches from the root to this one.
+        """
+        branches = []
+        branch = self
+        while branch is not None:
+            branches.append(branch)
+            branch = branch.parent
+        return branches[::-1]
+
+    def history(self) -> list:
+        """
+        Returns the full chat history of the branch, from the system prompt to its last message.
+        """
+        return [message for branch in self.path() for message in branch.messages]
+
+    def previous_actions(self) -> set:
+        """
+        Returns the actions already taken by the ancestors of the branch.
+        """
+        return {action for branch in self.path()[:-1] for action in branch.actions}
+
+
+def heuristic_score(branch: Branch) -> float:
+    """
+    Scores a candidate step without any LLM call. Steps that can't be run, repeat an action already
+    taken on the same branch (and whose result is already known) or don't do anything are penalized,
+    and steps that explain their reasoning get a small bonus.
+
+    Args:
+        branch (Branch): The candidate step, before its tool calls are run.
+
+    Returns:
+        float: The score of the step, higher is better.
+    """
+    score = 0.0
+    if branch.thought:
+        score += 0.5
+    if not branch.tool_calls:
+        score -= 1.0
+    score -= len(branch.repairs)
+    score -= len(branch.actions & branch.previous_actions())
+    return score
+
+
+class BranchSearch:
+    """
+    The settings of the tree search mode of the ReactAgent.
+
+    At each round, `n_samples` candidate next steps are sampled concurrently from every branch of
+    the frontier. The search stops as soon as one of them answers with a `<response>`. Otherwise
+    the candidates are scored with a cheap `scorer`, duplicates are dropped, and only the `width`
+    best ones get their tool calls run and become the next frontier.
+
+    Attributes:
+        n_samples (int): The number of candidate steps sampled from each branch at each round.
+        width (int): The number of branches kept at each round.
+        temperature (float): The sampling temperature of the candidate steps, so they differ.
+        scorer (Callable[[Branch], float]): Scores a candidate step (see `heuristic_score`). The
+            score of a branch is the sum of the scores of its steps.
+        max_workers (int | None): The number of concurrent LLM and tool calls. Defaults to
+            `n_samples * width`.
+    """
+
+    def __init__(
+        self,
+        n_samples: int = 3,
+        width: int = 2,
+        temperature: float = 0.8,
+        scorer: Callable[[Branch], float] = heuristic_score,
+        max_workers: int | None = None,
+    ):
+        if n_samples < 1 or width < 1:
+            raise ValueError("n_samples and width must be at least 1")
+
+        self.n_samples = n_samples
+        self.width = width
+        self.temperature = temperature
+        self.scorer = scorer
+        self.max_workers = max_workers or n_samples * width
+
+    def score(self, branch: Branch) -> Branch:
+        """
+        Adds the score of the last step to the score of the branch.
+
+        Args:
+            branch (Branch): The candidate step.
+
+        Returns:
+            Branch: The same branch.
+        """
+        branch.score += self.scorer(branch)
+        return branch
+
+    def select(self, candidates: list[Branch]) -> list[Branch]:
+        """
+        Prunes the candidates of a round, dropping the duplicate steps of the same branch and
+        keeping the `width` best ones. Ties keep the order of the candidates.
+
+        Args:
+            candidates (list[Branch]): The candidate steps, in the order they were sampled.
+
+        Returns:
+            list[Branch]: The branches to expand.
+        """
+        unique = {}
+        for branch in candidates:
+            key = (id(branch.parent), branch.actions or branch.content)
+            unique.setdefault(key, branch)
+        ranked = sorted(unique.values(), key=lambda branch: -branch.score)
+        return ranked[: self.width]
@@ -1,17 +1,37 @@
-import json
+import contextvars
 import re
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable
 
 from colorama import Fore
 from dotenv import load_dotenv
-from groq import Groq
 
+from agentic_patterns.planning_pattern.branch_search import Branch
+from agentic_patterns.planning_pattern.branch_search import BranchSearch
+from agentic_patterns.tool_pattern.tool import parse_tool_calls
 from agentic_patterns.tool_pattern.tool import Tool
-from agentic_patterns.tool_pattern.tool import validate_arguments
+from agentic_patterns.tool_pattern.tool_calling import get_tool_calling
+from agentic_patterns.tool_pattern.tool_calling import ToolCalling
+from agentic_patterns.tool_pattern.tool_calling import XML
+from agentic_patterns.tool_pattern.tool_index import ToolIndex
+from agentic_patterns.tool_pattern.tool_registry import resolve_tools
+from agentic_patterns.tool_pattern.tool_registry import ToolRegistry
+from agentic_patterns.utils.budget import Budget
+from agentic_patterns.utils.budget import BudgetExceeded
+from agentic_patterns.utils.cache import namespace_key
+from agentic_patterns.utils.cache import SemanticCache
 from agentic_patterns.utils.completions import build_prompt_structure
 from agentic_patterns.utils.completions import ChatHistory
-from agentic_patterns.utils.completions import completions_create
-from agentic_patterns.utils.completions import update_chat_history
 from agentic_patterns.utils.extraction import extract_tag_content
+from agentic_patterns.utils.providers import default_provider
+from agentic_patterns.utils.routing import as_router
+from agentic_patterns.utils.routing import FINAL_ANSWER
+from agentic_patterns.utils.routing import ModelRouter
+from agentic_patterns.utils.routing import routed_chat_completion
+from agentic_patterns.utils.routing import routed_completion
+from agentic_patterns.utils.routing import TOOL_SELECTION
 
 load_dotenv()
 
@@ -55,6 +75,16 @@ Additional constraints:
 - If the user asks you something unrelated to any of the tools above, answer freely enclosing your answer with <response></response> tags.
 """
 
+NATIVE_REACT_SYSTEM_PROMPT = """
+You operate by running a loop with the following steps: Thought, Action, Observation.
+You may call one or more of the provided functions to assist with the user query. Don't make assumptions about
+what values to plug into functions.
+
+At each step, explain your reasoning within <thought></thought> tags and call the functions you need.
+You will be called again with the results of the functions.
+When you have the final answer, output it enclosed in <response></response> tags.
+"""
+
 
 class ReactAgent:
     """
@@ -63,58 +93,194 @@ class ReactAgent:
     collect tool signatures, and process multiple tool calls in a given round of interaction.
 
     Attributes:
-        client (Groq): The Groq client used to handle model-based completions.
-        model (str): The name of the model used for generating responses. Default is "llama-3.1-70b-versatile".
-        tools (list[Tool]): A list of Tool instances available for execution.
+        client (Provider): The LLM provider (or any Groq-shaped client). Defaults to the process-wide
+            provider, configured with environment variables (see `default_provider`).
+        model (str): The name of the default model used for generating responses. Default is "llama-3.1-70b-versatile".
+        router (ModelRouter): The routing policy that picks a model for each ReAct round and the final answer.
+        tools (list[Tool]): A list of Tool instances available for execution. The agent also accepts
+            tool names (or 'module:attribute' paths), looked up in a `ToolRegistry`, whose modules are
+            only imported when the tools are first called.
         tools_dict (dict): A dictionary mapping tool names to their corresponding Tool instances.
+        tool_calling (ToolCalling): The strategy used to expose the tools to the model, either
+            pasting their signatures in the system prompt ('xml') or through the API `tools` parameter ('native').
+        top_k_tools (int | None): If set, only the `top_k_tools` tools most relevant to the current
+            query are shown to the model, instead of the whole tool list.
+        tool_index (ToolIndex | None): The BM25 index used to select the relevant tools.
+        cache (SemanticCache | None): A cache of final answers, looked up before running the ReAct loop.
+        cache_namespace (str): The cache namespace of this agent. By default it's derived from the
+            system prompt and the tool names, so differently configured agents don't share answers.
+        max_repairs (int): The number of rounds per run in which none of the tool calls could be
+            run (e.g. malformed JSON or unknown tools) that don't count towards `max_rounds`. In those
+            rounds the model only receives the repair messages and fixes its tool calls.
+        last_run (dict): The number of rounds, LLM calls and branches expanded and pruned by the
+            last run in tree search mode started from the current thread or task.
     """
 
     def __init__(
         self,
-        tools: Tool | list[Tool],
-        model: str = "llama-3.1-70b-versatile",
+        tools: Tool | str | list[Tool | str],
+        model: str | ModelRouter = "llama-3.1-70b-versatile",
         system_prompt: str = BASE_SYSTEM_PROMPT,
+        tool_calling: str | ToolCalling = XML,
+        top_k_tools: int | None = None,
+        cache: SemanticCache | None = None,
+        cache_namespace: str | None = None,
+        max_repairs: int = 2,
+        registry: ToolRegistry | None = None,
+        client=None,
     ) -> None:
-        self.client = Groq()
-        self.model = model
+        self.client = client or default_provider()
+        self.router = as_router(model)
+        self.model = self.router.default
         self.system_prompt = system_prompt
-        self.tools = tools if isinstance(tools, list) else [tools]
+        self.tools = resolve_tools(tools, registry)
         self.tools_dict = {tool.name: tool for tool in self.tools}
+        self.top_k_tools = top_k_tools
+        self.tool_index = ToolIndex(self.tools) if top_k_tools else None
+        self.cache = cache
+        self.cache_namespace = cache_namespace or namespace_key(
+            "react", system_prompt, *self.tools_dict
+        )
+        self.tool_calling = get_tool_calling(tool_calling)
+        self.max_repairs = max_repairs
+        # Kept per context, so concurrent runs of the same agent don't overwrite each other's
+        self._last_run: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+            "react_last_run", default=None
+        )
+
+    @property
+    def last_run(self) -> dict:
+        """
+        The statistics of the last tree search run started from the current thread or task.
+        """
+        return self._last_run.get() or {}
+
+    def select_tools(self, query: str) -> list[Tool]:
+        """
+        Selects the tools to show to the model for the given query. All the tools are
+        selected unless `top_k_tools` is set.
+
+        Args:
+            query (str): The text used to rank the tools (e.g. the user message).
+
+        Returns:
+            list[Tool]: The selected tools.
+        """
+        if self.tool_index is None or len(self.tool_index) <= self.top_k_tools:
+            return self.tools
+        return self.tool_index.search(query, self.top_k_tools)
 
-    def add_tool_signatures(self) -> str:
+    def add_tool_signatures(self, tools: list[Tool] | None = None) -> str:
         """
-        Collects the function signatures of all available tools.
+        Collects the function signatures of the given tools.
+
+        Args:
+            tools (list[Tool] | None, optional): The tools to include. Defaults to all available tools.
 
         Returns:
             str: A concatenated string of all tool function signatures in JSON format.
         """
-        return "".join([tool.fn_signature for tool in self.tools])
+        tools = self.tools if tools is None else tools
+        return "".join([tool.fn_signature for tool in tools])
+
+    def build_system_prompt(self, tools: list[Tool]) -> str:
+        """
+        Builds the system prompt, adding the ReAct instructions (and, in XML mode, the
+        signatures of the given tools) to the agent's own system prompt.
 
-    def process_tool_calls(self, tool_calls_content: list) -> dict:
+        Args:
+            tools (list[Tool]): The tools shown to the model.
+
+        Returns:
+            str: The system prompt.
+        """
+        if not self.tools:
+            return self.system_prompt
+        if self.tool_calling.native:
+            return self.system_prompt + "\n" + NATIVE_REACT_SYSTEM_PROMPT
+        return (
+            self.system_prompt
+            + "\n"
+            + REACT_SYSTEM_PROMPT % self.add_tool_signatures(tools)
+        )
+
+    def is_valid_step(self, message) -> bool:
+        """
+        Checks that a ReAct step either answers with a `<response>` or contains only well formed
+        tool calls targeting known tools. Used by the router to decide whether to escalate to a
+        bigger model.
+
+        Args:
+            message: The message object returned by the model.
+
+        Returns:
+            bool: True if the step can be processed, False otherwise.
+        """
+        content = str(message.content or "")
+        if extract_tag_content(content, "response").found:
+            return True
+
+        if self.tool_calling.native:
+            # A plain answer without tool calls is the final answer in native mode
+            has_action = bool(message.tool_calls or content)
+        else:
+            has_action = extract_tag_content(content, "tool_call").found
+
+        return has_action and self.tool_calling.is_valid(message, self.tools_dict)
+
+    def process_tool_calls(
+        self, tool_calls_content: list, budget: Budget | None = None
+    ) -> dict:
         """
         Processes each tool call, validates arguments, executes the tools, and collects results.
 
+        Tool calls that can't be parsed (even leniently), target an unknown tool or have invalid
+        arguments are not run. Their result is a repair message telling the model what to fix.
+
         Args:
-            tool_calls_content (list): List of strings, each representing a tool call in JSON format.
+            tool_calls_content (list): List of tool calls, either as strings in JSON format or as
+                already parsed dicts.
+            budget (Budget | None, optional): The run budget. Tools are given the time left before its deadline.
 
         Returns:
             dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
         """
-        observations = {}
-        for tool_call_str in tool_calls_content:
-            tool_call = json.loads(tool_call_str)
-            tool_name = tool_call["name"]
-            tool = self.tools_dict[tool_name]
+        # Validate the tool calls
+        validated_tool_calls, observations = parse_tool_calls(
+            tool_calls_content, self.tools_dict
+        )
+        if observations:
+            print(Fore.YELLOW + f"\nInvalid tool calls: \n{observations}")
 
-            print(Fore.GREEN + f"\nUsing Tool: {tool_name}")
+        observations.update(self.run_tool_calls(validated_tool_calls, budget))
+        return observations
 
-            # Validate and execute the tool call
-            validated_tool_call = validate_arguments(
-                tool_call, json.loads(tool.fn_signature)
-            )
+    def run_tool_calls(
+        self, validated_tool_calls: list[dict], budget: Budget | None = None
+    ) -> dict:
+        """
+        Executes tool calls already validated by `parse_tool_calls` and collects their results.
+
+        Args:
+            validated_tool_calls (list[dict]): The valid tool calls, with their arguments converted.
+            budget (Budget | None, optional): The run budget. Tools are given the time left before its deadline.
+
+        Returns:
+            dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
+        """
+        observations = {}
+        for validated_tool_call in validated_tool_calls:
+            tool = self.tools_dict[validated_tool_call["name"]]
+
+            print(Fore.GREEN + f"\nUsing Tool: {tool.name}")
             print(Fore.GREEN + f"\nTool call dict: \n{validated_tool_call}")
 
-            result = tool.run(**validated_tool_call["arguments"])
+            # Execute the tool call
+            arguments = validated_tool_call["arguments"]
+            if budget is None:
+                result = tool.run(**arguments)
+            else:
+                result = budget.call(tool.run, **arguments)
             print(Fore.GREEN + f"\nTool result: \n{result}")
 
             # Store the result using the tool call ID
@@ -126,57 +292,321 @@ class ReactAgent:
         self,
         user_msg: str,
         max_rounds: int = 10,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
+        search: BranchSearch | None = None,
     ) -> str:
         """
         Executes a user interaction session, where the agent processes user input, generates responses,
         handles tool calls, and updates chat history until a final response is ready or the maximum
         number of rounds is reached.
 
+        With `search`, the agent explores several Thought -> Action -> Observation chains at once
+        instead of one: at each round it samples candidate next steps from the most promising
+        branches concurrently, keeps the best ones according to a cheap scorer, and returns the
+        first `<response>` produced by any branch (see `BranchSearch`). A wrong early tool choice
+        then costs parallel width instead of serial recovery rounds.
+
         Args:
             user_msg (str): The user's input message to start the interaction.
             max_rounds (int, optional): Maximum number of interaction rounds the agent should perform. Default is 10.
+            on_token (Callable[[str], None] | None, optional): If given, every completion is streamed and
+                its token deltas are passed to this callback as they arrive.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run. When it
+                runs out, the last thought is returned instead of the final answer.
+            search (BranchSearch | None, optional): If given, the run explores several branches
+                at once. Only the final answer is streamed to `on_token`. Defaults to None.
 
         Returns:
             str: The final response generated by the agent after processing user input and any tool calls.
+
+        Raises:
+            BudgetExceeded: If the budget runs out before the agent produces anything.
         """
+        run = self._run
+        if search is not None and self.tools:
+            run = partial(self._search, search=search)
+
+        if self.cache is None:
+            return run(user_msg, max_rounds, on_token, budget)
+
+        # Near-duplicate queries are answered from the cache, without any LLM call
+        cached_response = self.cache.get(user_msg, self.cache_namespace)
+        if cached_response is not None:
+            print(Fore.YELLOW + "\nCache hit. Returning the stored response")
+            return cached_response
+
+        response = run(user_msg, max_rounds, on_token, budget)
+        # Partial answers of runs that went over budget are not cached
+        if budget is None or budget.exceeded is None:
+            self.cache.put(user_msg, response, self.cache_namespace)
+        return response
+
+    def _run(
+        self,
+        user_msg: str,
+        max_rounds: int,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
+    ) -> str:
         user_prompt = build_prompt_structure(
             prompt=user_msg, role="user", tag="question"
         )
-        if self.tools:
-            self.system_prompt += (
-                "\n" + REACT_SYSTEM_PROMPT % self.add_tool_signatures()
-            )
+        tools = self.select_tools(user_msg)
 
         chat_history = ChatHistory(
             [
                 build_prompt_structure(
-                    prompt=self.system_prompt,
+                    prompt=self.build_system_prompt(tools),
                     role="system",
                 ),
                 user_prompt,
             ]
         )
 
-        if self.tools:
-            # Run the ReAct loop for max_rounds
-            for _ in range(max_rounds):
-
-                completion = completions_create(self.client, chat_history, self.model)
-
-                response = extract_tag_content(str(completion), "response")
-                if response.found:
-                    return response.content[0]
-
-                thought = extract_tag_content(str(completion), "thought")
-                tool_calls = extract_tag_content(str(completion), "tool_call")
-
-                update_chat_history(chat_history, completion, "assistant")
-
-                print(Fore.MAGENTA + f"\nThought: {thought.content[0]}")
+        # The last thought is returned if the budget runs out before the final answer
+        last_thought = ""
+        try:
+            if self.tools:
+                query = user_msg
+                repairs_left = self.max_repairs
+
+                # Run the ReAct loop for max_rounds
+                round_idx = 0
+                while round_idx < max_rounds:
+
+                    if self.tool_index is not None and round_idx > 0:
+                        # Refresh the tool subset with what the agent is currently doing
+                        tools = self.select_tools(query)
+                        chat_history[0] = build_prompt_structure(
+                            prompt=self.build_system_prompt(tools), role="system"
+                        )
+
+                    message = routed_chat_completion(
+                        self.client,
+                        chat_history,
+                        self.router,
+                        TOOL_SELECTION,
+                        is_valid=self.is_valid_step,
+                        on_token=on_token,
+                        budget=budget,
+                        **self.tool_calling.request_kwargs(tools),
+                    )
+                    completion = self.tool_calling.parse(message)
+
+                    response = extract_tag_content(completion.content, "response")
+                    if response.found:
+                        return response.content[0]
+
+                    if self.tool_calling.native and not completion.tool_calls:
+                        return completion.content
+
+                    thought = extract_tag_content(completion.content, "thought")
+
+                    chat_history.append(self.tool_calling.assistant_message(message))
+
+                    if thought.found:
+                        print(Fore.MAGENTA + f"\nThought: {thought.content[0]}")
+                    last_thought = (
+                        thought.content[0] if thought.found else completion.content
+                    ) or last_thought
+
+                    if completion.tool_calls:
+                        tool_calls, repairs = parse_tool_calls(
+                            completion.tool_calls, self.tools_dict
+                        )
+                        if repairs:
+                            print(Fore.YELLOW + f"\nInvalid tool calls: \n{repairs}")
+                        observations = {
+                            **repairs,
+                            **self.run_tool_calls(tool_calls, budget),
+                        }
+                        print(Fore.BLUE + f"\nObservations: {observations}")
+                        chat_history.extend(
+                            self.tool_calling.observation_messages(observations)
+                        )
+                        query = f"{user_msg}\n{completion.content}\n{observations}"
+
+                        if repairs and not tool_calls and repairs_left > 0:
+                            # Nothing could be run, the model fixes its tool calls within the same round
+                            repairs_left -= 1
+                            continue
+
+                    round_idx += 1
+
+            return routed_completion(
+                self.client,
+                chat_history,
+                self.router,
+                FINAL_ANSWER,
+                on_token=on_token,
+                budget=budget,
+            )
+        except BudgetExceeded as e:
+            if not last_thought:
+                raise
+            print(Fore.YELLOW + f"\n{e}. Returning the last thought")
+            return last_thought
 
-                if tool_calls.found:
-                    observations = self.process_tool_calls(tool_calls.content)
-                    print(Fore.BLUE + f"\nObservations: {observations}")
-                    update_chat_history(chat_history, f"{observations}", "user")
+    def _search(
+        self,
+        user_msg: str,
+        max_rounds: int,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
+        *,
+        search: BranchSearch,
+    ) -> str:
+        tools = self.select_tools(user_msg)
+        root = Branch(
+            messages=[
+                build_prompt_structure(
+                    prompt=self.build_system_prompt(tools), role="system"
+                ),
+                build_prompt_structure(prompt=user_msg, role="user", tag="question"),
+            ]
+        )
+        stats = {"rounds": 0, "llm_calls": 0, "expanded": 0, "pruned": 0}
+        self._last_run.set(stats)
 
-        return completions_create(self.client, chat_history, self.model)
+        frontier = [root]
+        best = root
+        executor = ThreadPoolExecutor(
+            max_workers=search.max_workers, thread_name_prefix="react-search"
+        )
+        try:
+            for _ in range(max_rounds):
+                stats["rounds"] += 1
+                # Every task runs in its own copy of the current context, so the calls of the
+                # branches are recorded by the active profiler and see the current crew
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._sample_step,
+                        branch,
+                        user_msg,
+                        search,
+                        budget,
+                    )
+                    for branch in frontier
+                    for _ in range(search.n_samples)
+                ]
+                stats["llm_calls"] += len(futures)
+
+                candidates = []
+                for future in as_completed(futures):
+                    candidate = future.result()
+                    if candidate.response is not None:
+                        # The first branch to answer wins, the other requests are abandoned
+                        print(
+                            Fore.YELLOW
+                            + f"\nBranch answered at depth {candidate.depth}"
+                        )
+                        if on_token is not None:
+                            on_token(candidate.response)
+                        return candidate.response
+                    candidates.append(candidate)
+
+                frontier = search.select(candidates)
+                stats["pruned"] += len(candidates) - len(frontier)
+                stats["expanded"] += len(frontier)
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._expand_branch,
+                        branch,
+                        budget,
+                    )
+                    for branch in frontier
+                ]
+                for future in futures:
+                    future.result()
+                best = frontier[0]
+                if best.thought:
+                    print(Fore.MAGENTA + f"\nBest thought: {best.thought}")
+
+            stats["llm_calls"] += 1
+            return routed_completion(
+                self.client,
+                best.history(),
+                self.router,
+                FINAL_ANSWER,
+                on_token=on_token,
+                budget=budget,
+            )
+        except BudgetExceeded as e:
+            best_thought = next(
+                (branch.thought for branch in best.path()[::-1] if branch.thought),
+                best.content,
+            )
+            if not best_thought:
+                raise
+            print(Fore.YELLOW + f"\n{e}. Returning the best thought")
+            return best_thought
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _sample_step(
+        self,
+        parent: Branch,
+        user_msg: str,
+        search: BranchSearch,
+        budget: Budget | None = None,
+    ) -> Branch:
+        history = parent.history()
+        if self.tool_index is not None and parent.parent is not None:
+            # Refresh the tool subset with what this branch is currently doing
+            tools = self.select_tools(
+                f"{user_msg}\n{parent.content}\n{parent.observations}"
+            )
+            history[0] = build_prompt_structure(
+                prompt=self.build_system_prompt(tools), role="system"
+            )
+        else:
+            tools = self.select_tools(user_msg)
+
+        # The candidates are scored instead of escalated to bigger models
+        message = routed_chat_completion(
+            self.client,
+            history,
+            self.router,
+            TOOL_SELECTION,
+            budget=budget,
+            temperature=search.temperature,
+            **self.tool_calling.request_kwargs(tools),
+        )
+        completion = self.tool_calling.parse(message)
+
+        response = extract_tag_content(completion.content, "response")
+        if response.found:
+            return Branch(parent, response=response.content[0])
+        if self.tool_calling.native and not completion.tool_calls:
+            return Branch(parent, response=completion.content)
+
+        thought = extract_tag_content(completion.content, "thought")
+        tool_calls, repairs = parse_tool_calls(completion.tool_calls, self.tools_dict)
+        branch = Branch(
+            parent,
+            messages=[self.tool_calling.assistant_message(message)],
+            content=completion.content,
+            thought=thought.content[0] if thought.found else None,
+            tool_calls=tool_calls,
+            repairs=repairs,
+        )
+        return search.score(branch)
+
+    def _expand_branch(self, branch: Branch, budget: Budget | None = None) -> None:
+        try:
+            observations = self.run_tool_calls(branch.tool_calls, budget)
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            # A failing tool only ends up in the observations of its own branch
+            observations = {
+                tool_call["id"]: f"Error: {e}" for tool_call in branch.tool_calls
+            }
+        branch.observations = {**branch.repairs, **observations}
+        print(Fore.BLUE + f"\nObservations: {branch.observations}")
+        branch.messages.extend(
+            self.tool_calling.observation_messages(branch.observations)
+        )
@@ -1,12 +1,25 @@
+import contextvars
+import copy
+from typing import Callable
+
 from colorama import Fore
 from dotenv import load_dotenv
-from groq import Groq
 
+from agentic_patterns.utils.budget import Budget
+from agentic_patterns.utils.budget import BudgetExceeded
+from agentic_patterns.utils.cache import namespace_key
+from agentic_patterns.utils.cache import SemanticCache
 from agentic_patterns.utils.completions import build_prompt_structure
-from agentic_patterns.utils.completions import completions_create
 from agentic_patterns.utils.completions import FixedFirstChatHistory
 from agentic_patterns.utils.completions import update_chat_history
+from agentic_patterns.utils.convergence import ConvergenceMonitor
 from agentic_patterns.utils.logging import fancy_step_tracker
+from agentic_patterns.utils.providers import default_provider
+from agentic_patterns.utils.routing import as_router
+from agentic_patterns.utils.routing import GENERATION
+from agentic_patterns.utils.routing import ModelRouter
+from agentic_patterns.utils.routing import REFLECTION
+from agentic_patterns.utils.routing import routed_completion
 
 load_dotenv()
 
@@ -23,6 +36,12 @@ If the user content has something wrong or something to be improved, output a li
 and critiques. If the user content is ok and there's nothing to change, output this: <OK>
 """
 
+# Added to the reflection prompt when early stopping is on, for the convergence check
+SEVERITY_SYSTEM_PROMPT = """
+Always end your answer with the severity of your critique, from 0 (nothing to change) to 10
+(the content is completely wrong), enclosed in <severity></severity> tags.
+"""
+
 
 class ReflectionAgent:
     """
@@ -31,13 +50,40 @@ class ReflectionAgent:
     responses based on provided prompts and then critiques them in a reflection step.
 
     Attributes:
-        model (str): The model name used for generating and reflecting on responses.
-        client (Groq): An instance of the Groq client to interact with the language model.
+        model (str): The default model name used for generating and reflecting on responses.
+        router (ModelRouter): The routing policy that picks a model for generation and reflection calls.
+        client (Provider): The LLM provider (or any Groq-shaped client). Defaults to the process-wide
+            provider, configured with environment variables (see `default_provider`).
+        cache (SemanticCache | None): A cache of final answers, looked up before running the loop.
+        cache_namespace (str): The cache namespace of this agent. It's combined with the system
+            prompts of each run, so runs with different prompts don't share answers.
+        last_run (dict): The number of steps run and rounds saved by the last run started from the
+            current thread or task, with the draft similarities and critique severities it observed.
     """
 
-    def __init__(self, model: str = "llama-3.1-70b-versatile"):
-        self.client = Groq()
-        self.model = model
+    def __init__(
+        self,
+        model: str | ModelRouter = "llama-3.1-70b-versatile",
+        cache: SemanticCache | None = None,
+        cache_namespace: str = "reflection",
+        client=None,
+    ):
+        self.client = client or default_provider()
+        self.router = as_router(model)
+        self.model = self.router.default
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+        # Kept per context, so concurrent runs of the same agent don't overwrite each other's
+        self._last_run: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+            "reflection_last_run", default=None
+        )
+
+    @property
+    def last_run(self) -> dict:
+        """
+        The statistics of the last run started from the current thread or task.
+        """
+        return self._last_run.get() or {}
 
     def _request_completion(
         self,
@@ -45,40 +91,73 @@ class ReflectionAgent:
         verbose: int = 0,
         log_title: str = "COMPLETION",
         log_color: str = "",
+        call_type: str = GENERATION,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
     ):
         """
-        A private method to request a completion from the Groq model.
+        A private method to request a completion from the model.
 
         Args:
             history (list): A list of messages forming the conversation or reflection history.
             verbose (int, optional): The verbosity level. Defaults to 0 (no output).
+            call_type (str, optional): The call type used to route the request. Defaults to 'generation'.
+            on_token (Callable[[str], None] | None, optional): If given, the completion is streamed and
+                its token deltas are passed to this callback.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run.
 
         Returns:
             str: The model-generated response.
         """
-        output = completions_create(self.client, history, self.model)
+        output = routed_completion(
+            self.client,
+            history,
+            self.router,
+            call_type,
+            on_token=on_token,
+            budget=budget,
+        )
 
         if verbose > 0:
             print(log_color, f"\n\n{log_title}\n\n", output)
 
         return output
 
-    def generate(self, generation_history: list, verbose: int = 0) -> str:
+    def generate(
+        self,
+        generation_history: list,
+        verbose: int = 0,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
+    ) -> str:
         """
         Generates a response based on the provided generation history using the model.
 
         Args:
             generation_history (list): A list of messages forming the conversation or generation history.
             verbose (int, optional): The verbosity level, controlling printed output. Defaults to 0.
+            on_token (Callable[[str], None] | None, optional): If given, the generation is streamed and
+                its token deltas are passed to this callback.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run.
 
         Returns:
             str: The generated response.
         """
         return self._request_completion(
-            generation_history, verbose, log_title="GENERATION", log_color=Fore.BLUE
+            generation_history,
+            verbose,
+            log_title="GENERATION",
+            log_color=Fore.BLUE,
+            on_token=on_token,
+            budget=budget,
         )
 
-    def reflect(self, reflection_history: list, verbose: int = 0) -> str:
+    def reflect(
+        self,
+        reflection_history: list,
+        verbose: int = 0,
+        budget: Budget | None = None,
+    ) -> str:
         """
         Reflects on the generation history by generating a critique or feedback.
 
@@ -86,12 +165,18 @@ class ReflectionAgent:
             reflection_history (list): A list of messages forming the reflection history, typically based on
                                        the previous generation or interaction.
             verbose (int, optional): The verbosity level, controlling printed output. Defaults to 0.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run.
 
         Returns:
             str: The critique or reflection response from the model.
         """
         return self._request_completion(
-            reflection_history, verbose, log_title="REFLECTION", log_color=Fore.GREEN
+            reflection_history,
+            verbose,
+            log_title="REFLECTION",
+            log_color=Fore.GREEN,
+            call_type=REFLECTION,
+            budget=budget,
         )
 
     def run(
@@ -101,23 +186,55 @@ class ReflectionAgent:
         reflection_system_prompt: str = "",
         n_steps: int = 10,
         verbose: int = 0,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
+        early_stopping: bool = False,
+        convergence: ConvergenceMonitor | None = None,
     ) -> str:
         """
         Runs the ReflectionAgent over multiple steps, alternating between generating a response
         and reflecting on it for the specified number of steps.
 
+        Besides the `<OK>` stop sequence, with `early_stopping` the loop also stops when it
+        converges: when two consecutive drafts are nearly identical, or when the critique severity
+        (which the reflector is then asked for) is low or has stopped decreasing (see
+        `ConvergenceMonitor`). The number of steps run and rounds saved is stored in `last_run`.
+
         Args:
             user_msg (str): The user message or query that initiates the interaction.
             generation_system_prompt (str, optional): The system prompt for guiding the generation process.
             reflection_system_prompt (str, optional): The system prompt for guiding the reflection process.
             n_steps (int, optional): The number of generate-reflect cycles to perform. Defaults to 3.
             verbose (int, optional): The verbosity level controlling printed output. Defaults to 0.
+            on_token (Callable[[str], None] | None, optional): If given, every generation is streamed and
+                its token deltas are passed to this callback as they arrive.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run. When it
+                runs out, the loop stops and the latest draft is returned.
+            early_stopping (bool, optional): Whether to stop once the drafts converge. Defaults to False.
+            convergence (ConvergenceMonitor | None, optional): The convergence criteria. Defaults to
+                a ConvergenceMonitor with its default thresholds. The run works on a fresh copy of
+                it, so the same monitor can be shared by several runs, even concurrent ones.
 
         Returns:
             str: The final generated response after all cycles are completed.
+
+        Raises:
+            BudgetExceeded: If the budget runs out before the first draft is generated.
         """
         generation_system_prompt += BASE_GENERATION_SYSTEM_PROMPT
         reflection_system_prompt += BASE_REFLECTION_SYSTEM_PROMPT
+        if early_stopping:
+            reflection_system_prompt += SEVERITY_SYSTEM_PROMPT
+
+        cache_namespace = namespace_key(
+            self.cache_namespace, generation_system_prompt, reflection_system_prompt
+        )
+        if self.cache is not None:
+            # Near-duplicate requests are answered from the cache, without any LLM call
+            cached_generation = self.cache.get(user_msg, cache_namespace)
+            if cached_generation is not None:
+                print(Fore.YELLOW + "\nCache hit. Returning the stored response")
+                return cached_generation
 
         # Given the iterative nature of the Reflection Pattern, we might exhaust the LLM context (or
         # make it really slow). That's the reason I'm limitting the chat history to three messages.
@@ -137,19 +254,48 @@ class ReflectionAgent:
             total_length=3,
         )
 
+        monitor = None
+        if early_stopping:
+            monitor = (
+                copy.copy(convergence)
+                if convergence is not None
+                else ConvergenceMonitor()
+            )
+            monitor.reset()
+        generation = None
+        steps = 0
         for step in range(n_steps):
             if verbose > 0:
                 fancy_step_tracker(step, n_steps)
 
-            # Generate the response
-            generation = self.generate(generation_history, verbose=verbose)
-            update_chat_history(generation_history, generation, "assistant")
-            update_chat_history(reflection_history, generation, "user")
+            stop_reason = None
+            steps = step + 1
+            try:
+                # Generate the response
+                generation = self.generate(
+                    generation_history,
+                    verbose=verbose,
+                    on_token=on_token,
+                    budget=budget,
+                )
+                update_chat_history(generation_history, generation, "assistant")
+                update_chat_history(reflection_history, generation, "user")
 
-            # Reflect and critique the generation
-            critique = self.reflect(reflection_history, verbose=verbose)
+                # A draft that barely changed doesn't need another critique
+                if monitor is not None:
+                    stop_reason = monitor.add_draft(generation)
+                if stop_reason is None:
+                    # Reflect and critique the generation
+                    critique = self.reflect(
+                        reflection_history, verbose=verbose, budget=budget
+                    )
+            except BudgetExceeded as e:
+                if generation is None:
+                    raise
+                print(Fore.YELLOW + f"\n{e}. Returning the latest draft")
+                break
 
-            if "<OK>" in critique:
+            if stop_reason is None and "<OK>" in critique:
                 # If no additional suggestions are made, stop the loop
                 print(
                     Fore.RED,
@@ -157,7 +303,30 @@ class ReflectionAgent:
                 )
                 break
 
+            if stop_reason is None and monitor is not None:
+                stop_reason = monitor.add_critique(critique)
+            if stop_reason is not None:
+                print(
+                    Fore.RED,
+                    f"\n\nConverged: {stop_reason}. Stopping after {steps}/{n_steps} steps "
+                    f"({n_steps - steps} rounds saved) ... \n\n",
+                )
+                break
+
             update_chat_history(generation_history, critique, "user")
             update_chat_history(reflection_history, critique, "assistant")
 
+        self._last_run.set(
+            {
+                "steps": steps,
+                "rounds_saved": n_steps - steps,
+                "similarities": monitor.similarities if monitor is not None else [],
+                "severities": monitor.severities if monitor is not None else [],
+            }
+        )
+
+        # Drafts of runs that went over budget are not cached
+        if self.cache is not None and (budget is None or budget.exceeded is None):
+            self.cache.put(user_msg, generation, cache_namespace)
+
         return generation
@@ -0,0 +1,347 @@
+import asyncio
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from agentic_patterns.jobs import PATTERNS
+from agentic_patterns.jobs import run_job
+
+
+MAX_BODY_SIZE = 1 << 20
+
+# Events sent to the streaming clients. A run always ends with a `result` or an `error` event
+TOKEN = "token"
+RESULT = "result"
+ERROR = "error"
+
+
+class _Flight:
+    """
+    A single agent run shared by every identical request that arrives while it is in flight.
+
+    The events are buffered, so clients joining late still receive the whole stream.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.events: list[tuple[str, dict]] = []
+        self.listeners: list[asyncio.Queue] = []
+        self.result: asyncio.Future = loop.create_future()
+
+    def publish(self, name: str, data: dict) -> None:
+        self.events.append((name, data))
+        for listener in self.listeners:
+            listener.put_nowait((name, data))
+
+    async def subscribe(self):
+        listener: asyncio.Queue = asyncio.Queue()
+        for event in self.events:
+            listener.put_nowait(event)
+        self.listeners.append(listener)
+        try:
+            while True:
+                name, data = await listener.get()
+                yield name, data
+                if name in (RESULT, ERROR):
+                    return
+        finally:
+            self.listeners.remove(listener)
+
+
+def job_key(job: dict) -> str:
+    """
+    Builds the key used to coalesce identical requests.
+
+    Args:
+        job (dict): The job description.
+
+    Returns:
+        str: A canonical JSON representation of the job.
+    """
+    return json.dumps(job, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class AgentServer:
+    """
+    A dependency-free ASGI application that serves the agentic patterns over HTTP.
+
+    Endpoints:
+        - `POST /run`: runs a job (the same JSON objects accepted by the `agentic-patterns run`
+          command) and answers with `{"output": ...}`. The pattern can also be given in the path,
+          e.g. `POST /run/react`.
+        - `POST /stream`: same as `/run`, but the answer is a Server-Sent Events stream of
+          `token` events followed by a final `result` (or `error`) event.
+        - `GET /health`: the server counters.
+
+    Requests are untrusted jobs (see `run_job`): their tools must be registered in the tool
+    registry (e.g. through entry points or `AGENTIC_PATTERNS_TOOLS_MANIFEST`) and are referenced
+    by name, and they can only set the agent and run arguments listed in `UNTRUSTED_AGENT_KWARGS`
+    and `UNTRUSTED_RUN_KWARGS`, with a bounded number of rounds. Every run has a deadline of
+    `timeout` seconds, which the budget of a request can only shorten.
+
+    Identical requests arriving while a run is in flight are coalesced (singleflight): they
+    share the same run and its streamed events instead of triggering a new one. Admission is
+    bounded: at most `max_concurrency` runs execute at once, at most `max_queue` more wait for a
+    worker, and further requests are rejected right away with a 503 so the server never builds
+    an unbounded backlog.
+
+    Attributes:
+        client: The client shared by all the agents. Defaults to the process-wide provider.
+        max_concurrency (int): The maximum number of runs executing at once.
+        max_queue (int): The maximum number of runs waiting for a worker.
+        timeout (float | None): The deadline of every run, in seconds. None disables it.
+        stats (dict): Counters of requests, runs, coalesced and rejected requests.
+
+    Usage:
+        uvicorn agentic_patterns.server:app
+    """
+
+    def __init__(
+        self,
+        client=None,
+        max_concurrency: int = 8,
+        max_queue: int = 64,
+        timeout: float | None = 120.0,
+    ):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.stats = {"requests": 0, "runs": 0, "coalesced": 0, "rejected": 0}
+
+        self._flights: dict[str, _Flight] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of distinct runs executing or waiting for a worker.
+        """
+        return len(self._flights)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="agent"
+            )
+        return self._executor
+
+    def submit(self, job: dict) -> _Flight | None:
+        """
+        Starts a run for the job, or joins the identical run already in flight.
+
+        Args:
+            job (dict): The job description.
+
+        Returns:
+            _Flight | None: The run, or None if the server is full and the request is rejected.
+        """
+        self.stats["requests"] += 1
+        key = job_key(job)
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+            return flight
+
+        if self.in_flight >= self.max_concurrency + self.max_queue:
+            self.stats["rejected"] += 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        flight = _Flight(loop)
+        self._flights[key] = flight
+        self.stats["runs"] += 1
+
+        def on_token(delta: str) -> None:
+            loop.call_soon_threadsafe(flight.publish, TOKEN, {"delta": delta})
+
+        # The run is executed in a copy of the request context (e.g. an active profiler).
+        # Requests are untrusted, so they can't import modules, set arbitrary arguments or run
+        # past the server deadline
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(
+            self._get_executor(),
+            lambda: context.run(
+                run_job,
+                job,
+                client=self.client,
+                on_token=on_token,
+                trusted=False,
+                max_timeout=self.timeout,
+            ),
+        )
+
+        def finish(future: asyncio.Future) -> None:
+            # New requests start a fresh run from now on
+            del self._flights[key]
+            if future.exception() is not None:
+                error = future.exception()
+                flight.publish(ERROR, {"error": f"{type(error).__name__}: {error}"})
+                flight.result.set_exception(error)
+                # Streaming clients get the error as an event, so it's not an unhandled error
+                flight.result.exception()
+            else:
+                flight.publish(RESULT, {"output": future.result()})
+                flight.result.set_result(future.result())
+
+        future.add_done_callback(finish)
+        return flight
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"].rstrip("/")
+
+        if method == "GET" and path == "/health":
+            await send_json(
+                send,
+                200,
+                {"status": "ok", "in_flight": self.in_flight, **self.stats},
+            )
+            return
+
+        endpoint, _, pattern = path.lstrip("/").partition("/")
+        if endpoint not in ("run", "stream"):
+            await send_json(send, 404, {"error": "Not found"})
+            return
+        if method != "POST":
+            await send_json(send, 405, {"error": "Method not allowed"})
+            return
+
+        job, error = await read_job(receive)
+        if job is not None and pattern:
+            job["pattern"] = pattern
+        if job is not None and job.get("pattern") not in PATTERNS:
+            error = (
+                f"Unknown pattern '{job.get('pattern')}'. Expected one of {PATTERNS}"
+            )
+        if error is not None:
+            await send_json(send, 400, {"error": error})
+            return
+
+        flight = self.submit(job)
+        if flight is None:
+            await send_json(
+                send,
+                503,
+                {"error": "The server is overloaded, try again later"},
+                headers=[(b"retry-after", b"1")],
+            )
+            return
+
+        if endpoint == "run":
+            try:
+                output = await asyncio.shield(flight.result)
+            except Exception as e:
+                await send_json(send, 500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            await send_json(send, 200, {"output": output})
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                ],
+            }
+        )
+        async for name, data in flight.subscribe():
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": format_sse(name, data),
+                    "more_body": True,
+                }
+            )
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def format_sse(name: str, data: dict) -> bytes:
+    """
+    Formats a Server-Sent Event.
+
+    Args:
+        name (str): The event name.
+        data (dict): The event payload, sent as JSON.
+
+    Returns:
+        bytes: The encoded event.
+    """
+    return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+async def read_job(receive) -> tuple[dict | None, str | None]:
+    """
+    Reads the JSON job of an HTTP request.
+
+    Args:
+        receive: The ASGI receive callable.
+
+    Returns:
+        tuple[dict | None, str | None]: The job, or None and the reason why it's invalid.
+    """
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None, "Client disconnected"
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_SIZE:
+            return None, "Request body too large"
+        if not message.get("more_body", False):
+            break
+
+    try:
+        job = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e}"
+    if not isinstance(job, dict):
+        return None, "The request body must be a JSON object"
+    return job, None
+
+
+async def send_json(send, status: int, payload: dict, headers: list | None = None):
+    """
+    Sends a complete JSON response.
+
+    Args:
+        send: The ASGI send callable.
+        status (int): The HTTP status code.
+        payload (dict): The response body.
+        headers (list | None, optional): Extra response headers.
+    """
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *(headers or [])],
+        }
+    )
+    await send(
+        {
+            "type": "http.response.body",
+            "body": json.dumps(payload, default=str).encode(),
+        }
+    )
+
+
+app = AgentServer()
@@ -1,6 +1,11 @@
+import difflib
+import inspect
 import json
 from typing import Callable
 
+from agentic_patterns.utils.json_parsing import lenient_loads
+from agentic_patterns.utils.json_parsing import TruncatedJSONError
+
 
 def get_fn_signature(fn: Callable) -> dict:
     """
@@ -11,7 +16,7 @@ def get_fn_signature(fn: Callable) -> dict:
 
     Returns:
         dict: A dictionary containing the function's name, description,
-              and parameter types.
+              parameter types and required parameters (the ones without a default value).
     """
     fn_signature: dict = {
         "name": fn.__name__,
@@ -22,9 +27,70 @@ def get_fn_signature(fn: Callable) -> dict:
         k: {"type": v.__name__} for k, v in fn.__annotations__.items() if k != "return"
     }
     fn_signature["parameters"]["properties"] = schema
+    fn_signature["parameters"]["required"] = [
+        name
+        for name, parameter in inspect.signature(fn).parameters.items()
+        if parameter.default is inspect.Parameter.empty
+        and parameter.kind
+        not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+    ]
     return fn_signature
 
 
+def get_openai_tool_schema(fn_signature: dict) -> dict:
+    """
+    Converts a function signature (as returned by `get_fn_signature`) into the JSON schema
+    expected by the `tools` parameter of the chat completions API.
+
+    Args:
+        fn_signature (dict): The function signature.
+
+    Returns:
+        dict: The tool definition in the chat completions API format.
+    """
+    json_types = {
+        "int": "integer",
+        "str": "string",
+        "bool": "boolean",
+        "float": "number",
+        "list": "array",
+        "dict": "object",
+    }
+    properties = {
+        arg_name: {"type": json_types.get(arg_schema.get("type"), "string")}
+        for arg_name, arg_schema in fn_signature["parameters"]["properties"].items()
+    }
+    return {
+        "type": "function",
+        "function": {
+            "name": fn_signature["name"],
+            "description": fn_signature["description"] or "",
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": fn_signature["parameters"].get(
+                    "required", list(properties)
+                ),
+            },
+        },
+    }
+
+
+TOOL_CALL_FORMAT = '{"name": <function-name>, "arguments": <args-dict>, "id": <id>}'
+
+TRUNCATED_MESSAGE = (
+    "Your tool call was cut off before its end, so it was not run. "
+    "Send it again in full, with shorter arguments if needed."
+)
+
+
+class ToolCallError(ValueError):
+    """
+    Raised when a tool call can't be run. The message explains what's wrong in a way the model
+    can act on, so it's sent back to the model as a repair message instead of failing the run.
+    """
+
+
 def validate_arguments(tool_call: dict, tool_signature: dict) -> dict:
     """
     Validates and converts arguments in the input dictionary to match the expected types.
@@ -35,9 +101,23 @@ def validate_arguments(tool_call: dict, tool_signature: dict) -> dict:
 
     Returns:
         dict: The tool call dictionary with the arguments converted to the correct types if necessary.
+
+    Raises:
+        ToolCallError: If an argument is unknown, missing or can't be converted to the expected type.
     """
     properties = tool_signature["parameters"]["properties"]
 
+    missing = [
+        arg_name
+        for arg_name in tool_signature["parameters"].get("required", [])
+        if arg_name not in tool_call["arguments"]
+    ]
+    if missing:
+        raise ToolCallError(
+            f"Tool '{tool_call['name']}' is missing the required arguments: "
+            f"{', '.join(missing)}."
+        )
+
     # TODO: This is overly simplified but enough for simple Tools.
     type_mapping = {
         "int": int,
@@ -47,14 +127,133 @@ def validate_arguments(tool_call: dict, tool_signature: dict) -> dict:
     }
 
     for arg_name, arg_value in tool_call["arguments"].items():
-        expected_type = properties[arg_name].get("type")
+        if arg_name not in properties:
+            raise ToolCallError(
+                f"Tool '{tool_call['name']}' has no argument '{arg_name}'. "
+                f"Its arguments are: {', '.join(properties) or 'none'}."
+            )
+        expected_type = type_mapping.get(properties[arg_name].get("type"))
 
-        if not isinstance(arg_value, type_mapping[expected_type]):
-            tool_call["arguments"][arg_name] = type_mapping[expected_type](arg_value)
+        if expected_type is not None and not isinstance(arg_value, expected_type):
+            try:
+                tool_call["arguments"][arg_name] = expected_type(arg_value)
+            except (TypeError, ValueError):
+                raise ToolCallError(
+                    f"Argument '{arg_name}' of tool '{tool_call['name']}' must be of type "
+                    f"{expected_type.__name__}, got {arg_value!r}."
+                ) from None
 
     return tool_call
 
 
+def parse_tool_call(tool_call: str | dict, tool_names) -> dict:
+    """
+    Parses a raw tool call leniently (see `lenient_loads`) and checks that it targets a known tool.
+
+    Args:
+        tool_call (str | dict): The content of a `<tool_call>` block, or an already parsed tool
+            call whose `arguments` may still be a JSON string.
+        tool_names: The collection of valid tool names.
+
+    Returns:
+        dict: The tool call, with its `arguments` parsed.
+
+    Raises:
+        ToolCallError: If the tool call can't be parsed or targets an unknown tool.
+    """
+    if isinstance(tool_call, str):
+        try:
+            tool_call = lenient_loads(tool_call)
+        except TruncatedJSONError:
+            raise ToolCallError(TRUNCATED_MESSAGE) from None
+        except ValueError as e:
+            raise ToolCallError(
+                f"The tool call is not valid JSON ({e}). "
+                f"Send it again as a single JSON object: {TOOL_CALL_FORMAT}"
+            ) from None
+    if not isinstance(tool_call, dict):
+        raise ToolCallError(
+            f"The tool call must be a JSON object like {TOOL_CALL_FORMAT}"
+        )
+
+    name = tool_call.get("name")
+    if name not in tool_names:
+        close_matches = difflib.get_close_matches(str(name), list(tool_names), n=1)
+        hint = f" Did you mean '{close_matches[0]}'?" if close_matches else ""
+        raise ToolCallError(
+            f"Unknown tool '{name}'.{hint} "
+            f"Use one of the available tools: {', '.join(list(tool_names)[:20])}."
+        )
+
+    arguments = tool_call.get("arguments") or {}
+    if isinstance(arguments, str):
+        try:
+            arguments = lenient_loads(arguments)
+        except TruncatedJSONError:
+            raise ToolCallError(TRUNCATED_MESSAGE) from None
+        except ValueError as e:
+            raise ToolCallError(
+                f"The arguments of tool '{name}' are not valid JSON ({e})."
+            ) from None
+    if not isinstance(arguments, dict):
+        raise ToolCallError(
+            f"The arguments of tool '{name}' must be a JSON object mapping argument names to values."
+        )
+    return {**tool_call, "arguments": arguments}
+
+
+def parse_tool_calls(tool_calls: list, tools: dict) -> tuple[list[dict], dict]:
+    """
+    Parses and validates the tool calls of a completion, separating the ones that can be run
+    from the ones that need to be repaired by the model.
+
+    Args:
+        tool_calls (list): The tool calls, either as strings in JSON format or as parsed dicts.
+        tools (dict): A dictionary mapping tool names to their Tool objects.
+
+    Returns:
+        tuple[list[dict], dict]: The valid tool calls, with their arguments converted to the
+            expected types, and the repair messages of the others, keyed by tool call ID. Tool calls
+            without an ID get their position.
+    """
+    valid_tool_calls = []
+    repairs = {}
+    for position, raw_tool_call in enumerate(tool_calls):
+        tool_call_id = (
+            raw_tool_call.get("id", position)
+            if isinstance(raw_tool_call, dict)
+            else position
+        )
+        try:
+            tool_call = parse_tool_call(raw_tool_call, tools)
+            tool_call_id = tool_call.setdefault("id", position)
+            signature = tools[tool_call["name"]].signature
+            valid_tool_calls.append(validate_arguments(tool_call, signature))
+        except ToolCallError as e:
+            repairs[tool_call_id] = f"Error: {e}"
+    return valid_tool_calls, repairs
+
+
+def is_valid_tool_call(tool_call_str: str | dict, tool_names) -> bool:
+    """
+    Checks whether a raw tool call is well formed (possibly after a lenient repair) JSON that
+    targets a known tool.
+
+    Args:
+        tool_call_str (str | dict): The content of a `<tool_call>` block, or a tool call dict
+            whose `arguments` may still be a JSON string.
+        tool_names: The collection of valid tool names.
+
+    Returns:
+        bool: True if the tool call can be processed, False otherwise.
+    """
+    try:
+        parse_tool_call(tool_call_str, tool_names)
+    except ToolCallError:
+        return False
+    return True
+
+
 class Tool:
     """
     A class representing a tool that wraps a callable and its signature.
@@ -62,17 +261,50 @@ class Tool:
     Attributes:
         name (str): The name of the tool (function).
         fn (Callable): The function that the tool represents.
-        fn_signature (str): JSON string representation of the function's signature.
+        fn_signature (str): JSON string representation of the function's signature. When it's
+            not given, it's computed from the function the first time it's needed.
     """
 
-    def __init__(self, name: str, fn: Callable, fn_signature: str):
+    def __init__(self, name: str, fn: Callable, fn_signature: str | None = None):
         self.name = name
         self.fn = fn
-        self.fn_signature = fn_signature
+        self._fn_signature = fn_signature
+        self._signature: dict | None = None
+        self._openai_schema: dict | None = None
 
     def __str__(self):
         return self.fn_signature
 
+    @property
+    def fn_signature(self) -> str:
+        """
+        The function signature, as a JSON string.
+        """
+        if self._fn_signature is None:
+            self._fn_signature = json.dumps(self.signature)
+        return self._fn_signature
+
+    @property
+    def signature(self) -> dict:
+        """
+        The function signature, as a dict (see `get_fn_signature`).
+        """
+        if self._signature is None:
+            if self._fn_signature is None:
+                self._signature = get_fn_signature(self.fn)
+            else:
+                self._signature = json.loads(self._fn_signature)
+        return self._signature
+
+    @property
+    def openai_schema(self) -> dict:
+        """
+        The tool definition in the format expected by the chat completions `tools` parameter.
+        """
+        if self._openai_schema is None:
+            self._openai_schema = get_openai_tool_schema(self.signature)
+        return self._openai_schema
+
     def run(self, **kwargs):
         """
         Executes the tool (function) with provided arguments.
@@ -88,7 +320,8 @@ class Tool:
 
 def tool(fn: Callable):
     """
-    A decorator that wraps a function into a Tool object.
+    A decorator that wraps a function into a Tool object. The signature of the function is only
+    computed when the tool is first shown to a model, so decorating is cheap at import time.
 
     Args:
         fn (Callable): The function to be wrapped.
@@ -96,11 +329,4 @@ def tool(fn: Callable):
     Returns:
         Tool: A Tool object containing the function, its name, and its signature.
     """
-
-    def wrapper():
-        fn_signature = get_fn_signature(fn)
-        return Tool(
-            name=fn_signature.get("name"), fn=fn, fn_signature=json.dumps(fn_signature)
-        )
-
-    return wrapper()
+    return Tool(name=fn.__name__, fn=fn)
@@ -1,17 +1,28 @@
-import json
 import re
+from typing import Callable
 
 from colorama import Fore
 from dotenv import load_dotenv
-from groq import Groq
 
+from agentic_patterns.tool_pattern.tool import parse_tool_calls
 from agentic_patterns.tool_pattern.tool import Tool
-from agentic_patterns.tool_pattern.tool import validate_arguments
+from agentic_patterns.tool_pattern.tool_calling import get_tool_calling
+from agentic_patterns.tool_pattern.tool_calling import ToolCalling
+from agentic_patterns.tool_pattern.tool_calling import XML
+from agentic_patterns.tool_pattern.tool_index import ToolIndex
+from agentic_patterns.tool_pattern.tool_registry import resolve_tools
+from agentic_patterns.tool_pattern.tool_registry import ToolRegistry
+from agentic_patterns.utils.budget import Budget
+from agentic_patterns.utils.budget import BudgetExceeded
 from agentic_patterns.utils.completions import build_prompt_structure
 from agentic_patterns.utils.completions import ChatHistory
-from agentic_patterns.utils.completions import completions_create
-from agentic_patterns.utils.completions import update_chat_history
-from agentic_patterns.utils.extraction import extract_tag_content
+from agentic_patterns.utils.providers import default_provider
+from agentic_patterns.utils.routing import as_router
+from agentic_patterns.utils.routing import FINAL_ANSWER
+from agentic_patterns.utils.routing import ModelRouter
+from agentic_patterns.utils.routing import routed_chat_completion
+from agentic_patterns.utils.routing import routed_completion
+from agentic_patterns.utils.routing import TOOL_SELECTION
 
 load_dotenv()
 
@@ -34,6 +45,11 @@ Here are the available tools:
 </tools>
 """
 
+NATIVE_TOOL_SYSTEM_PROMPT = """
+You are a function calling AI model. You may call one or more of the provided functions to assist with the user query.
+Don't make assumptions about what values to plug into functions.
+"""
+
 
 class ToolAgent:
     """
@@ -42,56 +58,150 @@ class ToolAgent:
     and runs the respective tools.
 
     Attributes:
-        tools (Tool | list[Tool]): A list of tools available to the agent.
-        model (str): The model to be used for generating tool calls and responses.
-        client (Groq): The Groq client used to interact with the language model.
+        tools (Tool | list[Tool]): A list of tools available to the agent. The agent also accepts tool
+            names (or 'module:attribute' paths), looked up in a `ToolRegistry`, whose modules are only
+            imported when the tools are first called.
+        model (str): The default model to be used for generating tool calls and responses.
+        router (ModelRouter): The routing policy that picks a model for tool selection and final answers.
+        client (Provider): The LLM provider (or any Groq-shaped client). Defaults to the process-wide
+            provider, configured with environment variables (see `default_provider`).
+        tool_calling (ToolCalling): The strategy used to expose the tools to the model, either
+            pasting their signatures in the system prompt ('xml') or through the API `tools` parameter ('native').
+        top_k_tools (int | None): If set, only the `top_k_tools` tools most relevant to the current
+            query are shown to the model, instead of the whole tool list.
+        tool_index (ToolIndex | None): The BM25 index used to select the relevant tools.
         tools_dict (dict): A dictionary mapping tool names to their corresponding Tool objects.
+        max_repairs (int): The number of times the model is asked to fix tool calls that couldn't
+            be run (e.g. malformed JSON or unknown tools) before answering.
     """
 
     def __init__(
         self,
-        tools: Tool | list[Tool],
-        model: str = "llama3-groq-70b-8192-tool-use-preview",
+        tools: Tool | str | list[Tool | str],
+        model: str | ModelRouter = "llama3-groq-70b-8192-tool-use-preview",
+        tool_calling: str | ToolCalling = XML,
+        top_k_tools: int | None = None,
+        max_repairs: int = 2,
+        registry: ToolRegistry | None = None,
+        client=None,
     ) -> None:
-        self.client = Groq()
-        self.model = model
-        self.tools = tools if isinstance(tools, list) else [tools]
+        self.client = client or default_provider()
+        self.router = as_router(model)
+        self.model = self.router.default
+        self.tool_calling = get_tool_calling(tool_calling)
+        self.tools = resolve_tools(tools, registry)
         self.tools_dict = {tool.name: tool for tool in self.tools}
+        self.top_k_tools = top_k_tools
+        self.tool_index = ToolIndex(self.tools) if top_k_tools else None
+        self.max_repairs = max_repairs
 
-    def add_tool_signatures(self) -> str:
+    def select_tools(self, query: str) -> list[Tool]:
         """
-        Collects the function signatures of all available tools.
+        Selects the tools to show to the model for the given query. All the tools are
+        selected unless `top_k_tools` is set.
+
+        Args:
+            query (str): The text used to rank the tools (e.g. the user message).
+
+        Returns:
+            list[Tool]: The selected tools.
+        """
+        if self.tool_index is None or len(self.tool_index) <= self.top_k_tools:
+            return self.tools
+        return self.tool_index.search(query, self.top_k_tools)
+
+    def add_tool_signatures(self, tools: list[Tool] | None = None) -> str:
+        """
+        Collects the function signatures of the given tools.
+
+        Args:
+            tools (list[Tool] | None, optional): The tools to include. Defaults to all available tools.
 
         Returns:
             str: A concatenated string of all tool function signatures in JSON format.
         """
-        return "".join([tool.fn_signature for tool in self.tools])
+        tools = self.tools if tools is None else tools
+        return "".join([tool.fn_signature for tool in tools])
 
-    def process_tool_calls(self, tool_calls_content: list) -> dict:
+    def is_valid_tool_selection(self, message) -> bool:
+        """
+        Checks that every tool call in the completion is well formed and targets a known tool.
+        Used by the router to decide whether to escalate to a bigger model.
+
+        Args:
+            message: The message object returned by the model.
+
+        Returns:
+            bool: True if the tool calls (if any) can be processed, False otherwise.
+        """
+        return self.tool_calling.is_valid(message, self.tools_dict)
+
+    def _request_tool_calls(
+        self, chat_history: ChatHistory, tools: list[Tool], budget: Budget | None
+    ):
+        return routed_chat_completion(
+            self.client,
+            chat_history,
+            self.router,
+            TOOL_SELECTION,
+            is_valid=self.is_valid_tool_selection,
+            budget=budget,
+            **self.tool_calling.request_kwargs(tools),
+        )
+
+    def process_tool_calls(
+        self, tool_calls_content: list, budget: Budget | None = None
+    ) -> dict:
         """
         Processes each tool call, validates arguments, executes the tools, and collects results.
 
+        Tool calls that can't be parsed (even leniently), target an unknown tool or have invalid
+        arguments are not run. Their result is a repair message telling the model what to fix.
+
         Args:
-            tool_calls_content (list): List of strings, each representing a tool call in JSON format.
+            tool_calls_content (list): List of tool calls, either as strings in JSON format or as
+                already parsed dicts.
+            budget (Budget | None, optional): The run budget. Tools are given the time left before its deadline.
 
         Returns:
             dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
         """
-        observations = {}
-        for tool_call_str in tool_calls_content:
-            tool_call = json.loads(tool_call_str)
-            tool_name = tool_call["name"]
-            tool = self.tools_dict[tool_name]
+        # Validate the tool calls
+        validated_tool_calls, observations = parse_tool_calls(
+            tool_calls_content, self.tools_dict
+        )
+        if observations:
+            print(Fore.YELLOW + f"\nInvalid tool calls: \n{observations}")
 
-            print(Fore.GREEN + f"\nUsing Tool: {tool_name}")
+        observations.update(self.run_tool_calls(validated_tool_calls, budget))
+        return observations
 
-            # Validate and execute the tool call
-            validated_tool_call = validate_arguments(
-                tool_call, json.loads(tool.fn_signature)
-            )
+    def run_tool_calls(
+        self, validated_tool_calls: list[dict], budget: Budget | None = None
+    ) -> dict:
+        """
+        Executes tool calls already validated by `parse_tool_calls` and collects their results.
+
+        Args:
+            validated_tool_calls (list[dict]): The valid tool calls, with their arguments converted.
+            budget (Budget | None, optional): The run budget. Tools are given the time left before its deadline.
+
+        Returns:
+            dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
+        """
+        observations = {}
+        for validated_tool_call in validated_tool_calls:
+            tool = self.tools_dict[validated_tool_call["name"]]
+
+            print(Fore.GREEN + f"\nUsing Tool: {tool.name}")
             print(Fore.GREEN + f"\nTool call dict: \n{validated_tool_call}")
 
-            result = tool.run(**validated_tool_call["arguments"])
+            # Execute the tool call
+            arguments = validated_tool_call["arguments"]
+            if budget is None:
+                result = tool.run(**arguments)
+            else:
+                result = budget.call(tool.run, **arguments)
             print(Fore.GREEN + f"\nTool result: \n{result}")
 
             # Store the result using the tool call ID
@@ -102,38 +212,98 @@ class ToolAgent:
     def run(
         self,
         user_msg: str,
+        on_token: Callable[[str], None] | None = None,
+        budget: Budget | None = None,
     ) -> str:
         """
         Handles the full process of interacting with the language model and executing a tool based on user input.
 
         Args:
             user_msg (str): The user's message that prompts the tool agent to act.
+            on_token (Callable[[str], None] | None, optional): If given, the final answer is streamed and
+                its token deltas are passed to this callback as they arrive.
+            budget (Budget | None, optional): The deadline and token / cost budget of the run. When it
+                runs out after the tools were executed, their raw results are returned.
 
         Returns:
             str: The final output after executing the tool and generating a response from the model.
+
+        Raises:
+            BudgetExceeded: If the budget runs out before any tool result is available.
         """
         user_prompt = build_prompt_structure(prompt=user_msg, role="user")
+        tools = self.select_tools(user_msg)
+
+        if self.tool_calling.native:
+            system_prompt = NATIVE_TOOL_SYSTEM_PROMPT
+        else:
+            system_prompt = TOOL_SYSTEM_PROMPT % self.add_tool_signatures(tools)
 
         tool_chat_history = ChatHistory(
             [
-                build_prompt_structure(
-                    prompt=TOOL_SYSTEM_PROMPT % self.add_tool_signatures(),
-                    role="system",
-                ),
+                build_prompt_structure(prompt=system_prompt, role="system"),
                 user_prompt,
             ]
         )
         agent_chat_history = ChatHistory([user_prompt])
 
-        tool_call_response = completions_create(
-            self.client, messages=tool_chat_history, model=self.model
-        )
-        tool_calls = extract_tag_content(str(tool_call_response), "tool_call")
+        tool_call_message = self._request_tool_calls(tool_chat_history, tools, budget)
 
-        if tool_calls.found:
-            observations = self.process_tool_calls(tool_calls.content)
-            update_chat_history(
-                agent_chat_history, f'f"Observation: {observations}"', "user"
+        observations = {}
+        exchanges = []
+        for attempt in range(self.max_repairs + 1):
+            tool_calls, repairs = parse_tool_calls(
+                self.tool_calling.parse(tool_call_message).tool_calls, self.tools_dict
             )
+            results = self.run_tool_calls(tool_calls, budget)
+            observations.update(results)
+            if tool_calls or repairs:
+                exchanges.append((tool_call_message, {**repairs, **results}))
+            if not repairs or attempt == self.max_repairs:
+                break
 
-        return completions_create(self.client, agent_chat_history, self.model)
+            # The valid tool calls already ran, the model only fixes the invalid ones
+            print(Fore.YELLOW + f"\nInvalid tool calls: \n{repairs}")
+            tool_chat_history.append(
+                self.tool_calling.assistant_message(tool_call_message)
+            )
+            tool_chat_history.extend(
+                self.tool_calling.observation_messages({**repairs, **results})
+            )
+            try:
+                tool_call_message = self._request_tool_calls(
+                    tool_chat_history, tools, budget
+                )
+            except BudgetExceeded:
+                if not observations:
+                    raise
+                break
+
+        if self.tool_calling.native:
+            # Tool messages must follow the assistant message that requested them
+            for message, exchange_observations in exchanges:
+                agent_chat_history.append(self.tool_calling.assistant_message(message))
+                agent_chat_history.extend(
+                    self.tool_calling.observation_messages(exchange_observations)
+                )
+        elif observations:
+            agent_chat_history.extend(
+                self.tool_calling.observation_messages(
+                    observations, template='f"Observation: {}"'
+                )
+            )
+
+        try:
+            return routed_completion(
+                self.client,
+                agent_chat_history,
+                self.router,
+                FINAL_ANSWER,
+                on_token=on_token,
+                budget=budget,
+            )
+        except BudgetExceeded as e:
+            if not observations:
+                raise
+            print(Fore.YELLOW + f"\n{e}. Returning the tool results")
+            return "\n".join(str(result) for result in observations.values())
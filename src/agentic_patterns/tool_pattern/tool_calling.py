@@ -0,0 +1,225 @@
+from dataclasses import dataclass
+
+from agentic_patterns.tool_pattern.tool import is_valid_tool_call
+from agentic_patterns.tool_pattern.tool import Tool
+from agentic_patterns.utils.completions import build_prompt_structure
+from agentic_patterns.utils.extraction import extract_tag_content
+from agentic_patterns.utils.json_parsing import lenient_loads
+from agentic_patterns.utils.messages import Message
+
+
+XML = "xml"
+NATIVE = "native"
+
+
+@dataclass
+class ParsedCompletion:
+    """
+    A data class to represent a model completion once the tool calls have been extracted.
+
+    Attributes:
+        content (str): The text content of the completion.
+        tool_calls (list[dict | str]): The tool calls, each one as a dict with `name`, `arguments` and `id`
+            keys. Tool calls that couldn't be parsed are kept as raw strings (or with raw string
+            `arguments`), so the agent can ask the model to repair them.
+    """
+
+    content: str
+    tool_calls: list[dict | str]
+
+
+class ToolCalling:
+    """
+    Base class of the strategies used to expose tools to the model and read back its tool calls.
+
+    Agents only talk to this interface, so the same agent code works whether the tools are pasted
+    into the system prompt or passed through the chat completions `tools` parameter.
+
+    Attributes:
+        native (bool): Whether the tools are passed natively through the API.
+    """
+
+    native = False
+
+    def request_kwargs(self, tools: list[Tool]) -> dict:
+        """
+        Returns the extra parameters to send with the completion request.
+
+        Args:
+            tools (list[Tool]): The tools available to the model.
+
+        Returns:
+            dict: The extra request parameters.
+        """
+        return {}
+
+    def parse(self, message) -> ParsedCompletion:
+        """
+        Extracts the text content and the tool calls from a completion message.
+
+        Args:
+            message: The message object returned by the chat completions API.
+
+        Returns:
+            ParsedCompletion: The content and the parsed tool calls.
+        """
+        raise NotImplementedError
+
+    def is_valid(self, message, tool_names) -> bool:
+        """
+        Checks that every tool call in the message is well formed and targets a known tool.
+
+        Args:
+            message: The message object returned by the chat completions API.
+            tool_names: The collection of valid tool names.
+
+        Returns:
+            bool: True if the tool calls (if any) can be processed, False otherwise.
+        """
+        raise NotImplementedError
+
+    def assistant_message(self, message) -> Message:
+        """
+        Builds the chat history entry for an assistant message.
+
+        Args:
+            message: The message object returned by the chat completions API.
+
+        Returns:
+            Message: The assistant message to append to the chat history.
+        """
+        return build_prompt_structure(prompt=str(message.content), role="assistant")
+
+    def observation_messages(self, observations: dict, template: str = "{}") -> list:
+        """
+        Builds the chat history entries that send tool results back to the model.
+
+        Args:
+            observations (dict): A dictionary mapping tool call IDs to the results from the tools.
+            template (str, optional): A format string wrapping the observations in XML mode.
+
+        Returns:
+            list[Message]: The messages to append to the chat history.
+        """
+        raise NotImplementedError
+
+
+class XMLToolCalling(ToolCalling):
+    """
+    Tools are described inside the system prompt and the model answers with
+    `<tool_call></tool_call>` XML tags wrapping a JSON object.
+    """
+
+    def parse(self, message) -> ParsedCompletion:
+        content = str(message.content)
+        tool_calls = extract_tag_content(content, "tool_call")
+        return ParsedCompletion(
+            content=content,
+            tool_calls=[_loads_or_raw(tool_call) for tool_call in tool_calls.content],
+        )
+
+    def is_valid(self, message, tool_names) -> bool:
+        tool_calls = extract_tag_content(str(message.content), "tool_call")
+        return all(
+            is_valid_tool_call(tool_call, tool_names)
+            for tool_call in tool_calls.content
+        )
+
+    def observation_messages(self, observations: dict, template: str = "{}") -> list:
+        return [
+            build_prompt_structure(prompt=template.format(observations), role="user")
+        ]
+
+
+class NativeToolCalling(ToolCalling):
+    """
+    Tools are passed through the chat completions `tools` parameter and the model answers with
+    structured `tool_calls`, so no tool signatures are added to the prompt and no regex parsing
+    is needed.
+    """
+
+    native = True
+
+    def request_kwargs(self, tools: list[Tool]) -> dict:
+        if not tools:
+            return {}
+        return {"tools": [tool.openai_schema for tool in tools], "tool_choice": "auto"}
+
+    def parse(self, message) -> ParsedCompletion:
+        return ParsedCompletion(
+            content=str(message.content or ""),
+            tool_calls=[
+                {
+                    "name": tool_call.function.name,
+                    "arguments": _loads_or_raw(tool_call.function.arguments or "{}"),
+                    "id": tool_call.id,
+                }
+                for tool_call in message.tool_calls or []
+            ],
+        )
+
+    def is_valid(self, message, tool_names) -> bool:
+        return all(
+            is_valid_tool_call(
+                {
+                    "name": tool_call.function.name,
+                    "arguments": tool_call.function.arguments,
+                },
+                tool_names,
+            )
+            for tool_call in message.tool_calls or []
+        )
+
+    def assistant_message(self, message) -> Message:
+        return Message(
+            role="assistant",
+            content=str(message.content or ""),
+            tool_calls=[
+                {
+                    "id": tool_call.id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments,
+                    },
+                }
+                for tool_call in message.tool_calls or []
+            ],
+        )
+
+    def observation_messages(self, observations: dict, template: str = "{}") -> list:
+        return [
+            Message(role="tool", content=str(result), tool_call_id=tool_call_id)
+            for tool_call_id, result in observations.items()
+        ]
+
+
+def _loads_or_raw(text: str):
+    try:
+        return lenient_loads(text)
+    except ValueError:
+        return text
+
+
+def get_tool_calling(mode: str | ToolCalling) -> ToolCalling:
+    """
+    Returns the tool calling strategy for the given mode.
+
+    Args:
+        mode (str | ToolCalling): Either 'xml', 'native' or an already built strategy.
+
+    Returns:
+        ToolCalling: The tool calling strategy.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if isinstance(mode, ToolCalling):
+        return mode
+    if mode == XML:
+        return XMLToolCalling()
+    if mode == NATIVE:
+        return NativeToolCalling()
+    raise ValueError(
+        f"Unknown tool calling mode '{mode}'. Expected '{XML}' or '{NATIVE}'"
+    )
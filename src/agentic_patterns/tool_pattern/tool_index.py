@@ -0,0 +1,124 @@
+import heapq
+import math
+import re
+from collections import Counter
+from collections import defaultdict
+
+from agentic_patterns.tool_pattern.tool import Tool
+
+
+_WORD_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+# The tool name is the strongest relevance signal, so its terms are counted several times
+NAME_WEIGHT = 3
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits a text into lowercase terms, breaking snake_case and camelCase identifiers
+    and removing a trailing plural 's' so 'stories' and 'story' stay close.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: The list of terms.
+    """
+    terms = []
+    for word in _WORD_PATTERN.findall(text):
+        word = word.lower()
+        if len(word) > 3 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class ToolIndex:
+    """
+    A local BM25 index over the names and docstrings of a set of tools.
+
+    It is used to include in the prompt only the tools that are relevant to the current
+    user message (or ReAct round), so the prompt size doesn't grow with the registry size.
+
+    Attributes:
+        tools (list[Tool]): The indexed tools.
+        k1 (float): BM25 term frequency saturation parameter.
+        b (float): BM25 document length normalization parameter.
+    """
+
+    def __init__(self, tools: list[Tool], k1: float = 1.5, b: float = 0.75):
+        self.tools = list(tools)
+        self.k1 = k1
+        self.b = b
+
+        self._postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._doc_lengths: list[int] = []
+
+        for doc_id, tool in enumerate(self.tools):
+            signature = tool.signature
+            terms = tokenize(tool.name) * NAME_WEIGHT + tokenize(
+                signature.get("description") or ""
+            )
+            for arg_name in signature["parameters"]["properties"]:
+                terms += tokenize(arg_name)
+
+            self._doc_lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings[term].append((doc_id, tf))
+
+        n_docs = len(self.tools)
+        self._avg_doc_length = sum(self._doc_lengths) / n_docs if n_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def __len__(self):
+        return len(self.tools)
+
+    def scores(self, query: str) -> dict[int, float]:
+        """
+        Computes the BM25 score of every tool that shares at least one term with the query.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            dict[int, float]: A dictionary mapping tool positions to their scores.
+        """
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self._postings[term]:
+                length_norm = (
+                    1
+                    - self.b
+                    + self.b * (self._doc_lengths[doc_id] / self._avg_doc_length)
+                )
+                scores[doc_id] += (
+                    idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+                )
+        return scores
+
+    def search(self, query: str, k: int) -> list[Tool]:
+        """
+        Returns the `k` tools most relevant to the query. When no tool matches the query at
+        all, the first `k` tools are returned so the agent is never left without tools.
+
+        Args:
+            query (str): The search query.
+            k (int): The maximum number of tools to return.
+
+        Returns:
+            list[Tool]: The selected tools, from the most to the least relevant.
+        """
+        scores = self.scores(query)
+        if not scores:
+            return self.tools[:k]
+
+        best = heapq.nlargest(k, scores, key=lambda doc_id: (scores[doc_id], -doc_id))
+        return [self.tools[doc_id] for doc_id in best]
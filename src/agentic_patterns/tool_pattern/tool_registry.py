@@ -0,0 +1,407 @@
+import importlib.metadata
+import importlib.util
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+from agentic_patterns.tool_pattern.tool import get_fn_signature
+from agentic_patterns.tool_pattern.tool import Tool
+
+
+ENTRY_POINT_GROUP = "agentic_patterns.tools"
+
+DEFAULT_CACHE_PATH = (
+    Path(os.environ.get("AGENTIC_PATTERNS_CACHE_DIR", Path.home() / ".cache"))
+    / "agentic_patterns"
+    / "tool_signatures.json"
+)
+
+
+def load_target(target: str):
+    """
+    Imports an object from a 'package.module:attribute' path.
+
+    Args:
+        target (str): The import path.
+
+    Returns:
+        The imported object.
+
+    Raises:
+        ValueError: If the path is not in the 'module:attribute' format.
+    """
+    module_name, _, attribute = target.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Invalid import path '{target}'. Expected 'module:attribute'")
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _load_function(target: str) -> Callable:
+    obj = load_target(target)
+    if isinstance(obj, Tool):
+        return obj.fn
+    if not callable(obj):
+        raise TypeError(f"'{target}' is not a Tool or a function")
+    return obj
+
+
+def _compute_signature(target: str) -> tuple[dict, str | None]:
+    # Also returns the file defining the function, which differs from the module file of the
+    # target when the module re-exports it (e.g. 'my_package:my_tool')
+    obj = load_target(target)
+    if isinstance(obj, Tool):
+        fn, signature = obj.fn, obj.signature
+    elif callable(obj):
+        fn, signature = obj, get_fn_signature(obj)
+    else:
+        raise TypeError(f"'{target}' is not a Tool or a function")
+    try:
+        source_file = inspect.getsourcefile(inspect.unwrap(fn))
+    except TypeError:
+        source_file = None
+    return signature, source_file
+
+
+def _module_file(target: str) -> str | None:
+    # Locating the module file doesn't import the module itself (only its parent packages)
+    spec = importlib.util.find_spec(target.partition(":")[0])
+    return spec.origin if spec is not None else None
+
+
+def _file_fingerprint(path: str | None) -> list | None:
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class LazyTool(Tool):
+    """
+    A Tool whose module is only imported the first time the tool is called. Its signature comes
+    from a manifest or from the signature cache of its registry.
+
+    Attributes:
+        name (str): The name of the tool.
+        target (str): The 'module:attribute' path of the function (or of a Tool).
+    """
+
+    def __init__(self, name: str, target: str, signature: dict):
+        self.name = name
+        self.target = target
+        self._fn: Callable | None = None
+        self._fn_signature = None
+        self._signature = signature
+        self._openai_schema = None
+
+    @property
+    def fn(self) -> Callable:
+        """
+        The function of the tool, imported on first access.
+        """
+        if self._fn is None:
+            self._fn = _load_function(self.target)
+        return self._fn
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether the module of the tool has been imported.
+        """
+        return self._fn is not None
+
+
+class ToolRegistry:
+    """
+    A registry of tools that are discovered without importing them.
+
+    Tools are registered by their 'module:attribute' path, from a JSON manifest, from the
+    `agentic_patterns.tools` entry point group of the installed packages, or one by one. Their
+    signatures come from the manifest or from an on-disk cache, invalidated when the module of the
+    tool or the file defining its function changes, so the modules are only imported when a tool
+    is actually called (or the first time its signature is computed).
+
+    A manifest is a JSON file with a list of tools, each one either a path or an object with
+    `target` and optional `name` and `signature` keys. `write_manifest` builds one with all the
+    signatures precomputed.
+
+    Attributes:
+        cache_path (Path | None): The file where the computed signatures are cached. None disables
+            the cache.
+    """
+
+    def __init__(self, cache_path: str | Path | None = None):
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self._targets: dict[str, str] = {}
+        self._signatures: dict[str, dict] = {}
+        self._tools: dict[str, Tool] = {}
+        self._cache: dict[str, dict] | None = None
+        self._cache_dirty = False
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._targets or name in self._tools
+
+    def __len__(self):
+        return len(self.names())
+
+    def names(self) -> list[str]:
+        """
+        Returns the names of the registered tools.
+        """
+        return list(dict.fromkeys([*self._targets, *self._tools]))
+
+    def register(
+        self, target: str, name: str | None = None, signature: dict | None = None
+    ) -> str:
+        """
+        Registers a tool by its import path, without importing it.
+
+        Args:
+            target (str): The 'module:attribute' path of the function (or of a Tool).
+            name (str | None, optional): The tool name. Defaults to the signature name or the attribute name.
+            signature (dict | None, optional): The precomputed signature (see `get_fn_signature`).
+
+        Returns:
+            str: The tool name.
+        """
+        if name is None:
+            name = signature["name"] if signature else target.rpartition(":")[2]
+        with self._lock:
+            self._targets[name] = target
+            self._tools.pop(name, None)
+            if signature is not None:
+                self._signatures[name] = signature
+        return name
+
+    def add(self, tool: Tool) -> None:
+        """
+        Registers an already imported tool.
+
+        Args:
+            tool (Tool): The tool.
+        """
+        with self._lock:
+            self._tools[tool.name] = tool
+            self._targets.pop(tool.name, None)
+
+    def load_manifest(self, path: str | Path) -> list[str]:
+        """
+        Registers the tools of a JSON manifest.
+
+        Args:
+            path (str | Path): The manifest path.
+
+        Returns:
+            list[str]: The names of the registered tools.
+        """
+        with open(path) as f:
+            manifest = json.load(f)
+
+        names = []
+        for entry in manifest.get("tools", []):
+            if isinstance(entry, str):
+                entry = {"target": entry}
+            names.append(
+                self.register(
+                    entry["target"], entry.get("name"), entry.get("signature")
+                )
+            )
+        return names
+
+    def discover(self, group: str = ENTRY_POINT_GROUP) -> list[str]:
+        """
+        Registers the tools advertised by the installed packages through entry points, e.g.
+        `[tool.poetry.plugins."agentic_patterns.tools"] my_tool = "my_package.tools:my_tool"`.
+
+        Args:
+            group (str, optional): The entry point group. Defaults to 'agentic_patterns.tools'.
+
+        Returns:
+            list[str]: The names of the registered tools.
+        """
+        return [
+            self.register(entry_point.value, entry_point.name)
+            for entry_point in importlib.metadata.entry_points(group=group)
+        ]
+
+    def get(self, name: str) -> Tool:
+        """
+        Returns a registered tool. Import paths ('module:attribute') that aren't registered yet are
+        registered on the fly.
+
+        Args:
+            name (str): The tool name or import path.
+
+        Returns:
+            Tool: The tool. Registered paths give a LazyTool, imported on its first call.
+
+        Raises:
+            KeyError: If no tool is registered with that name.
+            ValueError: If the import path isn't registered and another tool already has its
+                attribute name.
+        """
+        tool = self._get(name)
+        self.save_cache()
+        return tool
+
+    def resolve(self, tools: list[Tool | str]) -> list[Tool]:
+        """
+        Returns the given tools, looking up the names (or import paths) in the registry.
+
+        Args:
+            tools (list[Tool | str]): Tools, tool names or import paths.
+
+        Returns:
+            list[Tool]: The tools.
+        """
+        resolved = [
+            tool if isinstance(tool, Tool) else self._get(tool) for tool in tools
+        ]
+        self.save_cache()
+        return resolved
+
+    def _get(self, name: str) -> Tool:
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is not None:
+                return tool
+
+            if name not in self._targets:
+                if ":" not in name:
+                    raise KeyError(f"Unknown tool '{name}'")
+                # An import path, registered under its attribute name unless another tool
+                # already has that name
+                target = name
+                name = target.rpartition(":")[2]
+                if name not in self:
+                    self.register(target, name)
+                elif self._targets.get(name) != target:
+                    raise ValueError(
+                        f"Can't register '{target}' as '{name}': another tool is already "
+                        "registered with that name"
+                    )
+                elif name in self._tools:
+                    return self._tools[name]
+            target = self._targets[name]
+
+            signature = self._signatures.get(name) or self._cached_signature(target)
+            tool = self._tools[name] = LazyTool(
+                name, target, {**signature, "name": name}
+            )
+            return tool
+
+    def _cached_signature(self, target: str) -> dict:
+        if self.cache_path is None:
+            return _compute_signature(target)[0]
+
+        if self._cache is None:
+            try:
+                with open(self.cache_path) as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+
+        # An entry is valid while both the module of the target and the file defining the
+        # function are unchanged. Entries of older versions, without "sources", are recomputed.
+        entry = self._cache.get(target)
+        if entry is not None and entry.get("sources"):
+            if all(
+                _file_fingerprint(path) == fingerprint
+                for path, fingerprint in entry["sources"].items()
+            ):
+                return entry["signature"]
+
+        module_file = _module_file(target)
+        module_fingerprint = _file_fingerprint(module_file)
+        signature, source_file = _compute_signature(target)
+        if module_fingerprint:
+            sources = {module_file: module_fingerprint}
+            source_fingerprint = _file_fingerprint(source_file)
+            if source_fingerprint:
+                sources[source_file] = source_fingerprint
+            self._cache[target] = {"sources": sources, "signature": signature}
+            self._cache_dirty = True
+        return signature
+
+    def save_cache(self) -> None:
+        """
+        Writes the newly computed signatures to the cache file.
+        """
+        with self._lock:
+            if not self._cache_dirty or self.cache_path is None:
+                return
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self.cache_path)
+            self._cache_dirty = False
+
+    def write_manifest(self, path: str | Path) -> None:
+        """
+        Writes a manifest of the registered tools with their signatures precomputed, so loading it
+        never imports the tool modules.
+
+        Args:
+            path (str | Path): The manifest path.
+        """
+        entries = []
+        for name in self.names():
+            tool = self._get(name)
+            if isinstance(tool, LazyTool):
+                entries.append(
+                    {"name": name, "target": tool.target, "signature": tool.signature}
+                )
+        self.save_cache()
+        with open(path, "w") as f:
+            json.dump({"tools": entries}, f, indent=2)
+
+
+_default_registry: ToolRegistry | None = None
+_default_registry_lock = threading.Lock()
+
+
+def get_registry() -> ToolRegistry:
+    """
+    Returns the process-wide registry, with the entry point tools and the manifest pointed to by
+    the `AGENTIC_PATTERNS_TOOLS_MANIFEST` environment variable registered.
+
+    Returns:
+        ToolRegistry: The default registry.
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            registry = ToolRegistry(cache_path=DEFAULT_CACHE_PATH)
+            registry.discover()
+            manifest = os.environ.get("AGENTIC_PATTERNS_TOOLS_MANIFEST")
+            if manifest:
+                registry.load_manifest(manifest)
+            _default_registry = registry
+        return _default_registry
+
+
+def resolve_tools(
+    tools: Tool | str | list[Tool | str], registry: ToolRegistry | None = None
+) -> list[Tool]:
+    """
+    Normalizes the `tools` argument of an agent into a list of tools.
+
+    Args:
+        tools (Tool | str | list[Tool | str]): Tools, tool names or import paths.
+        registry (ToolRegistry | None, optional): The registry used to look up the names.
+            Defaults to the process-wide registry.
+
+    Returns:
+        list[Tool]: The tools.
+    """
+    tools = tools if isinstance(tools, list) else [tools]
+    if all(isinstance(tool, Tool) for tool in tools):
+        return tools
+    return (registry or get_registry()).resolve(tools)
@@ -0,0 +1,159 @@
+import contextvars
+import threading
+import time
+
+
+class BudgetExceeded(RuntimeError):
+    """
+    Raised when a run goes past its deadline or its token or cost budget.
+    """
+
+
+class Budget:
+    """
+    A per-run deadline and token / cost budget.
+
+    The same budget is passed down to every LLM call and tool call of a run (or of all the
+    agents of a crew). Each LLM call is checked against it before being sent, its timeout is
+    capped to the remaining time, and its usage is charged afterwards. Tool calls run with the
+    remaining time as timeout. When any limit is reached a `BudgetExceeded` error is raised, which
+    the agents catch to return their best result so far instead of hanging.
+
+    Attributes:
+        timeout (float | None): The maximum duration of the run, in seconds.
+        deadline (float | None): The `time.monotonic()` value at which the run times out.
+        max_tokens (int | None): The maximum number of prompt plus completion tokens.
+        max_cost (float | None): The maximum cost of the run, computed with `prices`.
+        prices (dict[str, tuple[float, float]]): The prompt and completion prices per million
+            tokens of each model. Models without a price are free.
+        prompt_tokens (int): The prompt tokens used so far.
+        completion_tokens (int): The completion tokens used so far.
+        cost (float): The cost of the run so far.
+        exceeded (str | None): The limit that was exceeded ('deadline', 'tokens' or 'cost'), if any.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        max_tokens: int | None = None,
+        max_cost: float | None = None,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ):
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.prices = prices or {}
+
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.exceeded: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> int:
+        """
+        The total number of tokens used so far.
+        """
+        return self.prompt_tokens + self.completion_tokens
+
+    def remaining_time(self) -> float | None:
+        """
+        Returns the seconds left before the deadline (never negative), or None without deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _limit_reached(self) -> str | None:
+        if self.exceeded is not None:
+            return self.exceeded
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return "tokens"
+        if self.max_cost is not None and self.cost >= self.max_cost:
+            return "cost"
+        return None
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        Whether any limit of the budget has been reached.
+        """
+        return self._limit_reached() is not None
+
+    def check(self) -> None:
+        """
+        Checks the budget before starting more work.
+
+        Raises:
+            BudgetExceeded: If any limit has been reached.
+        """
+        reason = self._limit_reached()
+        if reason is not None:
+            self._exceed(reason)
+
+    def _exceed(self, reason: str):
+        with self._lock:
+            self.exceeded = self.exceeded or reason
+        raise BudgetExceeded(f"The run exceeded its {self.exceeded} budget")
+
+    def charge(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """
+        Adds the usage of an LLM call to the budget.
+
+        Args:
+            model (str): The model used.
+            prompt_tokens (int): The prompt tokens of the call.
+            completion_tokens (int): The completion tokens of the call.
+        """
+        prompt_price, completion_price = self.prices.get(model, (0.0, 0.0))
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost += (
+                prompt_tokens * prompt_price + completion_tokens * completion_price
+            ) / 1_000_000
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Calls a function (e.g. a tool) within the remaining time.
+
+        Python threads can't be killed, so a function that times out keeps running in a
+        daemon thread, but the run stops waiting for it.
+
+        Args:
+            fn (Callable): The function to call.
+            *args: The positional arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            BudgetExceeded: If the budget is exhausted before or during the call.
+        """
+        self.check()
+        if self.deadline is None:
+            return fn(*args, **kwargs)
+
+        result: dict = {}
+
+        def target():
+            try:
+                result["value"] = fn(*args, **kwargs)
+            except BaseException as e:
+                result["error"] = e
+
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(target,), daemon=True)
+        thread.start()
+        thread.join(self.remaining_time())
+
+        if thread.is_alive():
+            self._exceed("deadline")
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
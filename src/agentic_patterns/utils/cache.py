@@ -0,0 +1,258 @@
+import hashlib
+import random
+import re
+import threading
+from collections import defaultdict
+from collections import OrderedDict
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+# Mersenne prime used as the modulus of the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes a text so trivial differences (case, punctuation, spacing) don't matter.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text.
+    """
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def shingles(text: str, size: int = 4) -> set[str]:
+    """
+    Splits a normalized text into overlapping character n-grams.
+
+    Args:
+        text (str): The normalized text.
+        size (int, optional): The n-gram size. Defaults to 4.
+
+    Returns:
+        set[str]: The set of shingles.
+    """
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def namespace_key(*parts: str) -> str:
+    """
+    Builds a short, stable namespace from any number of strings (e.g. an agent name and its
+    system prompt), so agents configured differently never share cached answers.
+
+    Args:
+        *parts (str): The strings identifying the namespace.
+
+    Returns:
+        str: The namespace key.
+    """
+    digest = hashlib.blake2b("\x1f".join(parts).encode(), digest_size=8).hexdigest()
+    return f"{parts[0]}:{digest}" if parts else digest
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures, whose fraction of equal positions estimates the Jaccard
+    similarity of the underlying shingle sets.
+
+    Attributes:
+        num_perm (int): The number of hash permutations (signature length).
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, items: set[str]) -> tuple[int, ...]:
+        """
+        Computes the MinHash signature of a set of shingles.
+
+        Args:
+            items (set[str]): The shingles.
+
+        Returns:
+            tuple[int, ...]: The signature.
+        """
+        hashes = [
+            int.from_bytes(
+                hashlib.blake2b(item.encode(), digest_size=4).digest(), "little"
+            )
+            for item in items
+        ]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+
+def estimate_similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    """
+    Estimates the Jaccard similarity of two texts from their MinHash signatures.
+    """
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class _Namespace:
+    def __init__(self):
+        # normalized text -> (signature, answer), in least recently used order
+        self.entries: OrderedDict = OrderedDict()
+        # (band, band values) -> normalized texts sharing that band
+        self.buckets: dict = defaultdict(set)
+
+
+class SemanticCache:
+    """
+    A two-tier cache of final agent answers, keyed on the input text.
+
+    The first tier is an exact match on the normalized text. The second tier finds near-duplicate
+    inputs (e.g. paraphrases) using MinHash signatures over character shingles, indexed with
+    locality sensitive hashing (LSH) so a lookup only compares against a handful of candidates.
+    Everything runs locally, no embedding service is needed.
+
+    Entries live in namespaces (typically one per agent configuration) and each namespace is
+    bounded, evicting the least recently used entries first.
+
+    Attributes:
+        threshold (float): The minimum estimated similarity for a near-duplicate hit.
+        bands (int): The number of LSH bands. More bands find less similar candidates.
+        shingle_size (int): The size of the character shingles.
+        max_entries (int): The maximum number of entries per namespace.
+        stats (dict): Counters for exact hits, similar hits and misses.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 4,
+        max_entries: int = 1024,
+        seed: int = 1,
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("`num_perm` must be a multiple of `bands`")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0}
+
+        self._hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self._namespaces: dict[str, _Namespace] = defaultdict(_Namespace)
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: tuple[int, ...]) -> list[tuple]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _signature(self, key: str) -> tuple[int, ...]:
+        return self._hasher.signature(shingles(key, self.shingle_size))
+
+    def get(self, text: str, namespace: str = "default") -> str | None:
+        """
+        Looks up the answer stored for the given text, or for a near-duplicate of it.
+
+        Args:
+            text (str): The input text (e.g. the user message).
+            namespace (str, optional): The cache namespace. Defaults to 'default'.
+
+        Returns:
+            str | None: The cached answer, or None on a miss.
+        """
+        key = normalize_text(text)
+
+        with self._lock:
+            space = self._namespaces.get(namespace)
+            if space is None:
+                self.stats["misses"] += 1
+                return None
+
+            if key in space.entries:
+                space.entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return space.entries[key][1]
+
+        signature = self._signature(key)
+
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates |= space.buckets.get(band_key, set())
+
+            best_key, best_similarity = None, self.threshold
+            for candidate in candidates:
+                similarity = estimate_similarity(signature, space.entries[candidate][0])
+                if similarity >= best_similarity:
+                    best_key, best_similarity = candidate, similarity
+
+            if best_key is None:
+                self.stats["misses"] += 1
+                return None
+
+            space.entries.move_to_end(best_key)
+            self.stats["similar_hits"] += 1
+            return space.entries[best_key][1]
+
+    def put(self, text: str, answer: str, namespace: str = "default") -> None:
+        """
+        Stores the final answer for the given text.
+
+        Args:
+            text (str): The input text (e.g. the user message).
+            answer (str): The final answer to cache.
+            namespace (str, optional): The cache namespace. Defaults to 'default'.
+        """
+        key = normalize_text(text)
+        signature = self._signature(key)
+
+        with self._lock:
+            space = self._namespaces[namespace]
+            if key in space.entries:
+                space.entries[key] = (signature, answer)
+                space.entries.move_to_end(key)
+                return
+
+            space.entries[key] = (signature, answer)
+            for band_key in self._band_keys(signature):
+                space.buckets[band_key].add(key)
+
+            while len(space.entries) > self.max_entries:
+                self._evict_oldest(space)
+
+    def _evict_oldest(self, space: _Namespace) -> None:
+        key, (signature, _) = space.entries.popitem(last=False)
+        for band_key in self._band_keys(signature):
+            bucket = space.buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del space.buckets[band_key]
+
+    def clear(self, namespace: str | None = None) -> None:
+        """
+        Removes all the entries of a namespace, or of every namespace.
+
+        Args:
+            namespace (str | None, optional): The namespace to clear. Defaults to all of them.
+        """
+        with self._lock:
+            if namespace is None:
+                self._namespaces.clear()
+            else:
+                self._namespaces.pop(namespace, None)
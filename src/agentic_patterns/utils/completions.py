@@ -1,4 +1,147 @@
-def completions_create(client, messages: list, model: str) -> str:
+from types import SimpleNamespace
+from typing import Callable
+
+from agentic_patterns.utils.budget import Budget
+from agentic_patterns.utils.messages import intern_message
+from agentic_patterns.utils.messages import INTERNED_ROLES
+from agentic_patterns.utils.messages import Message
+from agentic_patterns.utils.messages import to_api_messages
+from agentic_patterns.utils.profiling import PromptProfiler
+from agentic_patterns.utils.tokens import estimate_tokens
+
+
+def _stream_chat_completion(
+    client,
+    messages: list,
+    model: str,
+    on_token: Callable[[str], None],
+    budget: Budget | None = None,
+    **kwargs,
+):
+    """
+    Streams a completion, forwarding every content delta to `on_token`, and rebuilds the
+    complete message (content, tool calls and usage) from the chunks. The stream is closed as
+    soon as the budget deadline passes.
+    """
+    stream = client.chat.completions.create(
+        messages=messages, model=model, stream=True, **kwargs
+    )
+
+    content: list[str] = []
+    tool_calls: dict[int, SimpleNamespace] = {}
+    usage = None
+
+    for chunk in stream:
+        if budget is not None and budget.exhausted:
+            getattr(stream, "close", lambda: None)()
+            budget.check()
+
+        # Groq reports the usage of streamed requests in the `x_groq` extension
+        usage = getattr(chunk, "usage", None) or getattr(
+            getattr(chunk, "x_groq", None), "usage", None
+        )
+        if not chunk.choices:
+            continue
+
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content.append(delta.content)
+            on_token(delta.content)
+
+        for tool_call_delta in getattr(delta, "tool_calls", None) or []:
+            tool_call = tool_calls.setdefault(
+                tool_call_delta.index,
+                SimpleNamespace(
+                    id=None,
+                    type="function",
+                    function=SimpleNamespace(name="", arguments=""),
+                ),
+            )
+            tool_call.id = tool_call_delta.id or tool_call.id
+            if tool_call_delta.function is not None:
+                tool_call.function.name += tool_call_delta.function.name or ""
+                tool_call.function.arguments += tool_call_delta.function.arguments or ""
+
+    message = SimpleNamespace(
+        role="assistant",
+        content="".join(content),
+        tool_calls=[tool_calls[i] for i in sorted(tool_calls)] or None,
+    )
+    return message, usage
+
+
+def chat_completion_create(
+    client,
+    messages: list,
+    model: str,
+    on_token: Callable[[str], None] | None = None,
+    budget: Budget | None = None,
+    **kwargs,
+):
+    """
+    Sends a request to the client's `completions.create` method and returns the whole message,
+    which is needed when the response carries structured data (e.g. native `tool_calls`).
+
+    When a budget is given, the request is only sent if the budget isn't exhausted, its timeout
+    is capped to the time left before the deadline, and its usage is charged to the budget.
+
+    Args:
+        client (Groq): The Groq client object
+        messages (list[dict]): A list of message objects containing chat history for the model.
+        model (str): The model to use for generating tool calls and responses.
+        on_token (Callable[[str], None] | None, optional): If given, the completion is streamed
+            and every content delta is passed to this callback as soon as it arrives.
+        budget (Budget | None, optional): The deadline and token / cost budget of the run.
+        **kwargs: Extra request parameters (e.g. `tools`) forwarded to the client.
+
+    Returns:
+        The message object of the first choice of the model's response.
+
+    Raises:
+        BudgetExceeded: If the budget is exhausted before or while the request is served.
+    """
+    # Messages are only converted to the API format when they are sent
+    messages = to_api_messages(messages)
+
+    if budget is not None:
+        budget.check()
+        if budget.deadline is not None:
+            kwargs["timeout"] = budget.remaining_time()
+
+    try:
+        if on_token is None:
+            response = client.chat.completions.create(
+                messages=messages, model=model, **kwargs
+            )
+            message = response.choices[0].message
+            usage = getattr(response, "usage", None)
+        else:
+            message, usage = _stream_chat_completion(
+                client, messages, model, on_token, budget, **kwargs
+            )
+    except Exception:
+        # A request cut by the deadline is reported as such, not as a client error
+        if budget is not None:
+            budget.check()
+        raise
+
+    if budget is not None:
+        budget.charge(
+            model,
+            getattr(usage, "prompt_tokens", None)
+            or sum(estimate_tokens(str(m.get("content") or "")) for m in messages),
+            getattr(usage, "completion_tokens", None)
+            or estimate_tokens(str(message.content or "")),
+        )
+
+    profiler = PromptProfiler.current()
+    if profiler is not None:
+        profiler.record(messages, model, kwargs.get("tools"), usage)
+
+    return message
+
+
+def completions_create(client, messages: list, model: str, **kwargs) -> str:
     """
     Sends a request to the client's `completions.create` method to interact with the language model.
 
@@ -6,28 +149,32 @@ def completions_create(client, messages: list, model: str) -> str:
         client (Groq): The Groq client object
         messages (list[dict]): A list of message objects containing chat history for the model.
         model (str): The model to use for generating tool calls and responses.
+        **kwargs: Extra request parameters forwarded to the client.
 
     Returns:
         str: The content of the model's response.
     """
-    response = client.chat.completions.create(messages=messages, model=model)
-    return str(response.choices[0].message.content)
+    return str(chat_completion_create(client, messages, model, **kwargs).content)
 
 
-def build_prompt_structure(prompt: str, role: str, tag: str = "") -> dict:
+def build_prompt_structure(prompt: str, role: str, tag: str = "") -> Message:
     """
     Builds a structured prompt that includes the role and content.
 
+    System prompts are interned, so every history using the same one shares a single message.
+
     Args:
         prompt (str): The actual content of the prompt.
         role (str): The role of the speaker (e.g., user, assistant).
 
     Returns:
-        dict: A dictionary representing the structured prompt.
+        Message: An immutable message representing the structured prompt.
     """
     if tag:
         prompt = f"<{tag}>{prompt}</{tag}>"
-    return {"role": role, "content": prompt}
+    if role in INTERNED_ROLES:
+        return intern_message(role, prompt)
+    return Message(role, prompt)
 
 
 def update_chat_history(history: list, msg: str, role: str):
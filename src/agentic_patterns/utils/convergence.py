@@ -0,0 +1,200 @@
+import re
+
+from agentic_patterns.utils.extraction import extract_tag_content
+
+_WORDS = re.compile(r"\w+|[^\w\s]")
+
+EDIT = "edit"
+NGRAM = "ngram"
+
+METRICS = (EDIT, NGRAM)
+
+MAX_SEVERITY = 10
+
+
+def words(text: str) -> list[str]:
+    """
+    Splits a text into lowercase words and punctuation marks.
+    """
+    return _WORDS.findall(text.lower())
+
+
+def ngram_similarity(text_a: str, text_b: str, n: int = 3) -> float:
+    """
+    Computes the Jaccard similarity between the word n-grams of two texts.
+
+    Args:
+        text_a (str): The first text.
+        text_b (str): The second text.
+        n (int, optional): The n-gram size. Defaults to 3.
+
+    Returns:
+        float: The similarity, between 0 (nothing in common) and 1 (same n-grams).
+    """
+    words_a, words_b = words(text_a), words(text_b)
+    ngrams_a = {tuple(words_a[i : i + n]) for i in range(max(1, len(words_a) - n + 1))}
+    ngrams_b = {tuple(words_b[i : i + n]) for i in range(max(1, len(words_b) - n + 1))}
+    union = ngrams_a | ngrams_b
+    return len(ngrams_a & ngrams_b) / len(union) if union else 1.0
+
+
+def normalized_edit_distance(text_a: str, text_b: str) -> float:
+    """
+    Computes the word-level Levenshtein distance between two texts, divided by the length
+    of the longest one.
+
+    Args:
+        text_a (str): The first text.
+        text_b (str): The second text.
+
+    Returns:
+        float: The distance, between 0 (same words) and 1 (nothing in common).
+    """
+    words_a, words_b = words(text_a), words(text_b)
+    if len(words_a) < len(words_b):
+        words_a, words_b = words_b, words_a
+    if not words_a:
+        return 0.0
+
+    previous = list(range(len(words_b) + 1))
+    for i, word_a in enumerate(words_a, start=1):
+        current = [i]
+        for j, word_b in enumerate(words_b, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (word_a != word_b),
+                )
+            )
+        previous = current
+    return previous[-1] / len(words_a)
+
+
+def draft_similarity(text_a: str, text_b: str, metric: str = NGRAM) -> float:
+    """
+    Computes how similar two consecutive drafts are.
+
+    Args:
+        text_a (str): The previous draft.
+        text_b (str): The new draft.
+        metric (str, optional): 'ngram' (word trigram Jaccard similarity, linear time) or 'edit'
+            (1 - normalized word edit distance, quadratic time). Defaults to 'ngram'.
+
+    Returns:
+        float: The similarity, between 0 and 1.
+    """
+    if metric == NGRAM:
+        return ngram_similarity(text_a, text_b)
+    if metric == EDIT:
+        return 1 - normalized_edit_distance(text_a, text_b)
+    raise ValueError(f"Unknown metric '{metric}'. Expected one of {METRICS}")
+
+
+def parse_severity(critique: str) -> int | None:
+    """
+    Reads the `<severity></severity>` score (0 to 10) of a critique.
+
+    Args:
+        critique (str): The critique.
+
+    Returns:
+        int | None: The severity, or None if the critique doesn't have a valid one.
+    """
+    severity = extract_tag_content(critique, "severity")
+    if not severity.found:
+        return None
+    match = re.search(r"\d+", severity.content[0])
+    return min(int(match.group()), MAX_SEVERITY) if match else None
+
+
+class ConvergenceMonitor:
+    """
+    Decides when a generate-reflect loop has stopped improving.
+
+    The loop has converged when two consecutive drafts are nearly identical, when the critique
+    severity is low enough, or when the severity hasn't decreased for `patience` rounds.
+
+    Attributes:
+        similarity_threshold (float | None): The draft similarity above which the loop stops.
+            None disables the check.
+        max_severity (int | None): The critique severity at or below which the loop stops.
+            None disables the check.
+        patience (int | None): The number of rounds without a lower severity after which
+            the loop stops. None disables the check.
+        metric (str): The draft similarity metric ('ngram' or 'edit').
+        similarities (list[float]): The similarity of every draft with the previous one.
+        severities (list[int | None]): The severity of every critique.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float | None = 0.9,
+        max_severity: int | None = 1,
+        patience: int | None = 2,
+        metric: str = NGRAM,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Expected one of {METRICS}")
+
+        self.similarity_threshold = similarity_threshold
+        self.max_severity = max_severity
+        self.patience = patience
+        self.metric = metric
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forgets the drafts and critiques seen so far, before a new run.
+        """
+        self.similarities: list[float] = []
+        self.severities: list[int | None] = []
+        self._previous_draft: str | None = None
+
+    def add_draft(self, draft: str) -> str | None:
+        """
+        Records a new draft.
+
+        Args:
+            draft (str): The new draft.
+
+        Returns:
+            str | None: The reason to stop, if the draft barely changed.
+        """
+        previous, self._previous_draft = self._previous_draft, draft
+        if previous is None:
+            return None
+
+        similarity = draft_similarity(previous, draft, self.metric)
+        self.similarities.append(similarity)
+        if (
+            self.similarity_threshold is not None
+            and similarity >= self.similarity_threshold
+        ):
+            return f"the draft barely changed (similarity {similarity:.2f})"
+        return None
+
+    def add_critique(self, critique: str) -> str | None:
+        """
+        Records a new critique.
+
+        Args:
+            critique (str): The new critique.
+
+        Returns:
+            str | None: The reason to stop, if the critique is minor or the severity stalled.
+        """
+        severity = parse_severity(critique)
+        self.severities.append(severity)
+        if severity is None:
+            return None
+
+        if self.max_severity is not None and severity <= self.max_severity:
+            return f"the critique is minor (severity {severity})"
+
+        scores = [s for s in self.severities if s is not None]
+        if self.patience is not None and len(scores) > self.patience:
+            best_before = min(scores[: -self.patience])
+            if min(scores[-self.patience :]) >= best_before:
+                return f"the severity stopped decreasing ({scores[-1]})"
+        return None
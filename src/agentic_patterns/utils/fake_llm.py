@@ -0,0 +1,163 @@
+import itertools
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable
+
+from agentic_patterns.utils.tokens import estimate_tokens
+
+
+class FakeLLMClient:
+    """
+    A local stand-in for the Groq client, useful for benchmarks and offline experiments.
+
+    It exposes the same `client.chat.completions.create(...)` entry point used by the agents,
+    but the answers come from a `responder` callable instead of a real model. The responder
+    receives the request (messages, model and extra parameters) and returns either the text
+    content of the answer or a dict with `content` and `tool_calls` keys, where each tool call
+    is a dict with `name` and `arguments`.
+
+    Attributes:
+        responder (Callable): The function producing the answers.
+        latency (float | Callable): Seconds to sleep before answering, or a callable returning them.
+        requests (list[dict]): Every request received, in order.
+        prompt_tokens (int): Approximate number of prompt tokens received so far.
+        completion_tokens (int): Approximate number of completion tokens returned so far.
+        server_time (float): Seconds spent inside `create`, so benchmarks can subtract it.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[..., str | dict] | None = None,
+        latency: float | Callable[[], float] = 0.0,
+    ):
+        self.responder = responder or (lambda messages, model, **kwargs: "<OK>")
+        self.latency = latency
+        self.requests: list[dict] = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.server_time = 0.0
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages: list, model: str, **kwargs):
+        """
+        Mimics `client.chat.completions.create`.
+
+        Args:
+            messages (list[dict]): The chat history sent to the model.
+            model (str): The model name.
+            **kwargs: Extra request parameters (e.g. `tools`, `stream`, `timeout`).
+
+        Returns:
+            An object shaped like a chat completions response, or an iterator of chunks
+            when `stream=True`.
+
+        Raises:
+            TimeoutError: If the latency is longer than the request `timeout`.
+        """
+        start = time.perf_counter()
+        timeout = kwargs.pop("timeout", None)
+        with self._lock:
+            self.requests.append({"messages": list(messages), "model": model, **kwargs})
+
+        latency = self.latency() if callable(self.latency) else self.latency
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            with self._lock:
+                self.server_time += time.perf_counter() - start
+            raise TimeoutError("Request timed out.")
+        if latency:
+            time.sleep(latency)
+
+        answer = self.responder(messages, model, **kwargs)
+        if isinstance(answer, str):
+            answer = {"content": answer}
+
+        tool_calls = [
+            SimpleNamespace(
+                id=f"call_{next(self._ids)}",
+                type="function",
+                function=SimpleNamespace(
+                    name=tool_call["name"],
+                    arguments=json.dumps(tool_call.get("arguments", {})),
+                ),
+            )
+            for tool_call in answer.get("tool_calls", [])
+        ]
+        message = SimpleNamespace(
+            role="assistant",
+            content=answer.get("content"),
+            tool_calls=tool_calls or None,
+        )
+
+        prompt_tokens = _estimate_request_tokens(messages, kwargs.get("tools"))
+        completion_tokens = _estimate_request_tokens(
+            [{"content": message.content or ""}],
+            [tool_call.function.arguments for tool_call in tool_calls],
+        )
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.server_time += time.perf_counter() - start
+
+        if kwargs.get("stream"):
+            return self._stream(message, usage)
+
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage,
+        )
+
+    @staticmethod
+    def _stream(message, usage):
+        """
+        Yields the message as streaming chunks: one per word of content, then one per tool
+        call, and a last chunk carrying the usage.
+        """
+        for piece in re.findall(r"\S+\s*|\s+", message.content or ""):
+            yield SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        delta=SimpleNamespace(content=piece, tool_calls=None),
+                        finish_reason=None,
+                    )
+                ],
+                usage=None,
+            )
+
+        for index, tool_call in enumerate(message.tool_calls or []):
+            tool_call_delta = SimpleNamespace(
+                index=index, id=tool_call.id, function=tool_call.function
+            )
+            yield SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        delta=SimpleNamespace(
+                            content=None, tool_calls=[tool_call_delta]
+                        ),
+                        finish_reason=None,
+                    )
+                ],
+                usage=None,
+            )
+
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+def _estimate_request_tokens(messages: list, tools: list | None = None) -> int:
+    n_tokens = sum(
+        estimate_tokens(str(message.get("content") or "")) for message in messages
+    )
+    if tools:
+        n_tokens += estimate_tokens(json.dumps(tools))
+    return n_tokens
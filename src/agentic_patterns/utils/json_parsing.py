@@ -0,0 +1,154 @@
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, the standard library parser is used without it
+    orjson = None
+
+
+_FENCE = re.compile(r"^```[\w-]*\s*|\s*```$")
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class TruncatedJSONError(ValueError):
+    """
+    Raised when a JSON document ends in the middle of a string, object or array, e.g. because
+    the model output was cut off by the token limit. Such documents are never completed, since
+    their values (and the tool calls using them) may be truncated.
+    """
+
+
+def loads(text: str):
+    """
+    Parses a strict JSON document, with orjson when it's installed.
+
+    Args:
+        text (str): The JSON document.
+
+    Returns:
+        The parsed value.
+
+    Raises:
+        ValueError: If the document isn't valid JSON (`json.JSONDecodeError` is a subclass).
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _drop_trailing_comma(chunks: list[str]) -> None:
+    i = len(chunks) - 1
+    while i >= 0 and chunks[i].isspace():
+        i -= 1
+    if i >= 0 and chunks[i] == ",":
+        del chunks[i]
+
+
+def repair_json(text: str) -> str:
+    """
+    Fixes the most common mistakes LLMs make when writing JSON: markdown code fences, text
+    around the object, single quoted strings, unquoted keys, Python literals (True, False, None),
+    trailing commas and raw newlines inside strings.
+
+    Args:
+        text (str): The malformed JSON document.
+
+    Returns:
+        str: The repaired document. It's not guaranteed to be valid JSON.
+
+    Raises:
+        TruncatedJSONError: If the document ends before its strings and brackets are closed.
+    """
+    text = _FENCE.sub("", text.strip())
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return text
+    text = text[min(starts) :]
+
+    chunks: list[str] = []
+    stack: list[str] = []
+    quote = None
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        if quote is not None:
+            if char == "\\" and i + 1 < n:
+                # \' is not a JSON escape, the quote doesn't need escaping anymore
+                escaped = text[i + 1]
+                chunks.append(escaped if escaped == "'" else char + escaped)
+                i += 2
+                continue
+            if char == quote:
+                quote = None
+                chunks.append('"')
+            elif char == '"':
+                chunks.append('\\"')
+            elif char == "\n":
+                chunks.append("\\n")
+            else:
+                chunks.append(char)
+        elif char in "\"'":
+            quote = char
+            chunks.append('"')
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+            chunks.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(chunks)
+            chunks.append(char)
+            if stack:
+                stack.pop()
+            if not stack:
+                # Anything after the top-level value is ignored
+                break
+        elif char.isalpha() or char == "_":
+            end = i
+            while end < n and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[i:end]
+            colon = end
+            while colon < n and text[colon].isspace():
+                colon += 1
+            if colon < n and text[colon] == ":":
+                chunks.append(f'"{word}"')
+            else:
+                chunks.append(_LITERALS.get(word, word))
+            i = end
+            continue
+        else:
+            chunks.append(char)
+        i += 1
+
+    if quote is not None or stack:
+        raise TruncatedJSONError("The JSON document is cut off before its end")
+    return "".join(chunks)
+
+
+def lenient_loads(text: str):
+    """
+    Parses a JSON document written by an LLM. Valid documents take the fast strict path, the
+    others are repaired with `repair_json` and parsed again.
+
+    Args:
+        text (str): The JSON document.
+
+    Returns:
+        The parsed value.
+
+    Raises:
+        TruncatedJSONError: If the document is cut off before its end.
+        ValueError: The error of the strict parser, if the document can't be repaired.
+    """
+    try:
+        return loads(text)
+    except ValueError as e:
+        error = e
+
+    repaired = repair_json(text)
+    try:
+        return loads(repaired)
+    except ValueError:
+        raise error from None
@@ -0,0 +1,122 @@
+import threading
+import weakref
+from collections.abc import Mapping
+
+_FIELDS = ("role", "content", "tool_calls", "tool_call_id")
+
+# Roles whose messages are usually identical across sessions (system prompts, including the
+# tool signatures they embed), so a single instance is shared by every history using them
+INTERNED_ROLES = frozenset({"system"})
+
+
+class Message(Mapping):
+    """
+    A compact, immutable chat message.
+
+    Messages use `__slots__` instead of a per-instance `dict`, so they take a fraction of the
+    memory of the plain dict messages, and being immutable they can be shared between histories
+    (and between sessions) without copying. They still behave like read-only dicts
+    (`message["role"]`, `message.get("content")`), and are converted to the API format with
+    `to_dict` only when they are sent.
+
+    Attributes:
+        role (str): The role of the message author (e.g. system, user, assistant, tool).
+        content (str): The content of the message.
+        tool_calls (tuple[dict, ...] | None): The native tool calls requested by an assistant message.
+        tool_call_id (str | None): The id of the tool call a tool message answers.
+    """
+
+    __slots__ = (*_FIELDS, "__weakref__")
+
+    def __init__(
+        self,
+        role: str,
+        content: str,
+        tool_calls: tuple[dict, ...] | None = None,
+        tool_call_id: str | None = None,
+    ):
+        object.__setattr__(self, "role", role)
+        object.__setattr__(self, "content", content)
+        object.__setattr__(
+            self, "tool_calls", tuple(tool_calls) if tool_calls else None
+        )
+        object.__setattr__(self, "tool_call_id", tool_call_id)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Message objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Message objects are immutable")
+
+    def __getitem__(self, key: str):
+        value = getattr(self, key, None) if key in _FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (field for field in _FIELDS if getattr(self, field) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"Message({fields})"
+
+    def __reduce__(self):
+        return Message, tuple(getattr(self, field) for field in _FIELDS)
+
+    def to_dict(self) -> dict:
+        """
+        Serializes the message to the chat completions API format.
+
+        Returns:
+            dict: The message as a dict.
+        """
+        message = {key: value for key, value in self.items()}
+        if self.tool_calls:
+            message["tool_calls"] = list(self.tool_calls)
+        return message
+
+
+_interned: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_interned_lock = threading.Lock()
+
+
+def intern_message(role: str, content: str) -> Message:
+    """
+    Returns the shared Message with the given role and content, creating it if needed.
+    The shared instance lives as long as some history uses it.
+
+    Args:
+        role (str): The role of the message.
+        content (str): The content of the message.
+
+    Returns:
+        Message: The shared message.
+    """
+    key = (role, content)
+    with _interned_lock:
+        message = _interned.get(key)
+        if message is None:
+            message = Message(role, content)
+            _interned[key] = message
+        return message
+
+
+def to_api_messages(messages: list) -> list[dict]:
+    """
+    Serializes a list of messages to the chat completions API format. Plain dict messages
+    are passed through unchanged.
+
+    Args:
+        messages (list[Message | dict]): The messages.
+
+    Returns:
+        list[dict]: The messages as dicts.
+    """
+    return [
+        message.to_dict() if isinstance(message, Message) else message
+        for message in messages
+    ]
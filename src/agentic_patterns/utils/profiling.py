@@ -0,0 +1,283 @@
+import contextvars
+import json
+import re
+import threading
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+
+from colorama import Fore
+
+from agentic_patterns.utils.logging import fancy_print
+from agentic_patterns.utils.tokens import estimate_tokens
+
+
+SYSTEM = "system"
+TOOLS = "tools"
+CONTEXT = "context"
+USER = "user"
+HISTORY = "history"
+OBSERVATIONS = "observations"
+
+SEGMENTS = (SYSTEM, TOOLS, CONTEXT, USER, HISTORY, OBSERVATIONS)
+
+DEFAULT_AGENT = "default"
+
+_TOOLS_BLOCK = re.compile(r"<tools>.*?</tools>", re.DOTALL)
+_CONTEXT_BLOCK = re.compile(r"<context>.*?</context>", re.DOTALL)
+
+# The active profiler and agent label of the current thread or asyncio task
+_current_profiler: contextvars.ContextVar["PromptProfiler | None"] = (
+    contextvars.ContextVar("current_profiler", default=None)
+)
+_current_agent: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_agent", default=DEFAULT_AGENT
+)
+# The tokens to restore the enclosing profilers on exit
+_profiler_tokens: contextvars.ContextVar[tuple] = contextvars.ContextVar(
+    "profiler_tokens", default=()
+)
+
+
+class _CurrentProfilerAlias:
+    # The former `PromptProfiler.current_profiler` class attribute
+    def __get__(self, instance, owner) -> "PromptProfiler | None":
+        warnings.warn(
+            "PromptProfiler.current_profiler is deprecated, "
+            "use PromptProfiler.current() instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return _current_profiler.get()
+
+
+def _split_block(text: str, pattern: re.Pattern) -> tuple[str, str]:
+    """
+    Splits a text into the content matched by `pattern` and the rest of the text.
+    """
+    blocks = pattern.findall(text)
+    return "".join(blocks), pattern.sub("", text)
+
+
+def _requests_tools(message: dict) -> bool:
+    if message["role"] != "assistant":
+        return False
+    return bool(message.get("tool_calls")) or "<tool_call>" in str(
+        message.get("content") or ""
+    )
+
+
+def segment_messages(messages: list, tools: list | None = None) -> dict[str, int]:
+    """
+    Breaks an outgoing `messages` list into labelled segments and estimates their tokens.
+
+    The segments are:
+        - system: the system prompt, without the tool block.
+        - tools: the `<tools></tools>` block of the system prompt, or the native `tools` parameter.
+        - context: the `<context></context>` block that crew agents receive from their dependencies.
+        - user: the first user message (the task), without the context block.
+        - history: any later assistant or user messages (drafts, critiques, thoughts, tool calls).
+        - observations: the tool results sent back to the model.
+
+    Args:
+        messages (list[dict]): The messages sent to the model.
+        tools (list | None): The native `tools` parameter, if any.
+
+    Returns:
+        dict[str, int]: A dictionary mapping each segment to its estimated number of tokens.
+    """
+    segments = dict.fromkeys(SEGMENTS, 0)
+    seen_user = False
+    previous = None
+
+    for message in messages:
+        role = message["role"]
+        content = str(message.get("content") or "")
+
+        if role == "system":
+            tools_block, content = _split_block(content, _TOOLS_BLOCK)
+            segments[TOOLS] += estimate_tokens(tools_block)
+            segments[SYSTEM] += estimate_tokens(content)
+        elif role == "tool" or (
+            role == "user" and previous is not None and _requests_tools(previous)
+        ):
+            segments[OBSERVATIONS] += estimate_tokens(content)
+        elif role == "user" and not seen_user:
+            seen_user = True
+            context_block, content = _split_block(content, _CONTEXT_BLOCK)
+            segments[CONTEXT] += estimate_tokens(context_block)
+            segments[USER] += estimate_tokens(content)
+        else:
+            segments[HISTORY] += estimate_tokens(content)
+            if message.get("tool_calls"):
+                segments[HISTORY] += estimate_tokens(json.dumps(message["tool_calls"]))
+
+        previous = message
+
+    if tools:
+        segments[TOOLS] += estimate_tokens(json.dumps(tools))
+
+    return segments
+
+
+class PromptProfiler:
+    """
+    A class that records the size of every prompt sent through `completions_create`.
+
+    Like `Crew`, the profiler is used as a context manager: every completion requested inside
+    the `with` block is broken into labelled segments (see `segment_messages`) and aggregated
+    per agent, so a single profiler wrapped around `crew.run()` gives the breakdown of a whole
+    crew run. The active profiler and agent label are context variables, so concurrent runs
+    in different threads or asyncio tasks are recorded independently.
+
+    Attributes:
+        current_profiler (PromptProfiler | None): Deprecated alias of `PromptProfiler.current()`.
+        records (list[dict]): One record per completion, with the agent, model, segments and
+            (when the provider reports it) the real usage.
+    """
+
+    current_profiler = _CurrentProfilerAlias()
+
+    def __init__(self):
+        self.records: list[dict] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """
+        Enters the context manager, setting this profiler as the active one.
+
+        Returns:
+            PromptProfiler: The current PromptProfiler instance.
+        """
+        _profiler_tokens.set((*_profiler_tokens.get(), _current_profiler.set(self)))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Exits the context manager, restoring the previously active profiler.
+        """
+        *tokens, token = _profiler_tokens.get()
+        _profiler_tokens.set(tuple(tokens))
+        _current_profiler.reset(token)
+
+    @staticmethod
+    def current() -> "PromptProfiler | None":
+        """
+        Returns the active profiler of the current thread or asyncio task.
+
+        Returns:
+            PromptProfiler | None: The active profiler, or None if there isn't one.
+        """
+        return _current_profiler.get()
+
+    @property
+    def current_agent(self) -> str:
+        """
+        The label assigned to the completions being recorded.
+        """
+        return _current_agent.get()
+
+    @contextmanager
+    def agent(self, name: str):
+        """
+        Labels every completion recorded inside the block with the given agent name.
+
+        Args:
+            name (str): The agent name.
+        """
+        token = _current_agent.set(name)
+        try:
+            yield self
+        finally:
+            _current_agent.reset(token)
+
+    def record(
+        self, messages: list, model: str, tools: list | None = None, usage=None
+    ) -> dict:
+        """
+        Records a completion request.
+
+        Args:
+            messages (list[dict]): The messages sent to the model.
+            model (str): The model used.
+            tools (list | None): The native `tools` parameter, if any.
+            usage: The `usage` object returned by the provider, if any.
+
+        Returns:
+            dict: The stored record.
+        """
+        record = {
+            "agent": self.current_agent,
+            "model": model,
+            "segments": segment_messages(messages, tools),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        }
+        with self._lock:
+            self.records.append(record)
+        return record
+
+    def summary(self) -> dict:
+        """
+        Aggregates the records per segment and per agent.
+
+        Returns:
+            dict: A dictionary with the number of calls, the estimated tokens per segment
+                (`segments`), the same breakdown per agent (`agents`) and the real prompt and
+                completion tokens reported by the provider (`usage`).
+        """
+        segments = dict.fromkeys(SEGMENTS, 0)
+        agents: dict = defaultdict(lambda: dict.fromkeys(SEGMENTS, 0))
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+
+        with self._lock:
+            records = list(self.records)
+
+        for record in records:
+            for segment, n_tokens in record["segments"].items():
+                segments[segment] += n_tokens
+                agents[record["agent"]][segment] += n_tokens
+            for key in usage:
+                usage[key] += record[key] or 0
+
+        return {
+            "calls": len(records),
+            "segments": segments,
+            "agents": dict(agents),
+            "usage": usage,
+        }
+
+    def report(self) -> None:
+        """
+        Prints the per-agent breakdown of the estimated prompt tokens.
+        """
+        summary = self.summary()
+        fancy_print(f"PROMPT PROFILE ({summary['calls']} calls)")
+
+        header = f"{'agent':<30}" + "".join(f"{s:>14}" for s in SEGMENTS)
+        print(Fore.CYAN + header)
+        for name, segments in summary["agents"].items():
+            row = f"{name[:29]:<30}" + "".join(f"{segments[s]:>14}" for s in SEGMENTS)
+            print(Fore.WHITE + row)
+        total = f"{'TOTAL':<30}" + "".join(
+            f"{summary['segments'][s]:>14}" for s in SEGMENTS
+        )
+        print(Fore.YELLOW + total)
+
+
+@contextmanager
+def profile_agent(name: str):
+    """
+    Labels the completions made inside the block with the given agent name, if a
+    PromptProfiler is active. Does nothing otherwise.
+
+    Args:
+        name (str): The agent name.
+    """
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield None
+        return
+
+    with profiler.agent(name):
+        yield profiler
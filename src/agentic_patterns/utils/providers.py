@@ -0,0 +1,317 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+from typing import Iterator
+
+import httpx
+from groq import Groq
+
+from agentic_patterns.utils.json_parsing import loads
+
+
+GROQ = "groq"
+OPENAI = "openai"
+
+PROVIDERS = (GROQ, OPENAI)
+
+
+class Provider:
+    """
+    Base class of the LLM backends used by the agents.
+
+    A provider serves chat completions, streamed or not, and keeps track of its usage. It exposes
+    the `chat.completions.create(...)` entry point of the Groq and OpenAI SDKs, so any provider can
+    be passed as the `client` of an agent, or wrapped in a HedgedClient or a FallbackClient.
+
+    Subclasses implement `complete` and `stream`, which return objects shaped like the chat
+    completions API responses and chunks.
+
+    Attributes:
+        name (str): The provider name.
+        model (str | None): If set, it replaces the model requested by the agents, so the same
+            agents can run against the models of another backend without code changes.
+        usage (dict): The number of requests, failed requests, prompt and completion tokens served
+            so far. Streamed requests are counted when the provider reports their usage.
+    """
+
+    name = "provider"
+
+    def __init__(self, model: str | None = None):
+        self.model = model
+        self.usage = {
+            "requests": 0,
+            "errors": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def complete(self, messages: list[dict], model: str, **kwargs):
+        """
+        Requests a chat completion.
+
+        Args:
+            messages (list[dict]): The chat history, in the API format.
+            model (str): The model name.
+            **kwargs: Extra request parameters (e.g. `tools`, `timeout`).
+
+        Returns:
+            An object shaped like a chat completions response.
+        """
+        raise NotImplementedError
+
+    def stream(self, messages: list[dict], model: str, **kwargs) -> Iterator:
+        """
+        Requests a streamed chat completion.
+
+        Args:
+            messages (list[dict]): The chat history, in the API format.
+            model (str): The model name.
+            **kwargs: Extra request parameters (e.g. `tools`, `timeout`).
+
+        Returns:
+            Iterator: The chunks, shaped like chat completions chunks. The last one carries the usage.
+        """
+        raise NotImplementedError
+
+    def create(self, messages: list[dict], model: str, stream: bool = False, **kwargs):
+        """
+        Mimics `client.chat.completions.create`, recording the usage of every request.
+
+        Args:
+            messages (list[dict]): The chat history, in the API format.
+            model (str): The requested model, replaced by `self.model` if set.
+            stream (bool, optional): Whether to stream the completion. Defaults to False.
+            **kwargs: Extra request parameters.
+
+        Returns:
+            The response, or an iterator of chunks when `stream=True`.
+        """
+        model = self.model or model
+        self._add(requests=1)
+        if stream:
+            # Some backends send the request before the first chunk is read (e.g. the Groq SDK),
+            # so their connection errors are raised here rather than while iterating
+            try:
+                chunks = self.stream(messages, model, **kwargs)
+            except Exception:
+                self._add(errors=1)
+                raise
+            return self._track_stream(chunks)
+
+        try:
+            response = self.complete(messages, model, **kwargs)
+        except Exception:
+            self._add(errors=1)
+            raise
+        self._add_usage(getattr(response, "usage", None))
+        return response
+
+    def _track_stream(self, chunks):
+        usage = None
+        try:
+            for chunk in chunks:
+                # Groq reports the usage of streamed requests in the `x_groq` extension
+                usage = (
+                    getattr(chunk, "usage", None)
+                    or getattr(getattr(chunk, "x_groq", None), "usage", None)
+                    or usage
+                )
+                yield chunk
+        except Exception:
+            self._add(errors=1)
+            raise
+        finally:
+            getattr(chunks, "close", lambda: None)()
+            self._add_usage(usage)
+
+    def _add_usage(self, usage) -> None:
+        if usage is not None:
+            self._add(
+                prompt_tokens=getattr(usage, "prompt_tokens", None) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", None) or 0,
+            )
+
+    def _add(self, **counts: int) -> None:
+        with self._lock:
+            for key, count in counts.items():
+                self.usage[key] += count
+
+
+class GroqProvider(Provider):
+    """
+    Serves the completions with the Groq SDK (or any client with the same interface, like the
+    FakeLLMClient).
+
+    Attributes:
+        client: The Groq client.
+    """
+
+    name = GROQ
+
+    def __init__(self, client=None, model: str | None = None, **client_kwargs):
+        super().__init__(model)
+        self.client = client or Groq(**client_kwargs)
+
+    def complete(self, messages: list[dict], model: str, **kwargs):
+        return self.client.chat.completions.create(
+            messages=messages, model=model, **kwargs
+        )
+
+    def stream(self, messages: list[dict], model: str, **kwargs) -> Iterator:
+        return self.client.chat.completions.create(
+            messages=messages, model=model, stream=True, **kwargs
+        )
+
+
+class _Record(SimpleNamespace):
+    # Fields missing from a JSON payload (e.g. the `id` of later tool call deltas) read as None
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+
+def _to_record(value):
+    if isinstance(value, dict):
+        return _Record(**{key: _to_record(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_to_record(item) for item in value]
+    return value
+
+
+class OpenAICompatibleProvider(Provider):
+    """
+    Serves the completions from any server implementing the OpenAI chat completions HTTP API,
+    e.g. a local vLLM, llama.cpp or Ollama server for on-prem, low latency runs.
+
+    Requests go through a pooled httpx client, so connections are kept alive between the calls of
+    all the agents sharing the provider.
+
+    The API key is either passed explicitly or read from the `AGENTIC_PATTERNS_API_KEY` environment
+    variable. Other variables such as `OPENAI_API_KEY` are never used, so the key of one service
+    isn't sent to whatever server `base_url` points to.
+
+    Attributes:
+        base_url (str): The API base URL, e.g. 'http://localhost:8000/v1'.
+        timeout (float): The default request timeout, in seconds.
+    """
+
+    name = OPENAI
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000/v1",
+        api_key: str | None = None,
+        model: str | None = None,
+        timeout: float = 60.0,
+        max_connections: int = 32,
+        http_client=None,
+    ):
+        super().__init__(model)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        api_key = api_key or os.environ.get("AGENTIC_PATTERNS_API_KEY")
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._http = http_client or httpx.Client(
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def _request(self, messages: list[dict], model: str, stream: bool, kwargs: dict):
+        timeout = kwargs.pop("timeout", None)
+        body = {"messages": messages, "model": model, **kwargs}
+        if stream:
+            body.update(stream=True, stream_options={"include_usage": True})
+        return self._http.build_request(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            content=json.dumps(body),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+
+    def complete(self, messages: list[dict], model: str, **kwargs):
+        response = self._http.send(self._request(messages, model, False, kwargs))
+        response.raise_for_status()
+        return _to_record(loads(response.content))
+
+    def stream(self, messages: list[dict], model: str, **kwargs) -> Iterator:
+        response = self._http.send(
+            self._request(messages, model, True, kwargs), stream=True
+        )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                yield _to_record(loads(data))
+        finally:
+            response.close()
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections.
+        """
+        self._http.close()
+
+
+def get_provider(name: str = GROQ, **kwargs) -> Provider:
+    """
+    Builds a provider by name.
+
+    Args:
+        name (str, optional): 'groq' or 'openai' (any OpenAI-compatible server). Defaults to 'groq'.
+        **kwargs: The provider constructor arguments (e.g. `base_url`, `model`).
+
+    Returns:
+        Provider: The provider.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == GROQ:
+        return GroqProvider(**kwargs)
+    if name == OPENAI:
+        return OpenAICompatibleProvider(**kwargs)
+    raise ValueError(f"Unknown provider '{name}'. Expected one of {PROVIDERS}")
+
+
+_default_provider: Provider | None = None
+_default_provider_lock = threading.Lock()
+
+
+def default_provider() -> Provider:
+    """
+    Returns the process-wide provider used by the agents built without a `client`.
+
+    It's configured with environment variables, so the same code runs against another backend:
+    `AGENTIC_PATTERNS_PROVIDER` ('groq' by default, or 'openai'), `AGENTIC_PATTERNS_BASE_URL` (for
+    'openai'), `AGENTIC_PATTERNS_API_KEY` (the API key of the 'openai' server, if it needs one) and
+    `AGENTIC_PATTERNS_MODEL` (replaces the models requested by the agents).
+
+    Returns:
+        Provider: The default provider.
+    """
+    global _default_provider
+    with _default_provider_lock:
+        if _default_provider is None:
+            kwargs = {}
+            if os.environ.get("AGENTIC_PATTERNS_MODEL"):
+                kwargs["model"] = os.environ["AGENTIC_PATTERNS_MODEL"]
+            if os.environ.get("AGENTIC_PATTERNS_BASE_URL"):
+                kwargs["base_url"] = os.environ["AGENTIC_PATTERNS_BASE_URL"]
+            _default_provider = get_provider(
+                os.environ.get("AGENTIC_PATTERNS_PROVIDER", GROQ), **kwargs
+            )
+        return _default_provider
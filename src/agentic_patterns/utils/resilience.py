@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from types import SimpleNamespace
+
+from colorama import Fore
+
+
+class LatencyTracker:
+    """
+    Keeps a sliding window of recent request latencies and computes their percentiles.
+
+    Attributes:
+        window (int): The number of latencies kept.
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._latencies)
+
+    def record(self, seconds: float) -> None:
+        """
+        Adds the latency of a request.
+
+        Args:
+            seconds (float): The latency, in seconds.
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Returns the q-th percentile (0-100) of the recent latencies, or None without latencies.
+
+        Args:
+            q (float): The percentile.
+
+        Returns:
+            float | None: The latency percentile, in seconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))]
+
+
+class HedgedClient:
+    """
+    Wraps a Groq-shaped client to cut the tail latency of its requests with hedging.
+
+    When a request hasn't answered within an adaptive percentile of the recent latencies, an
+    identical request is fired and whichever answers first is used. Until enough latencies have
+    been observed, `initial_delay` is used (no hedging if it's None). Streaming requests are not
+    hedged, since their tokens are forwarded as they arrive.
+
+    The wrapper exposes the same `client.chat.completions.create(...)` entry point, so it can be
+    passed as the `client` of any agent.
+
+    Attributes:
+        client: The wrapped client.
+        percentile (float): The latency percentile after which a hedge is fired.
+        min_samples (int): The number of latencies needed before the percentile is used.
+        initial_delay (float | None): The hedging delay used before `min_samples` latencies.
+        latencies (LatencyTracker): The recent latencies of the wrapped client.
+        stats (dict): Counters of requests, hedges fired and hedges that answered first.
+    """
+
+    def __init__(
+        self,
+        client,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window: int = 200,
+        initial_delay: float | None = None,
+        max_workers: int = 32,
+    ):
+        self.client = client
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.latencies = LatencyTracker(window)
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0}
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def hedge_delay(self) -> float | None:
+        """
+        Returns how long to wait before firing a hedge, or None to never hedge.
+        """
+        if len(self.latencies) < self.min_samples:
+            return self.initial_delay
+        return self.latencies.percentile(self.percentile)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _timed_create(self, **kwargs):
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(**kwargs)
+        self.latencies.record(time.perf_counter() - start)
+        return response
+
+    def create(self, **kwargs):
+        """
+        Mimics `client.chat.completions.create`, hedging slow requests.
+
+        Args:
+            **kwargs: The request parameters.
+
+        Returns:
+            The response of the first request to answer.
+        """
+        self._count("requests")
+        delay = self.hedge_delay()
+        if kwargs.get("stream") or delay is None:
+            return self._timed_create(**kwargs)
+
+        primary = self._executor.submit(self._timed_create, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count("hedges")
+        hedge = self._executor.submit(self._timed_create, **kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Successful answers first, so a failure never hides a success
+            for future in sorted(done, key=lambda f: f.exception() is not None):
+                if future.exception() is None or not pending:
+                    if future is hedge and future.exception() is None:
+                        self._count("hedge_wins")
+                    # The slower request can't be interrupted, its answer is just ignored
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+
+
+class FallbackClient:
+    """
+    Wraps an ordered list of Groq-shaped clients (providers), trying the next one whenever a
+    request fails.
+
+    Every entry is either a client, which receives the request unchanged, or a `(client, model)`
+    pair, which also replaces the requested model (e.g. to fall back to a model served by
+    another provider).
+
+    The wrapper exposes the same `client.chat.completions.create(...)` entry point, so it can be
+    passed as the `client` of any agent, or wrapped in a HedgedClient.
+
+    Attributes:
+        providers (list[tuple]): The `(client, model)` pairs, in order. `model` is None when
+            the requested model is kept.
+        stats (dict): The number of fallbacks to each provider position.
+    """
+
+    def __init__(self, providers: list):
+        if not providers:
+            raise ValueError("FallbackClient needs at least one provider")
+
+        self.providers = [
+            provider if isinstance(provider, tuple) else (provider, None)
+            for provider in providers
+        ]
+        self.stats = {"fallbacks": [0] * len(self.providers)}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        """
+        Mimics `client.chat.completions.create`, falling back to the next provider on errors.
+
+        Args:
+            **kwargs: The request parameters.
+
+        Returns:
+            The response of the first provider that answers.
+
+        Raises:
+            Exception: The error of the last provider, if all of them fail.
+        """
+        for i, (client, model) in enumerate(self.providers):
+            request = dict(kwargs, model=model) if model else kwargs
+            try:
+                return client.chat.completions.create(**request)
+            except Exception as e:
+                if i == len(self.providers) - 1:
+                    raise
+                self.stats["fallbacks"][i + 1] += 1
+                print(
+                    Fore.YELLOW
+                    + f"\nProvider {i} failed ({type(e).__name__}: {e}). Falling back to provider {i + 1}"
+                )
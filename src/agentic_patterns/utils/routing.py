@@ -0,0 +1,171 @@
+from typing import Callable
+
+from colorama import Fore
+
+from agentic_patterns.utils.completions import chat_completion_create
+
+
+GENERATION = "generation"
+REFLECTION = "reflection"
+TOOL_SELECTION = "tool_selection"
+FINAL_ANSWER = "final_answer"
+
+CALL_TYPES = (GENERATION, REFLECTION, TOOL_SELECTION, FINAL_ANSWER)
+
+
+class ModelRouter:
+    """
+    A routing policy that picks the model used for each type of LLM call.
+
+    Every call type (generation, reflection, tool selection, final answer) maps to an
+    ordered list of models, from the cheapest to the most capable one. The first model
+    is always tried first; the next ones are only used when the output of the previous
+    model is not valid (e.g. it doesn't contain a well formed `<tool_call>` or `<response>`).
+
+    Attributes:
+        default (str): The model used for any call type without an explicit route.
+        routes (dict[str, list[str]]): A dictionary mapping call types to their escalation chain.
+    """
+
+    def __init__(self, default: str, routes: dict[str, str | list[str]] | None = None):
+        self.default = default
+        self.routes: dict[str, list[str]] = {}
+
+        for call_type, models in (routes or {}).items():
+            if call_type not in CALL_TYPES:
+                raise ValueError(
+                    f"Unknown call type '{call_type}'. Expected one of {CALL_TYPES}"
+                )
+            self.routes[call_type] = models if isinstance(models, list) else [models]
+
+    def __repr__(self):
+        return f"ModelRouter(default={self.default!r}, routes={self.routes!r})"
+
+    def models_for(self, call_type: str) -> list[str]:
+        """
+        Returns the escalation chain for the given call type.
+
+        Args:
+            call_type (str): The type of call (e.g. 'generation', 'tool_selection').
+
+        Returns:
+            list[str]: The models to try, in order.
+        """
+        return self.routes.get(call_type) or [self.default]
+
+    def model_for(self, call_type: str) -> str:
+        """
+        Returns the first (cheapest) model for the given call type.
+
+        Args:
+            call_type (str): The type of call (e.g. 'generation', 'tool_selection').
+
+        Returns:
+            str: The model name.
+        """
+        return self.models_for(call_type)[0]
+
+
+def as_router(model: str | ModelRouter) -> ModelRouter:
+    """
+    Wraps a plain model name into a ModelRouter that routes every call to that model.
+
+    Args:
+        model (str | ModelRouter): A model name or an already built router.
+
+    Returns:
+        ModelRouter: The routing policy.
+    """
+    return model if isinstance(model, ModelRouter) else ModelRouter(default=model)
+
+
+def routed_chat_completion(
+    client,
+    messages: list,
+    router: ModelRouter,
+    call_type: str,
+    is_valid: Callable | None = None,
+    **kwargs,
+):
+    """
+    Requests a completion using the models routed for `call_type`, escalating to the next
+    model in the chain whenever `is_valid` rejects the returned message.
+
+    With an `on_token` callback, the deltas of the models that may still be escalated are buffered
+    and only forwarded once their message passes `is_valid`, so rejected output is never streamed.
+    The last model of the chain is streamed as it generates.
+
+    Args:
+        client (Groq): The Groq client object
+        messages (list[dict]): A list of message objects containing chat history for the model.
+        router (ModelRouter): The routing policy.
+        call_type (str): The type of call being made.
+        is_valid (Callable | None): A predicate that checks the returned message object.
+            If None, the first model's output is always accepted.
+        **kwargs: Extra parameters (e.g. `tools`, `on_token`, `budget`) forwarded to
+            `chat_completion_create`.
+
+    Returns:
+        The first valid message object, or the last one if none is valid.
+    """
+    models = router.models_for(call_type)
+    on_token = kwargs.pop("on_token", None)
+
+    for i, model in enumerate(models):
+        deltas = []
+        streams_live = is_valid is None or i == len(models) - 1
+        message = chat_completion_create(
+            client,
+            messages,
+            model,
+            on_token=on_token if on_token is None or streams_live else deltas.append,
+            **kwargs,
+        )
+
+        if is_valid is None or is_valid(message):
+            for delta in deltas:
+                on_token(delta)
+            return message
+
+        if i < len(models) - 1:
+            print(
+                Fore.YELLOW
+                + f"\nInvalid {call_type} output from {model}. Escalating to {models[i + 1]}"
+            )
+
+    return message
+
+
+def routed_completion(
+    client,
+    messages: list,
+    router: ModelRouter,
+    call_type: str,
+    is_valid: Callable[[str], bool] | None = None,
+    **kwargs,
+) -> str:
+    """
+    Requests a completion using the models routed for `call_type`, escalating to the next
+    model in the chain whenever `is_valid` rejects the output.
+
+    Args:
+        client (Groq): The Groq client object
+        messages (list[dict]): A list of message objects containing chat history for the model.
+        router (ModelRouter): The routing policy.
+        call_type (str): The type of call being made.
+        is_valid (Callable[[str], bool] | None): A predicate that checks the model output.
+            If None, the first model's output is always accepted.
+        **kwargs: Extra parameters (e.g. `on_token`, `budget`) forwarded to `chat_completion_create`.
+
+    Returns:
+        str: The content of the first valid response, or the last response if none is valid.
+    """
+    message = routed_chat_completion(
+        client,
+        messages,
+        router,
+        call_type,
+        is_valid=None if is_valid is None else lambda m: is_valid(str(m.content)),
+        **kwargs,
+    )
+    return str(message.content)